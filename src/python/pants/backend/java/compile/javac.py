@@ -21,6 +21,8 @@ from pants.engine.process import FallibleProcessResult, Process, ProcessResult
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.engine.target import CoarsenedTarget, SourcesField
 from pants.engine.unions import UnionRule
+from pants.jvm.abi_jar.abi_jar import AbiClasspathEntries, AbiClasspathEntriesRequest
+from pants.jvm.abi_jar.abi_jar import rules as abi_jar_rules
 from pants.jvm.classpath import Classpath
 from pants.jvm.compile import (
     ClasspathDependenciesRequest,
@@ -155,7 +157,13 @@ async def compile_java_source(
     )
 
     usercp = "__cp"
-    user_classpath = Classpath(direct_dependency_classpath_entries, request.resolve)
+    if jvm.compile_against_abi_jars:
+        abi_classpath_entries = await Get(
+            AbiClasspathEntries, AbiClasspathEntriesRequest(direct_dependency_classpath_entries)
+        )
+        user_classpath = Classpath(tuple(abi_classpath_entries), request.resolve)
+    else:
+        user_classpath = Classpath(direct_dependency_classpath_entries, request.resolve)
     classpath_arg = ":".join(user_classpath.root_immutable_inputs_args(prefix=usercp))
     immutable_input_digests = dict(user_classpath.root_immutable_inputs(prefix=usercp))
 
@@ -251,6 +259,7 @@ async def compile_java_source(
 def rules():
     return [
         *collect_rules(),
+        *abi_jar_rules(),
         *java_dep_inference_rules(),
         *jvm_compile_rules(),
         UnionRule(ClasspathEntryRequest, CompileJavaSourceRequest),
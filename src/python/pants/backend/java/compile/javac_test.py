@@ -22,9 +22,11 @@ from pants.build_graph.address import Address
 from pants.core.goals.check import CheckResult, CheckResults
 from pants.core.util_rules import config_files, source_files, system_binaries
 from pants.engine.addresses import Addresses
+from pants.engine.fs import Digest
 from pants.engine.internals.scheduler import ExecutionError
 from pants.engine.target import CoarsenedTargets, Targets
 from pants.jvm import jdk_rules, testutil
+from pants.jvm.abi_jar.abi_jar import AbiClasspathEntries, AbiClasspathEntriesRequest
 from pants.jvm.compile import ClasspathEntry, CompileResult, FallibleClasspathEntry
 from pants.jvm.goals import lockfile
 from pants.jvm.resolve import jvm_tool
@@ -59,6 +61,7 @@ def rule_runner() -> RuleRunner:
             *java_dep_inf_rules(),
             *source_files.rules(),
             *testutil.rules(),
+            QueryRule(AbiClasspathEntries, (AbiClasspathEntriesRequest,)),
             QueryRule(CheckResults, (JavacCheckRequest,)),
             QueryRule(ClasspathEntry, (CompileJavaSourceRequest,)),
             QueryRule(CoarsenedTargets, (Addresses,)),
@@ -584,6 +587,70 @@ def test_compile_with_deps(rule_runner: RuleRunner) -> None:
     }
 
 
+@maybe_skip_jdk_test
+def test_compile_against_abi_jars(rule_runner: RuleRunner) -> None:
+    rule_runner.set_options(["--jvm-compile-against-abi-jars"], env_inherit=PYTHON_BOOTSTRAP_ENV)
+    rule_runner.write_files(
+        {
+            "BUILD": "java_sources(name='main', dependencies=['lib:lib'])",
+            "3rdparty/jvm/default.lock": EMPTY_JVM_LOCKFILE,
+            "Example.java": JAVA_LIB_MAIN_SOURCE,
+            "lib/BUILD": "java_sources(name='lib')",
+            "lib/ExampleLib.java": JAVA_LIB_SOURCE,
+        }
+    )
+
+    def compile(target_name: str, path: str = "") -> ClasspathEntry:
+        return rule_runner.request(
+            ClasspathEntry,
+            [
+                CompileJavaSourceRequest(
+                    component=expect_single_expanded_coarsened_target(
+                        rule_runner, Address(spec_path=path, target_name=target_name)
+                    ),
+                    resolve=make_resolve(rule_runner),
+                )
+            ],
+        )
+
+    def lib_abi_digest() -> Digest:
+        lib_entry = compile("lib", "lib")
+        abi_entries = rule_runner.request(
+            AbiClasspathEntries, [AbiClasspathEntriesRequest((lib_entry,))]
+        )
+        assert len(abi_entries) == 1
+        assert abi_entries[0].filenames == lib_entry.filenames
+        assert abi_entries[0].digest != lib_entry.digest
+        return abi_entries[0].digest
+
+    def local_executions() -> int:
+        return rule_runner.scheduler.metrics().get("local_execution_requests", 0)
+
+    main_entry = compile("main")
+    assert main_entry.filenames == (".Example.java.main.javac.jar",)
+    abi_digest = lib_abi_digest()
+
+    # Changing the body of a method does not change the ABI jar, and so the dependent is not
+    # recompiled: no process runs to compile it.
+    rule_runner.write_files(
+        {"lib/ExampleLib.java": JAVA_LIB_SOURCE.replace('"Hello!"', '"Goodbye!"')}
+    )
+    assert lib_abi_digest() == abi_digest
+    executions = local_executions()
+    assert compile("main") == main_entry
+    assert local_executions() == executions
+
+    # But changing its signature does.
+    rule_runner.write_files(
+        {
+            "lib/ExampleLib.java": JAVA_LIB_SOURCE.replace("hello()", "hello(String name)").replace(
+                '"Hello!"', '"Hello, " + name'
+            )
+        }
+    )
+    assert lib_abi_digest() != abi_digest
+
+
 @maybe_skip_jdk_test
 def test_compile_of_package_info(rule_runner: RuleRunner) -> None:
     rule_runner.write_files(
@@ -2,6 +2,7 @@ package org.pantsbuild.javaparser;
 
 import com.fasterxml.jackson.databind.ObjectMapper;
 import com.fasterxml.jackson.datatype.jdk8.Jdk8Module;
+import com.github.javaparser.ParseProblemException;
 import com.github.javaparser.ParserConfiguration;
 import com.github.javaparser.StaticJavaParser;
 import com.github.javaparser.ast.CompilationUnit;
@@ -27,7 +28,9 @@ import com.github.javaparser.ast.type.WildcardType;
 import java.io.File;
 import java.util.ArrayList;
 import java.util.HashSet;
+import java.util.LinkedHashMap;
 import java.util.List;
+import java.util.Map;
 import java.util.Optional;
 import java.util.function.Consumer;
 import java.util.stream.Collectors;
@@ -117,7 +120,6 @@ public class PantsJavaParserLauncher {
 
   public static void main(String[] args) throws Exception {
     String analysisOutputPath = args[0];
-    String sourceToAnalyze = args[1];
 
     // NB: We hardcode the most permissive language level in order to capture all potential
     // sources of symbols. If certain syntax ends up deprecated in future versions, we may need to
@@ -125,8 +127,26 @@ public class PantsJavaParserLauncher {
     StaticJavaParser.setConfiguration(
         new ParserConfiguration()
             .setLanguageLevel(ParserConfiguration.LanguageLevel.JAVA_17_PREVIEW));
-    CompilationUnit cu = StaticJavaParser.parse(new File(sourceToAnalyze));
 
+    // Analyze each of the remaining arguments, and output the analyses keyed by path.
+    Map<String, CompilationUnitAnalysis> analyses = new LinkedHashMap<>();
+    for (int i = 1; i < args.length; i++) {
+      String sourceToAnalyze = args[i];
+      CompilationUnit cu;
+      try {
+        cu = StaticJavaParser.parse(new File(sourceToAnalyze));
+      } catch (ParseProblemException e) {
+        throw new Exception("Failed to parse " + sourceToAnalyze, e);
+      }
+      analyses.put(sourceToAnalyze, analyze(cu));
+    }
+
+    ObjectMapper mapper = new ObjectMapper();
+    mapper.registerModule(new Jdk8Module());
+    mapper.writeValue(new File(analysisOutputPath), analyses);
+  }
+
+  private static CompilationUnitAnalysis analyze(CompilationUnit cu) {
     // Get the source's declare package.
     Optional<String> declaredPackage =
         cu.getPackageDeclaration().map(PackageDeclaration::getName).map(Name::toString);
@@ -227,11 +247,7 @@ public class PantsJavaParserLauncher {
 
     ArrayList<String> consumedTypes = new ArrayList<>(consumedIdentifiers);
     ArrayList<String> exportTypes = new ArrayList<>(exportIdentifiers);
-    CompilationUnitAnalysis analysis =
-        new CompilationUnitAnalysis(
-            declaredPackage, imports, topLevelTypes, consumedTypes, exportTypes);
-    ObjectMapper mapper = new ObjectMapper();
-    mapper.registerModule(new Jdk8Module());
-    mapper.writeValue(new File(analysisOutputPath), analysis);
+    return new CompilationUnitAnalysis(
+        declaredPackage, imports, topLevelTypes, consumedTypes, exportTypes);
   }
 }
@@ -10,7 +10,10 @@ from dataclasses import dataclass
 
 import pkg_resources
 
-from pants.backend.java.dependency_inference.types import JavaSourceDependencyAnalysis
+from pants.backend.java.dependency_inference.types import (
+    JavaSourceDependencyAnalyses,
+    JavaSourceDependencyAnalysis,
+)
 from pants.core.goals.generate_lockfiles import DEFAULT_TOOL_LOCKFILE, GenerateToolLockfileSentinel
 from pants.core.util_rules.source_files import SourceFiles
 from pants.engine.fs import AddPrefix, CreateDigest, Digest, DigestContents, Directory, FileContent
@@ -22,13 +25,16 @@ from pants.jvm.jdk_rules import InternalJdk, JvmProcess
 from pants.jvm.resolve.coursier_fetch import ToolClasspath, ToolClasspathRequest
 from pants.jvm.resolve.jvm_tool import GenerateJvmLockfileFromTool, GenerateJvmToolLockfileSentinel
 from pants.option.global_options import KeepSandboxes
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
 from pants.util.ordered_set import FrozenOrderedSet
+from pants.util.strutil import pluralize
 
 logger = logging.getLogger(__name__)
 
 
 _LAUNCHER_BASENAME = "PantsJavaParserLauncher.java"
+_SOURCE_PREFIX = "__source_to_analyze"
 
 
 class JavaParserToolLockfileSentinel(GenerateJvmToolLockfileSentinel):
@@ -37,6 +43,12 @@ class JavaParserToolLockfileSentinel(GenerateJvmToolLockfileSentinel):
 
 @dataclass(frozen=True)
 class JavaSourceDependencyAnalysisRequest:
+    """Analyze the given source files in a single JVM process.
+
+    Request a `JavaSourceDependencyAnalysis` for a single file, or `JavaSourceDependencyAnalyses`
+    for a batch of files.
+    """
+
     source_files: SourceFiles
 
 
@@ -51,18 +63,26 @@ class JavaParserCompiledClassfiles:
 
 
 @rule(level=LogLevel.DEBUG)
-async def resolve_fallible_result_to_analysis(
+async def resolve_fallible_result_to_analyses(
     fallible_result: FallibleJavaSourceDependencyAnalysisResult,
     keep_sandboxes: KeepSandboxes,
-) -> JavaSourceDependencyAnalysis:
+) -> JavaSourceDependencyAnalyses:
     # TODO(#12725): Just convert directly to a ProcessResult like this:
     # result = await Get(ProcessResult, FallibleProcessResult, fallible_result.process_result)
     if fallible_result.process_result.exit_code == 0:
         analysis_contents = await Get(
             DigestContents, Digest, fallible_result.process_result.output_digest
         )
-        analysis = json.loads(analysis_contents[0].content)
-        return JavaSourceDependencyAnalysis.from_json_dict(analysis)
+        analyses = json.loads(analysis_contents[0].content)
+        return JavaSourceDependencyAnalyses(
+            FrozenDict(
+                (
+                    os.path.relpath(path, _SOURCE_PREFIX),
+                    JavaSourceDependencyAnalysis.from_json_dict(analysis),
+                )
+                for path, analysis in analyses.items()
+            )
+        )
     raise ProcessExecutionFailure(
         fallible_result.process_result.exit_code,
         fallible_result.process_result.stdout,
@@ -72,6 +92,20 @@ async def resolve_fallible_result_to_analysis(
     )
 
 
+@rule(level=LogLevel.DEBUG)
+async def resolve_fallible_result_to_analysis(
+    fallible_result: FallibleJavaSourceDependencyAnalysisResult,
+) -> JavaSourceDependencyAnalysis:
+    analyses = await Get(
+        JavaSourceDependencyAnalyses, FallibleJavaSourceDependencyAnalysisResult, fallible_result
+    )
+    if len(analyses.analyses) != 1:
+        raise ValueError(
+            f"Expected the analysis of exactly 1 source file, but found {len(analyses.analyses)}."
+        )
+    return next(iter(analyses.analyses.values()))
+
+
 @rule(level=LogLevel.DEBUG)
 async def make_analysis_request_from_source_files(
     source_files: SourceFiles,
@@ -86,16 +120,8 @@ async def analyze_java_source_dependencies(
     request: JavaSourceDependencyAnalysisRequest,
 ) -> FallibleJavaSourceDependencyAnalysisResult:
     source_files = request.source_files
-    if len(source_files.files) > 1:
-        raise ValueError(
-            f"parse_java_package expects sources with exactly 1 source file, but found {len(source_files.files)}."
-        )
-    elif len(source_files.files) == 0:
-        raise ValueError(
-            "parse_java_package expects sources with exactly 1 source file, but found none."
-        )
-    source_prefix = "__source_to_analyze"
-    source_path = os.path.join(source_prefix, source_files.files[0])
+    if len(source_files.files) == 0:
+        raise ValueError("parse_java_package expects sources with at least 1 source file.")
     processorcp_relpath = "__processorcp"
     toolcp_relpath = "__toolcp"
 
@@ -107,7 +133,7 @@ async def analyze_java_source_dependencies(
             ToolClasspath,
             ToolClasspathRequest(lockfile=parser_lockfile_request),
         ),
-        Get(Digest, AddPrefix(source_files.snapshot.digest, source_prefix)),
+        Get(Digest, AddPrefix(source_files.snapshot.digest, _SOURCE_PREFIX)),
     )
 
     extra_immutable_input_digests = {
@@ -128,13 +154,17 @@ async def analyze_java_source_dependencies(
             argv=[
                 "org.pantsbuild.javaparser.PantsJavaParserLauncher",
                 analysis_output_path,
-                source_path,
+                *(os.path.join(_SOURCE_PREFIX, path) for path in source_files.files),
             ],
             input_digest=prefixed_source_files_digest,
             extra_immutable_input_digests=extra_immutable_input_digests,
             output_files=(analysis_output_path,),
             extra_nailgun_keys=extra_immutable_input_digests,
-            description=f"Analyzing {source_files.files[0]}",
+            description=(
+                f"Analyzing {source_files.files[0]}"
+                if len(source_files.files) == 1
+                else f"Analyzing {pluralize(len(source_files.files), 'Java source file')}"
+            ),
             level=LogLevel.DEBUG,
         ),
     )
@@ -9,9 +9,14 @@ import pytest
 
 from pants.backend.java.dependency_inference.java_parser import (
     FallibleJavaSourceDependencyAnalysisResult,
+    JavaSourceDependencyAnalysisRequest,
 )
 from pants.backend.java.dependency_inference.java_parser import rules as java_parser_rules
-from pants.backend.java.dependency_inference.types import JavaImport, JavaSourceDependencyAnalysis
+from pants.backend.java.dependency_inference.types import (
+    JavaImport,
+    JavaSourceDependencyAnalyses,
+    JavaSourceDependencyAnalysis,
+)
 from pants.backend.java.target_types import JavaSourceField, JavaSourceTarget
 from pants.build_graph.address import Address
 from pants.core.util_rules import source_files
@@ -38,6 +43,7 @@ def rule_runner() -> RuleRunner:
             *jdk_rules.rules(),
             QueryRule(FallibleJavaSourceDependencyAnalysisResult, (SourceFiles,)),
             QueryRule(JavaSourceDependencyAnalysis, (SourceFiles,)),
+            QueryRule(JavaSourceDependencyAnalyses, (JavaSourceDependencyAnalysisRequest,)),
             QueryRule(SourceFiles, (SourceFilesRequest,)),
         ],
         target_types=[JavaSourceTarget],
@@ -215,6 +221,52 @@ def test_java_parser_unnamed_package(rule_runner: RuleRunner) -> None:
     assert analysis.consumed_types == ("System",)
 
 
+@maybe_skip_jdk_test
+def test_java_parser_batch(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "BUILD": dedent(
+                """\
+                java_source(name='a', source='A.java')
+                java_source(name='b', source='B.java')
+                """
+            ),
+            "A.java": dedent(
+                """
+                package org.pantsbuild.a;
+
+                import org.pantsbuild.b.B;
+
+                public class A {}
+                """
+            ),
+            "B.java": dedent(
+                """
+                package org.pantsbuild.b;
+
+                public class B {}
+                """
+            ),
+        }
+    )
+
+    targets = [rule_runner.get_target(Address("", target_name=name)) for name in ("a", "b")]
+    source_files = rule_runner.request(
+        SourceFiles,
+        [SourceFilesRequest([target[JavaSourceField] for target in targets])],
+    )
+
+    analyses = rule_runner.request(
+        JavaSourceDependencyAnalyses, [JavaSourceDependencyAnalysisRequest(source_files)]
+    )
+    assert {"A.java", "B.java"} == set(analyses.analyses)
+    assert analyses.analyses["A.java"].declared_package == "org.pantsbuild.a"
+    assert analyses.analyses["A.java"].imports == (JavaImport(name="org.pantsbuild.b.B"),)
+    assert analyses.analyses["A.java"].top_level_types == ("org.pantsbuild.a.A",)
+    assert analyses.analyses["B.java"].declared_package == "org.pantsbuild.b"
+    assert analyses.analyses["B.java"].top_level_types == ("org.pantsbuild.b.B",)
+
+
 @maybe_skip_jdk_test
 def test_java_parser_consumed_types(rule_runner: RuleRunner) -> None:
     rule_runner.write_files(
@@ -6,12 +6,11 @@ from collections import defaultdict
 from dataclasses import dataclass
 
 from pants.backend.java.dependency_inference import symbol_mapper
-from pants.backend.java.dependency_inference.java_parser import JavaSourceDependencyAnalysisRequest
 from pants.backend.java.dependency_inference.java_parser import rules as java_parser_rules
+from pants.backend.java.dependency_inference.symbol_mapper import JavaTargetAnalysisRequest
 from pants.backend.java.dependency_inference.types import JavaImport, JavaSourceDependencyAnalysis
 from pants.backend.java.subsystems.java_infer import JavaInferSubsystem
 from pants.backend.java.target_types import JavaSourceField
-from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
 from pants.core.util_rules.source_files import rules as source_files_rules
 from pants.engine.addresses import Address
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
@@ -83,14 +82,10 @@ async def infer_java_dependencies_and_exports_via_source_analysis(
         WrappedTarget, WrappedTargetRequest(address, description_of_origin="<infallible>")
     )
     tgt = wrapped_tgt.target
-    source_files = await Get(SourceFiles, SourceFilesRequest([tgt[JavaSourceField]]))
 
     explicitly_provided_deps, analysis = await MultiGet(
         Get(ExplicitlyProvidedDependencies, DependenciesRequest(tgt[Dependencies])),
-        Get(
-            JavaSourceDependencyAnalysis,
-            JavaSourceDependencyAnalysisRequest(source_files=source_files),
-        ),
+        Get(JavaSourceDependencyAnalysis, JavaTargetAnalysisRequest(address)),
     )
 
     types: OrderedSet[str] = OrderedSet()
@@ -5,19 +5,27 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
+from dataclasses import dataclass
 from typing import Mapping
 
-from pants.backend.java.dependency_inference.types import JavaSourceDependencyAnalysis
+from pants.backend.java.dependency_inference.java_parser import JavaSourceDependencyAnalysisRequest
+from pants.backend.java.dependency_inference.types import (
+    JavaSourceDependencyAnalyses,
+    JavaSourceDependencyAnalysis,
+)
 from pants.backend.java.target_types import JavaSourceField
-from pants.core.util_rules.source_files import SourceFilesRequest
+from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
+from pants.engine.addresses import Address
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.engine.target import AllTargets, Targets
 from pants.engine.unions import UnionRule
 from pants.jvm.dependency_inference import symbol_mapper
 from pants.jvm.dependency_inference.artifact_mapper import MutableTrieNode
+from pants.jvm.dependency_inference.source_analysis import source_analysis_batches
 from pants.jvm.dependency_inference.symbol_mapper import FirstPartyMappingRequest, SymbolMap
 from pants.jvm.subsystems import JvmSubsystem
 from pants.jvm.target_types import JvmResolveField
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
 
 logger = logging.getLogger(__name__)
@@ -32,6 +40,55 @@ def find_all_java_targets(tgts: AllTargets) -> AllJavaTargets:
     return AllJavaTargets(tgt for tgt in tgts if tgt.has_field(JavaSourceField))
 
 
+@dataclass(frozen=True)
+class AllJavaSourceDependencyAnalyses:
+    """The analysis of the source of each Java target, keyed by address."""
+
+    analyses: FrozenDict[Address, JavaSourceDependencyAnalysis]
+
+
+@rule(desc="Analyze all Java sources", level=LogLevel.DEBUG)
+async def analyze_all_java_sources(java_targets: AllJavaTargets) -> AllJavaSourceDependencyAnalyses:
+    batches = list(source_analysis_batches(java_targets))
+    all_source_files = await MultiGet(
+        Get(SourceFiles, SourceFilesRequest(tgt[JavaSourceField] for tgt in batch))
+        for batch in batches
+    )
+    all_analyses = await MultiGet(
+        Get(JavaSourceDependencyAnalyses, JavaSourceDependencyAnalysisRequest(source_files))
+        for source_files in all_source_files
+        if source_files.files
+    )
+    analyses_by_path = {
+        path: analysis for analyses in all_analyses for path, analysis in analyses.analyses.items()
+    }
+    return AllJavaSourceDependencyAnalyses(
+        FrozenDict(
+            (tgt.address, analyses_by_path[tgt[JavaSourceField].file_path])
+            for tgt in java_targets
+            if tgt[JavaSourceField].file_path in analyses_by_path
+        )
+    )
+
+
+@dataclass(frozen=True)
+class JavaTargetAnalysisRequest:
+    """The analysis of the source of the given Java target, from `AllJavaSourceDependencyAnalyses`.
+
+    Inference for a target requests this rather than `AllJavaSourceDependencyAnalyses`, so that it
+    re-runs only when the analysis of its own source changes.
+    """
+
+    address: Address
+
+
+@rule(level=LogLevel.DEBUG)
+def java_target_analysis(
+    request: JavaTargetAnalysisRequest, all_analyses: AllJavaSourceDependencyAnalyses
+) -> JavaSourceDependencyAnalysis:
+    return all_analyses.analyses[request.address]
+
+
 class FirstPartyJavaTargetsMappingRequest(FirstPartyMappingRequest):
     pass
 
@@ -40,21 +97,17 @@ class FirstPartyJavaTargetsMappingRequest(FirstPartyMappingRequest):
 async def map_first_party_java_targets_to_symbols(
     _: FirstPartyJavaTargetsMappingRequest,
     java_targets: AllJavaTargets,
+    all_analyses: AllJavaSourceDependencyAnalyses,
     jvm: JvmSubsystem,
 ) -> SymbolMap:
-    source_analysis = await MultiGet(
-        Get(JavaSourceDependencyAnalysis, SourceFilesRequest([target[JavaSourceField]]))
-        for target in java_targets
-    )
-    address_and_analysis = zip(
-        [(tgt.address, tgt[JvmResolveField].normalized_value(jvm)) for tgt in java_targets],
-        source_analysis,
-    )
-
     mapping: Mapping[str, MutableTrieNode] = defaultdict(MutableTrieNode)
-    for (address, resolve), analysis in address_and_analysis:
+    for tgt in java_targets:
+        analysis = all_analyses.analyses.get(tgt.address)
+        if analysis is None:
+            continue
+        resolve = tgt[JvmResolveField].normalized_value(jvm)
         for top_level_type in analysis.top_level_types:
-            mapping[resolve].insert(top_level_type, [address], first_party=True)
+            mapping[resolve].insert(top_level_type, [tgt.address], first_party=True)
 
     return SymbolMap((resolve, node.frozen()) for resolve, node in mapping.items())
 
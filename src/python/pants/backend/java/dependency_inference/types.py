@@ -6,6 +6,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Sequence
 
+from pants.util.frozendict import FrozenDict
+
 
 @dataclass(frozen=True)
 class JavaImport:
@@ -55,3 +57,10 @@ class JavaSourceDependencyAnalysis:
             "consumed_types": self.consumed_types,
             "export_types": self.export_types,
         }
+
+
+@dataclass(frozen=True)
+class JavaSourceDependencyAnalyses:
+    """The analyses of a batch of source files, keyed by file path."""
+
+    analyses: FrozenDict[str, JavaSourceDependencyAnalysis]
@@ -3,14 +3,19 @@
 
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Iterable, Set
+from typing import DefaultDict, Iterable, List, Set, Tuple
 
 from pants.engine.addresses import Address, Addresses
 from pants.engine.collection import DeduplicatedCollection
 from pants.engine.console import Console
 from pants.engine.goal import Goal, GoalSubsystem, LineOriented
 from pants.engine.rules import Get, MultiGet, collect_rules, goal_rule, rule
-from pants.engine.target import AllUnexpandedTargets, Dependencies, DependenciesRequest
+from pants.engine.target import (
+    AllUnexpandedTargets,
+    Dependencies,
+    DependenciesRequest,
+    Target,
+)
 from pants.option.option_types import BoolOption
 from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
@@ -22,17 +27,53 @@ class AddressToDependents:
     mapping: FrozenDict[Address, FrozenOrderedSet[Address]]
 
 
-@rule(desc="Map all targets to their dependents", level=LogLevel.DEBUG)
-async def map_addresses_to_dependents(all_targets: AllUnexpandedTargets) -> AddressToDependents:
+@dataclass(frozen=True)
+class _DirectoryDependentsRequest:
+    """The targets declared in a single directory."""
+
+    targets: Tuple[Target, ...]
+
+
+@dataclass(frozen=True)
+class _DirectoryDependents:
+    """A shard of the reverse dependency index: the dependents from a single directory."""
+
+    mapping: FrozenDict[Address, Tuple[Address, ...]]
+
+
+@rule(level=LogLevel.TRACE)
+async def map_directory_to_dependents(request: _DirectoryDependentsRequest) -> _DirectoryDependents:
     dependencies_per_target = await MultiGet(
         Get(Addresses, DependenciesRequest(tgt.get(Dependencies), include_special_cased_deps=True))
-        for tgt in all_targets
+        for tgt in request.targets
     )
 
-    address_to_dependents = defaultdict(set)
-    for tgt, dependencies in zip(all_targets, dependencies_per_target):
+    address_to_dependents: DefaultDict[Address, List[Address]] = defaultdict(list)
+    for tgt, dependencies in zip(request.targets, dependencies_per_target):
         for dependency in dependencies:
-            address_to_dependents[dependency].add(tgt.address)
+            address_to_dependents[dependency].append(tgt.address)
+    return _DirectoryDependents(
+        FrozenDict({addr: tuple(dependents) for addr, dependents in address_to_dependents.items()})
+    )
+
+
+@rule(desc="Map all targets to their dependents", level=LogLevel.DEBUG)
+async def map_addresses_to_dependents(all_targets: AllUnexpandedTargets) -> AddressToDependents:
+    # The index is sharded by directory, so that when targets change, only the shards for their
+    # directories are recomputed (the request for an unchanged directory is equal to the previous
+    # one, and so is memoized), and the remaining work is only to merge the shards.
+    targets_by_directory: DefaultDict[str, List[Target]] = defaultdict(list)
+    for tgt in all_targets:
+        targets_by_directory[tgt.address.spec_path].append(tgt)
+    shards = await MultiGet(
+        Get(_DirectoryDependents, _DirectoryDependentsRequest(tuple(targets)))
+        for targets in targets_by_directory.values()
+    )
+
+    address_to_dependents: DefaultDict[Address, Set[Address]] = defaultdict(set)
+    for shard in shards:
+        for dependency, dependents in shard.mapping.items():
+            address_to_dependents[dependency].update(dependents)
     return AddressToDependents(
         FrozenDict(
             {
@@ -65,22 +106,18 @@ class Dependents(DeduplicatedCollection[Address]):
 def find_dependents(
     request: DependentsRequest, address_to_dependents: AddressToDependents
 ) -> Dependents:
-    check = set(request.addresses)
-    known_dependents: Set[Address] = set()
-    while True:
-        dependents = set(known_dependents)
-        for target in check:
-            target_dependents = address_to_dependents.mapping.get(target, FrozenOrderedSet())
-            dependents.update(target_dependents)
-        check = dependents - known_dependents
-        if not check or not request.transitive:
-            result = (
-                dependents | set(request.addresses)
-                if request.include_roots
-                else dependents - set(request.addresses)
-            )
-            return Dependents(result)
-        known_dependents = dependents
+    roots = set(request.addresses)
+    dependents: Set[Address] = set()
+    to_visit = list(roots)
+    while to_visit:
+        target = to_visit.pop()
+        for dependent in address_to_dependents.mapping.get(target, ()):
+            if dependent in dependents:
+                continue
+            dependents.add(dependent)
+            if request.transitive:
+                to_visit.append(dependent)
+    return Dependents(dependents | roots if request.include_roots else dependents - roots)
 
 
 class DependentsSubsystem(LineOriented, GoalSubsystem):
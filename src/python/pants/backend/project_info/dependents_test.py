@@ -1,6 +1,7 @@
 # Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+from textwrap import dedent
 from typing import List
 
 import pytest
@@ -102,3 +103,29 @@ def test_special_cased_dependencies(rule_runner: RuleRunner) -> None:
         transitive=True,
         expected=["intermediate:intermediate", "leaf:leaf", "special:special"],
     )
+
+
+def test_dependents_in_same_directory_and_cycles(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "cycle/BUILD": dedent(
+                """\
+                tgt(name='a', dependencies=[':b', 'base'])
+                tgt(name='b', dependencies=[':a'])
+                """
+            )
+        }
+    )
+    assert_dependents(
+        rule_runner,
+        targets=["base"],
+        transitive=True,
+        expected=["cycle:a", "cycle:b", "intermediate:intermediate", "leaf:leaf"],
+    )
+    assert_dependents(
+        rule_runner,
+        targets=["cycle:a"],
+        transitive=True,
+        closed=True,
+        expected=["cycle:a", "cycle:b"],
+    )
@@ -8,7 +8,7 @@ import itertools
 import logging
 import os
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import total_ordering
 from pathlib import PurePath
 from typing import DefaultDict, Iterable, Mapping, Tuple
@@ -28,11 +28,12 @@ from pants.backend.python.target_types import (
     PythonResolveField,
     PythonSourceField,
 )
+from pants.base.specs import RawSpecsWithoutFileOwners, RecursiveGlobSpec
 from pants.core.util_rules.stripped_source_files import StrippedFileName, StrippedFileNameRequest
-from pants.engine.addresses import Address
+from pants.engine.addresses import Address, Addresses
 from pants.engine.environment import EnvironmentName
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
-from pants.engine.target import AllTargets, Target
+from pants.engine.target import AllTargets, Target, UnexpandedTargets
 from pants.engine.unions import UnionMembership, UnionRule, union
 from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
@@ -92,6 +93,66 @@ def find_all_python_projects(all_targets: AllTargets) -> AllPythonTargets:
     return AllPythonTargets(tuple(first_party), tuple(third_party))
 
 
+class _ModuleProvidersIndex:
+    """An index of each module name to its providers in every resolve of a module mapping.
+
+    Looking up a module across all resolves then costs a single dict lookup per ancestor of the
+    module, rather than one per resolve. Entries hold the position of their resolve in the
+    mapping, so that results can be returned in the same order as the mapping's resolves.
+    """
+
+    def __init__(
+        self,
+        resolves_to_modules_to_providers: Mapping[
+            ResolveName, Mapping[str, Tuple[ModuleProvider, ...]]
+        ],
+    ) -> None:
+        modules_to_providers: DefaultDict[
+            str, list[tuple[int, Tuple[ModuleProvider, ...]]]
+        ] = defaultdict(list)
+        for position, mapping in enumerate(resolves_to_modules_to_providers.values()):
+            for module, providers in mapping.items():
+                if providers:
+                    modules_to_providers[module].append((position, providers))
+        self._modules_to_providers = {
+            module: tuple(providers) for module, providers in modules_to_providers.items()
+        }
+
+    @staticmethod
+    def _possible_providers(
+        found: Mapping[int, tuple[Tuple[ModuleProvider, ...], int]]
+    ) -> tuple[PossibleModuleProvider, ...]:
+        result = []
+        for position in sorted(found):
+            providers, ancestry = found[position]
+            result.extend(PossibleModuleProvider(provider, ancestry) for provider in providers)
+        return tuple(result)
+
+    def module_or_parent(self, module: str) -> tuple[PossibleModuleProvider, ...]:
+        """The providers of the module in each resolve, else those of its direct parent."""
+        found: dict[int, tuple[Tuple[ModuleProvider, ...], int]] = {}
+        dot = module.rfind(".")
+        if dot != -1:
+            for position, providers in self._modules_to_providers.get(module[:dot], ()):
+                found[position] = (providers, 1)
+        for position, providers in self._modules_to_providers.get(module, ()):
+            found[position] = (providers, 0)
+        return self._possible_providers(found)
+
+    def closest_ancestor(self, module: str) -> tuple[PossibleModuleProvider, ...]:
+        """The providers of the module in each resolve, else those of its closest ancestor."""
+        found: dict[int, tuple[Tuple[ModuleProvider, ...], int]] = {}
+        ancestry = 0
+        end = len(module)
+        while end != -1:
+            for position, providers in self._modules_to_providers.get(module[:end], ()):
+                if position not in found:
+                    found[position] = (providers, ancestry)
+            end = module.rfind(".", 0, end)
+            ancestry += 1
+        return self._possible_providers(found)
+
+
 # -----------------------------------------------------------------------------------------------
 # First-party module mapping
 # -----------------------------------------------------------------------------------------------
@@ -148,6 +209,13 @@ class FirstPartyPythonModuleMapping:
     implementations for each codegen backends.
     """
 
+    _index: _ModuleProvidersIndex = field(init=False, repr=False, compare=False, hash=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "_index", _ModuleProvidersIndex(self.resolves_to_modules_to_providers)
+        )
+
     def _providers_for_resolve(
         self, module: str, resolve: str
     ) -> tuple[PossibleModuleProvider, ...]:
@@ -184,12 +252,7 @@ class FirstPartyPythonModuleMapping:
         """
         if resolve:
             return self._providers_for_resolve(module, resolve)
-        return tuple(
-            itertools.chain.from_iterable(
-                self._providers_for_resolve(module, resolve)
-                for resolve in list(self.resolves_to_modules_to_providers.keys())
-            )
-        )
+        return self._index.module_or_parent(module)
 
 
 @rule(level=LogLevel.DEBUG)
@@ -230,21 +293,29 @@ class FirstPartyPythonTargetsMappingMarker(FirstPartyPythonMappingImplMarker):
     pass
 
 
-@rule(desc="Creating map of first party Python targets to Python modules", level=LogLevel.DEBUG)
-async def map_first_party_python_targets_to_modules(
-    _: FirstPartyPythonTargetsMappingMarker,
-    all_python_targets: AllPythonTargets,
+@dataclass(frozen=True)
+class _FirstPartyPythonTargetsInDirectoryRequest:
+    """The addresses of all targets which are defined in a single directory."""
+
+    addresses: Addresses
+
+
+@rule(level=LogLevel.DEBUG)
+async def map_first_party_python_targets_in_directory(
+    request: _FirstPartyPythonTargetsInDirectoryRequest,
     python_setup: PythonSetup,
 ) -> FirstPartyPythonMappingImpl:
+    targets = await Get(UnexpandedTargets, Addresses, request.addresses)
+    python_targets = [tgt for tgt in targets if tgt.has_field(PythonSourceField)]
     stripped_file_per_target = await MultiGet(
         Get(StrippedFileName, StrippedFileNameRequest(tgt[PythonSourceField].file_path))
-        for tgt in all_python_targets.first_party
+        for tgt in python_targets
     )
 
     resolves_to_modules_to_providers: DefaultDict[
         ResolveName, DefaultDict[str, list[ModuleProvider]]
     ] = defaultdict(lambda: defaultdict(list))
-    for tgt, stripped_file in zip(all_python_targets.first_party, stripped_file_per_target):
+    for tgt, stripped_file in zip(python_targets, stripped_file_per_target):
         resolve = tgt[PythonResolveField].normalized_value(python_setup)
         stripped_f = PurePath(stripped_file.value)
         provider_type = (
@@ -258,6 +329,43 @@ async def map_first_party_python_targets_to_modules(
     return FirstPartyPythonMappingImpl.create(resolves_to_modules_to_providers)
 
 
+@rule(desc="Creating map of first party Python targets to Python modules", level=LogLevel.DEBUG)
+async def map_first_party_python_targets_to_modules(
+    _: FirstPartyPythonTargetsMappingMarker,
+) -> FirstPartyPythonMappingImpl:
+    # The mapping is computed for each directory that defines targets, so that adding or editing a
+    # target only recomputes the mapping of its own directory, rather than of the whole repository.
+    all_addresses = await Get(
+        Addresses,
+        RawSpecsWithoutFileOwners(
+            recursive_globs=(RecursiveGlobSpec(""),),
+            description_of_origin="the first-party Python module mapping",
+        ),
+    )
+    addresses_per_directory: DefaultDict[str, list[Address]] = defaultdict(list)
+    for address in all_addresses:
+        addresses_per_directory[address.spec_path].append(address)
+    mapping_per_directory = await MultiGet(
+        Get(
+            FirstPartyPythonMappingImpl,
+            _FirstPartyPythonTargetsInDirectoryRequest(
+                Addresses(addresses_per_directory[directory])
+            ),
+        )
+        for directory in sorted(addresses_per_directory)
+    )
+
+    resolves_to_modules_to_providers: DefaultDict[
+        ResolveName, DefaultDict[str, list[ModuleProvider]]
+    ] = defaultdict(lambda: defaultdict(list))
+    for mapping in mapping_per_directory:
+        for resolve, modules_to_providers in mapping.items():
+            for module, providers in modules_to_providers.items():
+                resolves_to_modules_to_providers[resolve][module].extend(providers)
+
+    return FirstPartyPythonMappingImpl.create(resolves_to_modules_to_providers)
+
+
 # -----------------------------------------------------------------------------------------------
 # Third party module mapping
 # -----------------------------------------------------------------------------------------------
@@ -271,6 +379,12 @@ class ThirdPartyPythonModuleMapping:
     resolves_to_modules_to_providers: FrozenDict[
         ResolveName, FrozenDict[str, Tuple[ModuleProvider, ...]]
     ]
+    _index: _ModuleProvidersIndex = field(init=False, repr=False, compare=False, hash=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "_index", _ModuleProvidersIndex(self.resolves_to_modules_to_providers)
+        )
 
     def _providers_for_resolve(
         self, module: str, resolve: str, ancestry: int = 0
@@ -300,12 +414,7 @@ class ThirdPartyPythonModuleMapping:
         """
         if resolve:
             return self._providers_for_resolve(module, resolve)
-        return tuple(
-            itertools.chain.from_iterable(
-                self._providers_for_resolve(module, resolve)
-                for resolve in list(self.resolves_to_modules_to_providers.keys())
-            )
-        )
+        return self._index.closest_ancestor(module)
 
 
 @rule(desc="Creating map of third party targets to Python modules", level=LogLevel.DEBUG)
@@ -376,6 +485,89 @@ async def map_third_party_modules_to_addresses(
     )
 
 
+# -----------------------------------------------------------------------------------------------
+# Module mappings per top-level package
+# -----------------------------------------------------------------------------------------------
+
+
+def _top_level_package(module: str) -> str:
+    return module.partition(".")[0]
+
+
+@dataclass(frozen=True)
+class _PackageModuleMappings:
+    """The first-party and third-party module mappings, restricted to a single top-level package.
+
+    A module can only be provided by itself or by one of its ancestors, which all share its
+    top-level package. Finding the owners of a module therefore only depends on the mappings of its
+    top-level package, and is not invalidated when the modules of other packages change.
+    """
+
+    first_party: FirstPartyPythonModuleMapping
+    third_party: ThirdPartyPythonModuleMapping
+
+
+@dataclass(frozen=True)
+class _PackageModuleMappingsRequest:
+    package: str
+
+
+class _AllPackageModuleMappings(FrozenDict[str, _PackageModuleMappings]):
+    pass
+
+
+def _split_by_top_level_package(
+    resolves_to_modules_to_providers: Mapping[
+        ResolveName, Mapping[str, Tuple[ModuleProvider, ...]]
+    ],
+) -> dict[str, FrozenDict[ResolveName, FrozenDict[str, Tuple[ModuleProvider, ...]]]]:
+    packages: DefaultDict[
+        str, dict[ResolveName, dict[str, Tuple[ModuleProvider, ...]]]
+    ] = defaultdict(dict)
+    # NB: Resolves are visited in order, so each package preserves the order of the resolves.
+    for resolve, modules_to_providers in resolves_to_modules_to_providers.items():
+        for module, providers in modules_to_providers.items():
+            packages[_top_level_package(module)].setdefault(resolve, {})[module] = providers
+    return {
+        package: FrozenDict(
+            (resolve, FrozenDict(modules_to_providers))
+            for resolve, modules_to_providers in resolves.items()
+        )
+        for package, resolves in packages.items()
+    }
+
+
+@rule(desc="Splitting Python module mappings by package", level=LogLevel.DEBUG)
+async def split_module_mappings_by_package(
+    first_party_mapping: FirstPartyPythonModuleMapping,
+    third_party_mapping: ThirdPartyPythonModuleMapping,
+) -> _AllPackageModuleMappings:
+    first_party = _split_by_top_level_package(first_party_mapping.resolves_to_modules_to_providers)
+    third_party = _split_by_top_level_package(third_party_mapping.resolves_to_modules_to_providers)
+    return _AllPackageModuleMappings(
+        (
+            package,
+            _PackageModuleMappings(
+                FirstPartyPythonModuleMapping(first_party.get(package, FrozenDict())),
+                ThirdPartyPythonModuleMapping(third_party.get(package, FrozenDict())),
+            ),
+        )
+        for package in sorted(first_party.keys() | third_party.keys())
+    )
+
+
+@rule
+async def module_mappings_for_package(
+    request: _PackageModuleMappingsRequest, all_package_mappings: _AllPackageModuleMappings
+) -> _PackageModuleMappings:
+    mappings = all_package_mappings.get(request.package)
+    if mappings is None:
+        return _PackageModuleMappings(
+            FirstPartyPythonModuleMapping(FrozenDict()), ThirdPartyPythonModuleMapping(FrozenDict())
+        )
+    return mappings
+
+
 # -----------------------------------------------------------------------------------------------
 # module -> owners
 # -----------------------------------------------------------------------------------------------
@@ -416,8 +608,23 @@ class PythonModuleOwnersRequest:
     locality: str | None = None
 
 
-@rule
-async def map_module_to_address(
+@dataclass(frozen=True)
+class PythonModulesOwnersRequest:
+    """The owners of each of several modules, e.g. of all of the imports of a file.
+
+    Equivalent to a `PythonModuleOwnersRequest` per module, but computed in a single rule.
+    """
+
+    modules: tuple[str, ...]
+    resolve: str | None
+    locality: str | None = None
+
+
+class PythonModulesOwners(FrozenDict[str, PythonModuleOwners]):
+    """The owners of each requested module."""
+
+
+def _find_module_owners(
     request: PythonModuleOwnersRequest,
     first_party_mapping: FirstPartyPythonModuleMapping,
     third_party_mapping: ThirdPartyPythonModuleMapping,
@@ -478,6 +685,33 @@ async def map_module_to_address(
     return PythonModuleOwners(addresses)
 
 
+@rule
+async def map_module_to_address(request: PythonModuleOwnersRequest) -> PythonModuleOwners:
+    mappings = await Get(
+        _PackageModuleMappings, _PackageModuleMappingsRequest(_top_level_package(request.module))
+    )
+    return _find_module_owners(request, mappings.first_party, mappings.third_party)
+
+
+@rule
+async def map_modules_to_addresses(request: PythonModulesOwnersRequest) -> PythonModulesOwners:
+    packages = sorted({_top_level_package(module) for module in request.modules})
+    mappings_per_package = await MultiGet(
+        Get(_PackageModuleMappings, _PackageModuleMappingsRequest(package)) for package in packages
+    )
+    package_to_mappings = dict(zip(packages, mappings_per_package))
+
+    def owners(module: str) -> PythonModuleOwners:
+        mappings = package_to_mappings[_top_level_package(module)]
+        return _find_module_owners(
+            PythonModuleOwnersRequest(module, request.resolve, request.locality),
+            mappings.first_party,
+            mappings.third_party,
+        )
+
+    return PythonModulesOwners((module, owners(module)) for module in request.modules)
+
+
 def rules():
     return (
         *collect_rules(),
@@ -27,6 +27,8 @@ from pants.backend.python.dependency_inference.module_mapper import (
     PossibleModuleProvider,
     PythonModuleOwners,
     PythonModuleOwnersRequest,
+    PythonModulesOwners,
+    PythonModulesOwnersRequest,
     ThirdPartyPythonModuleMapping,
     module_from_stripped_path,
 )
@@ -234,6 +236,7 @@ def rule_runner() -> RuleRunner:
             QueryRule(FirstPartyPythonModuleMapping, []),
             QueryRule(ThirdPartyPythonModuleMapping, []),
             QueryRule(PythonModuleOwners, [PythonModuleOwnersRequest]),
+            QueryRule(PythonModulesOwners, [PythonModulesOwnersRequest]),
         ],
         target_types=[
             PythonSourceTarget,
@@ -753,6 +756,84 @@ def test_map_module_considers_resolves(rule_runner: RuleRunner) -> None:
     )
 
 
+def test_map_modules_to_addresses(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "src/python/project/app.py": "",
+            "src/python/project/BUILD": "python_sources()",
+            "BUILD": dedent(
+                """\
+                python_requirement(name="colors", requirements=["ansicolors"])
+                python_requirement(name="req1", requirements=["req"])
+                python_requirement(name="req2", requirements=["req"])
+                """
+            ),
+        }
+    )
+    rule_runner.set_options(["--source-root-patterns=['src/python']"])
+    modules = ("project.app.App", "colors.red", "req", "unknown")
+    result = rule_runner.request(
+        PythonModulesOwners, [PythonModulesOwnersRequest(modules, resolve=None)]
+    )
+    assert result == PythonModulesOwners(
+        (
+            module,
+            rule_runner.request(
+                PythonModuleOwners, [PythonModuleOwnersRequest(module, resolve=None)]
+            ),
+        )
+        for module in modules
+    )
+    assert result["project.app.App"].unambiguous == (
+        Address("src/python/project", relative_file_path="app.py"),
+    )
+    assert result["colors.red"].unambiguous == (Address("", target_name="colors"),)
+    assert result["req"].ambiguous == (
+        Address("", target_name="req1"),
+        Address("", target_name="req2"),
+    )
+    assert result["unknown"] == PythonModuleOwners(())
+
+
+def test_map_first_party_modules_after_changes(rule_runner: RuleRunner) -> None:
+    rule_runner.set_options(["--source-root-patterns=['src/python']"])
+    rule_runner.write_files(
+        {
+            "src/python/project/app.py": "",
+            "src/python/project/BUILD": "python_sources()",
+            "src/python/other/lib.py": "",
+            "src/python/other/BUILD": "python_sources()",
+        }
+    )
+
+    def get_owners(module: str) -> tuple[Address, ...]:
+        return rule_runner.request(
+            PythonModuleOwners, [PythonModuleOwnersRequest(module, resolve=None)]
+        ).unambiguous
+
+    def get_modules() -> set[str]:
+        mapping = rule_runner.request(FirstPartyPythonModuleMapping, [])
+        return {
+            module
+            for modules_to_providers in mapping.resolves_to_modules_to_providers.values()
+            for module in modules_to_providers
+        }
+
+    assert get_modules() == {"project.app", "other.lib"}
+    assert get_owners("project.util") == ()
+
+    rule_runner.write_files({"src/python/project/util.py": ""})
+    assert get_modules() == {"project.app", "project.util", "other.lib"}
+    assert get_owners("project.util") == (
+        Address("src/python/project", relative_file_path="util.py"),
+    )
+    assert get_owners("other.lib") == (Address("src/python/other", relative_file_path="lib.py"),)
+
+    rule_runner.write_files({"src/python/project/BUILD": "python_sources(sources=['app.py'])"})
+    assert get_modules() == {"project.app", "other.lib"}
+    assert get_owners("project.util") == ()
+
+
 def test_issue_15111(rule_runner: RuleRunner) -> None:
     """Ensure we can handle when a single address provides multiple modules.
 
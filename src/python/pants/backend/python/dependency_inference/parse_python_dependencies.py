@@ -1,27 +1,46 @@
 # Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import functools
+import itertools
 import json
 import os
+import threading
+import warnings
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Any, Iterable, Mapping
 
+from pants.backend.python.dependency_inference.scripts.general_dependency_visitor import (
+    GeneralDependencyVisitor,
+)
+from pants.backend.python.dependency_inference.scripts.main import parse_content
 from pants.backend.python.dependency_inference.subsystem import PythonInferSubsystem
-from pants.backend.python.target_types import PythonSourceField
+from pants.backend.python.subsystems.setup import PythonSetup
+from pants.backend.python.target_types import InterpreterConstraintsField, PythonSourceField
 from pants.backend.python.util_rules.interpreter_constraints import InterpreterConstraints
 from pants.backend.python.util_rules.pex_environment import PythonExecutable
+from pants.base.specs import DirGlobSpec, RawSpecs
 from pants.core.util_rules.source_files import SourceFilesRequest
 from pants.core.util_rules.stripped_source_files import StrippedSourceFiles
 from pants.engine.collection import DeduplicatedCollection
 from pants.engine.environment import EnvironmentName
-from pants.engine.fs import CreateDigest, Digest, FileContent, MergeDigests
+from pants.engine.fs import (
+    CreateDigest,
+    Digest,
+    DigestContents,
+    FileContent,
+    GlobMatchErrorBehavior,
+    MergeDigests,
+)
 from pants.engine.process import Process, ProcessResult
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.engine.target import Targets
 from pants.engine.unions import UnionMembership, UnionRule, union
 from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
 from pants.util.resources import read_resource
-from pants.util.strutil import softwrap
+from pants.util.strutil import pluralize, softwrap
 
 
 @dataclass(frozen=True)
@@ -77,6 +96,9 @@ class ParserScript:
 
 
 _scripts_package = "pants.backend.python.dependency_inference.scripts"
+_GENERAL_DEPENDENCY_VISITOR_CLASSNAME = (
+    f"{_scripts_package}.general_dependency_visitor.GeneralDependencyVisitor"
+)
 
 
 async def get_scripts_digest(scripts_package: str, filenames: Iterable[str]) -> Digest:
@@ -151,10 +173,9 @@ async def general_parser_script(
     _: GeneralPythonDependencyVisitorRequest,
 ) -> PythonDependencyVisitor:
     script_digest = await get_scripts_digest(_scripts_package, ["general_dependency_visitor.py"])
-    classname = f"{_scripts_package}.general_dependency_visitor.GeneralDependencyVisitor"
     return PythonDependencyVisitor(
         digest=script_digest,
-        classname=classname,
+        classname=_GENERAL_DEPENDENCY_VISITOR_CLASSNAME,
         env=FrozenDict(
             {
                 "STRING_IMPORTS": "y" if python_infer_subsystem.string_imports else "n",
@@ -166,22 +187,208 @@ async def general_parser_script(
     )
 
 
+# The maximum number of files to parse with a single process. Files are batched by the directory of
+# their target, so larger batches mean that more files are re-parsed when any file in the batch
+# changes.
+_MAX_BATCH_SIZE = 64
+
+
+@dataclass(frozen=True)
+class _PythonSourceBatchesRequest:
+    directory: str
+    interpreter_constraints: InterpreterConstraints
+
+
+@dataclass(frozen=True)
+class _PythonSourceBatches:
+    batches: tuple[tuple[PythonSourceField, ...], ...]
+
+
+@dataclass(frozen=True)
+class _ParsePythonDependenciesBatchRequest:
+    sources: tuple[PythonSourceField, ...]
+    interpreter_constraints: InterpreterConstraints
+    # Whether the sources may be parsed in the Pants process, rather than in a subprocess.
+    in_process: bool = True
+
+
+class _ParsedPythonDependenciesBatch(FrozenDict[str, ParsedPythonDependencies]):
+    """The parsed dependencies of each source in a batch, by the path of its file."""
+
+
 @rule
-async def parse_python_dependencies(
-    request: ParsePythonDependenciesRequest,
+async def batch_python_sources(
+    request: _PythonSourceBatchesRequest, python_setup: PythonSetup
+) -> _PythonSourceBatches:
+    """Batch the sources of the targets in a directory which have the given interpreter
+    constraints, so that they can be parsed by a single process."""
+    targets = await Get(
+        Targets,
+        RawSpecs(
+            dir_globs=(DirGlobSpec(request.directory),),
+            unmatched_glob_behavior=GlobMatchErrorBehavior.ignore,
+            description_of_origin="the `parse_python_dependencies` rule",
+        ),
+    )
+    sources = sorted(
+        (
+            tgt[PythonSourceField]
+            for tgt in targets
+            if tgt.has_field(PythonSourceField)
+            and InterpreterConstraints.create_from_compatibility_fields(
+                [tgt.get(InterpreterConstraintsField)], python_setup
+            )
+            == request.interpreter_constraints
+        ),
+        key=lambda source: source.file_path,
+    )
+    return _PythonSourceBatches(
+        tuple(
+            tuple(sources[i : i + _MAX_BATCH_SIZE]) for i in range(0, len(sources), _MAX_BATCH_SIZE)
+        )
+    )
+
+
+def _parsed_python_dependencies(output: dict[str, Any]) -> ParsedPythonDependencies:
+    return ParsedPythonDependencies(
+        imports=ParsedPythonImports(
+            (key, ParsedPythonImportInfo(**val)) for key, val in output.get("imports", {}).items()
+        ),
+        assets=ParsedPythonAssetPaths(output.get("assets", [])),
+    )
+
+
+def _can_parse_in_process(
+    interpreter_constraints: InterpreterConstraints,
     parser_script: ParserScript,
-) -> ParsedPythonDependencies:
-    python_interpreter, stripped_sources = await MultiGet(
-        Get(PythonExecutable, InterpreterConstraints, request.interpreter_constraints),
-        Get(StrippedSourceFiles, SourceFilesRequest([request.source])),
+    python_infer_subsystem: PythonInferSubsystem,
+) -> bool:
+    """Whether the sources can be parsed by the Pants interpreter, rather than in a subprocess.
+
+    This is only possible when the general dependency visitor is the only visitor (since the code
+    of plugin visitors is only available in their digests), and the sources are Python 3. Since
+    the syntax of Python 3 minor versions differs, sources which fail to parse with the Pants
+    interpreter are still parsed in a subprocess.
+
+    Unlike the result of a subprocess, the result of parsing in-process is not persisted in the
+    process cache, so this is opt-in via `[python-infer].parse_imports_in_process`.
+    """
+    return (
+        python_infer_subsystem.parse_imports_in_process
+        and parser_script.env.get("VISITOR_CLASSNAMES") == _GENERAL_DEPENDENCY_VISITOR_CLASSNAME
+        and not interpreter_constraints.includes_python2()
+    )
+
+
+# NB: `warnings.catch_warnings` saves and restores the process-wide warnings filters, so it must
+# not be entered concurrently by rule threads.
+_parse_in_process_lock = threading.Lock()
+
+
+def _parse_in_process(file_content: FileContent, env: Mapping[str, str]) -> dict[str, Any] | None:
+    """Parse the file with the Pants interpreter, or return None if it is not valid syntax for
+    this interpreter."""
+    try:
+        with _parse_in_process_lock, warnings.catch_warnings():
+            # Invalid escape sequences in the parsed file are irrelevant to dependency inference.
+            for category in (DeprecationWarning, SyntaxWarning):
+                warnings.filterwarnings(
+                    "ignore", category=category, message="invalid escape sequence"
+                )
+            return parse_content(
+                file_content.path,
+                file_content.content,
+                [functools.partial(GeneralDependencyVisitor, env=env)],
+            )
+    except (SyntaxError, ValueError):
+        # NB: `ast.parse` raises ValueError for source containing null bytes.
+        return None
+
+
+@rule
+async def parse_python_dependencies_batch(
+    request: _ParsePythonDependenciesBatchRequest,
+    parser_script: ParserScript,
+    python_infer_subsystem: PythonInferSubsystem,
+) -> _ParsedPythonDependenciesBatch:
+    all_stripped_sources = await MultiGet(
+        Get(StrippedSourceFiles, SourceFilesRequest([source])) for source in request.sources
+    )
+
+    if request.in_process and _can_parse_in_process(
+        request.interpreter_constraints, parser_script, python_infer_subsystem
+    ):
+        all_digest_contents = await MultiGet(
+            Get(DigestContents, Digest, stripped_sources.snapshot.digest)
+            for stripped_sources in all_stripped_sources
+        )
+        parsed: dict[str, ParsedPythonDependencies] = {}
+        unparsed_sources = []
+        for source, digest_contents in zip(request.sources, all_digest_contents):
+            # We operate on PythonSourceField, which should be one file.
+            (file_content,) = digest_contents
+            output = _parse_in_process(file_content, parser_script.env)
+            if output is None:
+                unparsed_sources.append(source)
+            else:
+                parsed[source.file_path] = _parsed_python_dependencies(output)
+        if unparsed_sources:
+            parsed.update(
+                await Get(
+                    _ParsedPythonDependenciesBatch,
+                    _ParsePythonDependenciesBatchRequest(
+                        tuple(unparsed_sources), request.interpreter_constraints, in_process=False
+                    ),
+                )
+            )
+        return _ParsedPythonDependenciesBatch(parsed)
+
+    python_interpreter = await Get(
+        PythonExecutable, InterpreterConstraints, request.interpreter_constraints
     )
 
     # We operate on PythonSourceField, which should be one file.
-    assert len(stripped_sources.snapshot.files) == 1
-    file = stripped_sources.snapshot.files[0]
+    sources_by_stripped_file: dict[str, dict[str, PythonSourceField]] = defaultdict(dict)
+    for source, stripped_sources in zip(request.sources, all_stripped_sources):
+        assert len(stripped_sources.snapshot.files) == 1
+        sources_by_stripped_file[stripped_sources.snapshot.files[0]][source.file_path] = source
+
+    # Files from different source roots may have the same stripped path, and so can't be parsed in
+    # the same sandbox: parse those on their own.
+    colliding_sources = [
+        source
+        for sources in sources_by_stripped_file.values()
+        if len(sources) > 1
+        for source in sources.values()
+    ]
+    colliding_results = await MultiGet(
+        Get(
+            _ParsedPythonDependenciesBatch,
+            _ParsePythonDependenciesBatchRequest(
+                (source,), request.interpreter_constraints, in_process=False
+            ),
+        )
+        for source in colliding_sources
+    )
+    results: dict[str, ParsedPythonDependencies] = dict(
+        itertools.chain.from_iterable(result.items() for result in colliding_results)
+    )
+    files = sorted(file for file, sources in sources_by_stripped_file.items() if len(sources) == 1)
+    if not files:
+        return _ParsedPythonDependenciesBatch(results)
 
     input_digest = await Get(
-        Digest, MergeDigests([parser_script.digest, stripped_sources.snapshot.digest])
+        Digest,
+        MergeDigests(
+            [
+                parser_script.digest,
+                *(
+                    stripped_sources.snapshot.digest
+                    for stripped_sources in all_stripped_sources
+                    if len(sources_by_stripped_file[stripped_sources.snapshot.files[0]]) == 1
+                ),
+            ]
+        ),
     )
     process_result = await Get(
         ProcessResult,
@@ -189,10 +396,14 @@ async def parse_python_dependencies(
             argv=[
                 python_interpreter.path,
                 "pants/backend/python/dependency_inference/scripts/main.py",
-                file,
+                *files,
             ],
             input_digest=input_digest,
-            description=f"Determine Python dependencies for {request.source.address}",
+            description=(
+                f"Determine Python dependencies for {request.sources[0].address}"
+                if len(request.sources) == 1
+                else f"Determine Python dependencies for {pluralize(len(files), 'file')}"
+            ),
             env=parser_script.env,
             level=LogLevel.DEBUG,
         ),
@@ -200,14 +411,37 @@ async def parse_python_dependencies(
     # See in script for where we explicitly encoded as utf8. Even though utf8 is the
     # default for decode(), we make that explicit here for emphasis.
     process_output = process_result.stdout.decode("utf8") or "{}"
-    output = json.loads(process_output)
+    outputs = json.loads(process_output)
 
-    return ParsedPythonDependencies(
-        imports=ParsedPythonImports(
-            (key, ParsedPythonImportInfo(**val)) for key, val in output.get("imports", {}).items()
+    for file in files:
+        (file_path,) = sources_by_stripped_file[file]
+        results[file_path] = _parsed_python_dependencies(outputs.get(file, {}))
+    return _ParsedPythonDependenciesBatch(results)
+
+
+@rule
+async def parse_python_dependencies(
+    request: ParsePythonDependenciesRequest,
+) -> ParsedPythonDependencies:
+    # Parse the source in a batch with the other sources in its directory which have the same
+    # interpreter constraints. The source might not be a member of such a batch (for example, if
+    # the interpreter constraints were not computed from its target), in which case it is parsed
+    # on its own.
+    source_batches = await Get(
+        _PythonSourceBatches,
+        _PythonSourceBatchesRequest(
+            request.source.address.spec_path, request.interpreter_constraints
         ),
-        assets=ParsedPythonAssetPaths(output.get("assets", [])),
     )
+    batch = next(
+        (batch for batch in source_batches.batches if request.source in batch),
+        (request.source,),
+    )
+    parsed_batch = await Get(
+        _ParsedPythonDependenciesBatch,
+        _ParsePythonDependenciesBatchRequest(batch, request.interpreter_constraints),
+    )
+    return parsed_batch[request.source.file_path]
 
 
 def rules():
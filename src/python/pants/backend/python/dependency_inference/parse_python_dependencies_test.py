@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import warnings
 from textwrap import dedent
 
 import pytest
@@ -22,6 +23,7 @@ from pants.backend.python.util_rules import pex
 from pants.backend.python.util_rules.interpreter_constraints import InterpreterConstraints
 from pants.core.util_rules import stripped_source_files
 from pants.engine.addresses import Address
+from pants.engine.fs import FileContent
 from pants.testutil.python_interpreter_selection import (
     skip_unless_python27_present,
     skip_unless_python38_present,
@@ -555,3 +557,104 @@ def test_assets(rule_runner: RuleRunner, min_slashes: int) -> None:
         rule_runner, content, expected_assets=expected, assets_min_slashes=min_slashes
     )
     assert_deps_parsed(rule_runner, content, assets=False, expected_assets=[])
+
+
+def test_batched_parsing(rule_runner: RuleRunner) -> None:
+    """Sources in the same directory with the same interpreter constraints are parsed together, but
+    each still gets its own result."""
+    rule_runner.set_options(
+        ["--python-interpreter-constraints=['>=3.6']"],
+        env_inherit={"PATH", "PYENV_ROOT", "HOME"},
+    )
+    rule_runner.write_files(
+        {
+            "project/BUILD": dedent(
+                """\
+                python_source(name='a', source='a.py')
+                python_source(name='b', source='b.py')
+                python_source(name='py2', source='py2.py', interpreter_constraints=['==2.7.*'])
+                """
+            ),
+            "project/a.py": "import os\n",
+            "project/b.py": "\nimport json\n",
+            "project/py2.py": "import sys\n",
+        }
+    )
+
+    def parse(name: str) -> ParsedPythonDependencies:
+        tgt = rule_runner.get_target(Address("project", target_name=name))
+        return rule_runner.request(
+            ParsedPythonDependencies,
+            [
+                ParsePythonDependenciesRequest(
+                    tgt[PythonSourceField], InterpreterConstraints([">=3.6"])
+                )
+            ],
+        )
+
+    assert dict(parse("a").imports) == {"os": ImpInfo(lineno=1, weak=False)}
+    assert dict(parse("b").imports) == {"json": ImpInfo(lineno=2, weak=False)}
+    # Not a member of the batch for these interpreter constraints, so parsed on its own.
+    assert dict(parse("py2").imports) == {"sys": ImpInfo(lineno=1, weak=False)}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        dedent(
+            """\
+            import os
+            from project.demo import Demo
+
+            try:
+                import weak
+            except ImportError:
+                pass
+
+            __import__("dunder")
+            importlib.import_module("pkg.mod.Class")
+            open("data/file.json")
+            x = "\\d"
+            """
+        ),
+        # Invalid syntax, which falls back to parsing in a subprocess.
+        "import os\nthis is not python\n",
+    ],
+)
+def test_parse_in_process_matches_subprocess(rule_runner: RuleRunner, content: str) -> None:
+    rule_runner.write_files({"BUILD": "python_source(name='t', source='project/foo.py')"})
+    rule_runner.write_files({"project/foo.py": content})
+
+    def parse(in_process: bool) -> ParsedPythonDependencies:
+        rule_runner.set_options(
+            [
+                f"--python-infer-parse-imports-in-process={in_process}",
+                "--python-infer-string-imports",
+                "--python-infer-assets",
+            ],
+            env_inherit={"PATH", "PYENV_ROOT", "HOME"},
+        )
+        tgt = rule_runner.get_target(Address("", target_name="t"))
+        return rule_runner.request(
+            ParsedPythonDependencies,
+            [
+                ParsePythonDependenciesRequest(
+                    tgt[PythonSourceField], InterpreterConstraints([">=3.6"])
+                )
+            ],
+        )
+
+    assert parse(in_process=True) == parse(in_process=False)
+
+
+def test_parse_in_process_ignores_invalid_escape_sequences() -> None:
+    filters = list(warnings.filters)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        output = parse_python_dependencies._parse_in_process(
+            FileContent("project/foo.py", b'import os\nx = "\\d"\n'), {}
+        )
+    assert output is not None
+    assert not caught
+    # The filter is scoped to the parse, rather than installed for the whole process.
+    assert warnings.filters == filters
@@ -18,27 +18,29 @@ from pants.backend.python.dependency_inference.scripts.dependency_visitor_base i
 
 class GeneralDependencyVisitor(DependencyVisitorBase):
     def __init__(self, *args, **kwargs):
+        # The options of the visitor are read from `env`, which defaults to the environment.
+        env = kwargs.pop("env", None)
+        if env is None:
+            env = os.environ
         super(GeneralDependencyVisitor, self).__init__(*args, **kwargs)
 
-        if os.environ.get("STRING_IMPORTS", "n") == "y":
+        if env.get("STRING_IMPORTS", "n") == "y":
             # This regex is used to infer imports from strings, e.g .
             #  `importlib.import_module("example.subdir.Foo")`.
             self._string_import_regex = re.compile(
-                r"^([a-z_][a-z_\d]*\.){"
-                + os.environ["STRING_IMPORTS_MIN_DOTS"]
-                + r",}[a-zA-Z_]\w*$",
+                r"^([a-z_][a-z_\d]*\.){" + env["STRING_IMPORTS_MIN_DOTS"] + r",}[a-zA-Z_]\w*$",
                 re.UNICODE,
             )
         else:
             self._string_import_regex = None
 
-        if os.environ.get("ASSETS", "n") == "y":
+        if env.get("ASSETS", "n") == "y":
             # This regex is used to infer asset names from strings, e.g.
             #  `load_resource("data/db1.json")
             # Since Unix allows basically anything for filenames, we require some "sane" subset of
             #  possibilities namely, word-character filenames and a mandatory extension.
             self._asset_regex = re.compile(
-                r"^([\w-]*\/){" + os.environ["ASSETS_MIN_SLASHES"] + r",}[\w-]*(\.[^\/\.\n]+)+$",
+                r"^([\w-]*\/){" + env["ASSETS_MIN_SLASHES"] + r",}[\w-]*(\.[^\/\.\n]+)+$",
                 re.UNICODE,
             )
         else:
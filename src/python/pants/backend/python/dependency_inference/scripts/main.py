@@ -3,13 +3,13 @@
 # -*- coding: utf-8 -*-
 
 # NB: This must be compatible with Python 2.7 and 3.5+.
-# NB: An easy way to debug this is to just invoke it on a file.
+# NB: An easy way to debug this is to just invoke it on one or more files.
 #   E.g.
 #   $ PYTHONPATH=src/python STRING_IMPORTS=y python \
-#     src/python/pants/backend/python/dependency_inference/scripts/main.py FILE
+#     src/python/pants/backend/python/dependency_inference/scripts/main.py FILE...
 #   Or
 #   $ ./pants --no-python-infer-imports run \
-#     src/python/pants/backend/python/dependency_inference/scripts/main.py -- FILE
+#     src/python/pants/backend/python/dependency_inference/scripts/main.py -- FILE...
 
 from __future__ import print_function, unicode_literals
 
@@ -25,33 +25,35 @@ from pants.backend.python.dependency_inference.scripts.dependency_visitor_base i
 )
 
 
-def main(filename):
-    with open(filename, "rb") as f:
-        content = f.read()
-    try:
-        tree = ast.parse(content, filename=filename)
-    except SyntaxError:
-        return
-
-    package_parts = os.path.dirname(filename).split(os.path.sep)
+def load_visitor_classes():
     visitor_classnames = os.environ.get(
         "VISITOR_CLASSNAMES",
         "pants.backend.python.dependency_inference.scripts.general_dependency_visitor.GeneralDependencyVisitor",
     ).split("|")
-    visitors = []
-    found_dependencies = FoundDependencies()
+    visitor_classes = []
     for visitor_classname in visitor_classnames:
         module_name, _, class_name = visitor_classname.rpartition(".")
         module = importlib.import_module(module_name)
-        visitor_cls = getattr(module, class_name)
-        visitors.append(visitor_cls(found_dependencies, package_parts, content))
+        visitor_classes.append(getattr(module, class_name))
+    return visitor_classes
+
+
+def parse_content(filename, content, visitor_factories):
+    """Parse the content of the file, raising a SyntaxError if it is not valid Python.
+
+    Each of `visitor_factories` is called with the arguments of `DependencyVisitorBase` to create
+    a visitor: usually, they are the visitor classes themselves.
+    """
+    tree = ast.parse(content, filename=filename)
+
+    package_parts = os.path.dirname(filename).split(os.path.sep)
+    found_dependencies = FoundDependencies()
+    visitors = [
+        factory(found_dependencies, package_parts, content) for factory in visitor_factories
+    ]
     for visitor in visitors:
         visitor.visit(tree)
 
-    # We have to be careful to set the encoding explicitly and write raw bytes ourselves.
-    # See below for where we explicitly decode.
-    buffer = sys.stdout if sys.version_info[0:2] == (2, 7) else sys.stdout.buffer
-
     # N.B. Start with weak and `update` with definitive so definite "wins"
     imports_result = {
         module_name: {"lineno": lineno, "weak": True}
@@ -64,15 +66,30 @@ def main(filename):
         }
     )
 
-    buffer.write(
-        json.dumps(
-            {
-                "imports": imports_result,
-                "assets": sorted(found_dependencies.assets),
-            }
-        ).encode("utf8")
-    )
+    return {
+        "imports": imports_result,
+        "assets": sorted(found_dependencies.assets),
+    }
+
+
+def parse_file(filename, visitor_classes):
+    with open(filename, "rb") as f:
+        content = f.read()
+    try:
+        return parse_content(filename, content, visitor_classes)
+    except SyntaxError:
+        return {}
+
+
+def main(filenames):
+    visitor_classes = load_visitor_classes()
+    results = {filename: parse_file(filename, visitor_classes) for filename in filenames}
+
+    # We have to be careful to set the encoding explicitly and write raw bytes ourselves.
+    # See below for where we explicitly decode.
+    buffer = sys.stdout if sys.version_info[0:2] == (2, 7) else sys.stdout.buffer
+    buffer.write(json.dumps(results).encode("utf8"))
 
 
 if __name__ == "__main__":
-    main(sys.argv[1])
+    main(sys.argv[1:])
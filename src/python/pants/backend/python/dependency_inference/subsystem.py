@@ -93,6 +93,22 @@ class PythonInferSubsystem(Subsystem):
             """
         ),
     )
+    parse_imports_in_process = BoolOption(
+        default=False,
+        advanced=True,
+        help=softwrap(
+            """
+            If true, parse the imports of Python 3 sources in the Pants process, rather than in a
+            subprocess which runs with the sources' interpreter.
+
+            This avoids starting a process for each batch of sources, but its results are only
+            cached in memory (i.e. by the Pants daemon), whereas the results of subprocesses are
+            also persisted in the local and remote caches. Sources which are not valid syntax for
+            the interpreter which runs Pants are still parsed in a subprocess. Has no effect when
+            a plugin registers its own dependency visitor.
+            """
+        ),
+    )
     init_files = EnumOption(
         help=softwrap(
             f"""
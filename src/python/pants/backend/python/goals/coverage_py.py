@@ -4,11 +4,15 @@
 from __future__ import annotations
 
 import configparser
+import hashlib
+import json
+import logging
+import os
 from dataclasses import dataclass
 from enum import Enum
 from io import StringIO
 from pathlib import PurePath
-from typing import Any, MutableMapping, cast
+from typing import Any, Iterable, Mapping, MutableMapping, cast
 
 import toml
 
@@ -17,6 +21,7 @@ from pants.backend.python.goals.lockfile import (
     GeneratePythonLockfile,
     GeneratePythonToolLockfileSentinel,
 )
+from pants.backend.python.subsystems.pytest import PythonTestFieldSet
 from pants.backend.python.subsystems.python_tool_base import PythonToolBase
 from pants.backend.python.target_types import ConsoleScript
 from pants.backend.python.util_rules.pex import PexRequest, VenvPex, VenvPexProcess
@@ -24,6 +29,8 @@ from pants.backend.python.util_rules.python_sources import (
     PythonSourceFiles,
     PythonSourceFilesRequest,
 )
+from pants.base.build_environment import get_buildroot
+from pants.base.build_root import BuildRoot
 from pants.core.goals.generate_lockfiles import GenerateToolLockfileSentinel
 from pants.core.goals.test import (
     ConsoleCoverageReport,
@@ -35,17 +42,22 @@ from pants.core.goals.test import (
 )
 from pants.core.util_rules.config_files import ConfigFiles, ConfigFilesRequest
 from pants.core.util_rules.distdir import DistDir
+from pants.core.util_rules.system_binaries import GitBinaryException
 from pants.engine.addresses import Address
+from pants.engine.collection import Collection
+from pants.engine.console import Console
 from pants.engine.fs import (
     EMPTY_DIGEST,
     AddPrefix,
     CreateDigest,
     Digest,
     DigestContents,
+    DigestSubset,
     FileContent,
     MergeDigests,
     PathGlobs,
     Snapshot,
+    Workspace,
 )
 from pants.engine.process import FallibleProcessResult, ProcessExecutionFailure, ProcessResult
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
@@ -61,9 +73,15 @@ from pants.option.option_types import (
     StrOption,
 )
 from pants.source.source_root import AllSourceRoots
+from pants.util.dirutil import safe_file_dump
 from pants.util.docutil import git_url
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
-from pants.util.strutil import softwrap
+from pants.util.strutil import pluralize, softwrap
+from pants.vcs.changed import Changed
+from pants.vcs.git import GitWorktreeRequest, MaybeGitWorktree
+
+logger = logging.getLogger(__name__)
 
 """
 An overview:
@@ -83,6 +101,12 @@ report with the source roots restored. Coverage requires that the files it's rep
 when it generates the report, so we populate all the source files.
 
 Step 4: `test.py` outputs the final report.
+
+Test impact analysis (see `[coverage-py].test_impact_analysis`):
+When recording, we additionally run `coverage json` on the `.coverage` file of each test, and record
+which lines of which files it executed, along with the git object id of the content of each file.
+When tests are selected with `--changed-since`, `pytest_runner.py` then skips the tests which did
+not execute any line which has changed since the merge-base of that commit.
 """
 
 
@@ -210,9 +234,47 @@ class CoverageSubsystem(PythonToolBase):
         ),
     )
 
+    test_impact_analysis = BoolOption(
+        default=False,
+        help=lambda cls: softwrap(
+            f"""
+            If true, use the coverage of each test to skip the tests which are unaffected by
+            changes.
+
+            When tests run with `--test-use-coverage`, the lines of each file which each test
+            executed are recorded in `[{cls.options_scope}].test_impact_file`. When tests are
+            selected with `--changed-since`, the tests which did not execute any of the lines
+            which have changed since then are skipped.
+
+            A test is always run if it has no recorded coverage, if its recorded coverage is
+            stale (i.e. it was recorded for different content of its own file or of any measured
+            file than at the merge-base of `--changed-since`), if its own file changed, or if a
+            changed file was not measured while it ran (e.g. a new file). No tests are skipped if
+            any non-Python file changed, since coverage does not capture how other files (such as
+            resources or BUILD files) affect tests.
+
+            To use this in CI, record coverage for all tests on your main branch, and persist
+            the file for use by builds of other branches.
+            """
+        ),
+    )
+    _test_impact_file = StrOption(
+        default=str(PurePath("{distdir}", "coverage", "python", "test_impact.json")),
+        advanced=True,
+        help=lambda cls: softwrap(
+            f"""
+            Path to record the lines executed by each test to, for
+            `[{cls.options_scope}].test_impact_analysis`. Must be relative to the build root.
+            """
+        ),
+    )
+
     def output_dir(self, distdir: DistDir) -> PurePath:
         return PurePath(self._output_dir.format(distdir=distdir.relpath))
 
+    def test_impact_file(self, distdir: DistDir) -> PurePath:
+        return PurePath(self._test_impact_file.format(distdir=distdir.relpath))
+
     @property
     def config_request(self) -> ConfigFilesRequest:
         # Refer to https://coverage.readthedocs.io/en/stable/config.html.
@@ -244,6 +306,8 @@ def setup_coverage_lockfile(
 class PytestCoverageData(CoverageData):
     addresses: tuple[Address, ...]
     digest: Digest
+    # Whether the tests passed: the coverage of failed tests is not used for test impact analysis.
+    passed: bool = True
 
 
 class PytestCoverageDataCollection(CoverageDataCollection[PytestCoverageData]):
@@ -465,27 +529,248 @@ async def merge_coverage_data(
     else:
         extra_sources_digest = EMPTY_DIGEST
 
-    input_digest = await Get(Digest, MergeDigests(await MultiGet(coverage_digest_gets)))
-    result = await Get(
-        ProcessResult,
-        VenvPexProcess(
-            coverage_setup.pex,
-            # We tell combine to keep the original input files, to aid debugging in the sandbox.
-            argv=("combine", "--keep", *sorted(coverage_data_file_paths)),
-            input_digest=input_digest,
-            output_files=(".coverage",),
-            description=f"Merge {len(coverage_data_file_paths)} Pytest coverage reports.",
-            level=LogLevel.DEBUG,
-        ),
+    coverage_digests = await MultiGet(coverage_digest_gets)
+    merged_digest = await _combine_coverage_data(
+        coverage_setup, sorted(zip(coverage_data_file_paths, coverage_digests))
     )
     return MergedCoverageData(
-        await Get(Digest, MergeDigests((result.output_digest, extra_sources_digest))),
+        await Get(Digest, MergeDigests((merged_digest, extra_sources_digest))),
         tuple(addresses),
     )
 
 
+# The maximum number of `.coverage` files merged by a single `coverage combine` process.
+_COMBINE_FAN_IN = 32
+
+
+async def _combine_coverage_data(
+    coverage_setup: CoverageSetup, data_files: list[tuple[str, Digest]]
+) -> Digest:
+    """Merge the given `.coverage` files (by path) into a single `.coverage` file.
+
+    Rather than merging all of the files in one process, which is a long serial step when there are
+    many test partitions, the files are merged in a tree of processes which each merge at most
+    `_COMBINE_FAN_IN` files, and the processes of each level of the tree run in parallel. Since the
+    files are grouped in a stable order, the merges of groups whose files are unchanged (e.g.
+    because their tests were cached) are themselves cached.
+    """
+    level = 0
+    while True:
+        groups = [
+            data_files[i : i + _COMBINE_FAN_IN] for i in range(0, len(data_files), _COMBINE_FAN_IN)
+        ]
+        input_digests = await MultiGet(
+            Get(Digest, MergeDigests(digest for _, digest in group)) for group in groups
+        )
+        results = await MultiGet(
+            Get(
+                ProcessResult,
+                VenvPexProcess(
+                    coverage_setup.pex,
+                    # We tell combine to keep the original input files, to aid debugging in the
+                    # sandbox.
+                    argv=("combine", "--keep", *(path for path, _ in group)),
+                    input_digest=input_digest,
+                    output_files=(".coverage",),
+                    description=f"Merge {len(group)} Pytest coverage reports.",
+                    level=LogLevel.DEBUG,
+                ),
+            )
+            for group, input_digest in zip(groups, input_digests)
+        )
+        if len(results) == 1:
+            return results[0].output_digest
+
+        prefixes = [f"__merged_coverage_{level}_{i}__" for i in range(len(results))]
+        merged_digests = await MultiGet(
+            Get(Digest, AddPrefix(result.output_digest, prefix))
+            for result, prefix in zip(results, prefixes)
+        )
+        data_files = [
+            (f"{prefix}/.coverage", digest) for prefix, digest in zip(prefixes, merged_digests)
+        ]
+        level += 1
+
+
+@dataclass(frozen=True)
+class _CoveredFile:
+    # The git object id (i.e. the `git hash-object`) of the content of the file when it was covered.
+    blob_id: str
+    # The lines which were executed, which may be empty for files which were measured but not
+    # executed (or for the test file itself, if it was not measured).
+    lines: tuple[int, ...]
+
+
+_TestImpact = Mapping[str, Mapping[str, _CoveredFile]]
+
+_TEST_IMPACT_VERSION = 2
+
+
+def _git_blob_id(content: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def load_test_impact(path: str) -> dict[str, Mapping[str, _CoveredFile]]:
+    """Load the files and lines covered by each test (by address spec), recorded at `path`."""
+    try:
+        with open(path) as f:
+            content = json.load(f)
+        if content.get("version") != _TEST_IMPACT_VERSION:
+            logger.debug(f"Ignoring test impact data in {path} with an unsupported version.")
+            return {}
+        return {
+            spec: {
+                file_path: _CoveredFile(covered["blob_id"], tuple(covered["lines"]))
+                for file_path, covered in covered_files.items()
+            }
+            for spec, covered_files in content["tests"].items()
+        }
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, TypeError, AttributeError, KeyError) as e:
+        logger.warning(f"Ignoring invalid test impact data in {path}: {e}")
+        return {}
+
+
+def _dump_test_impact(test_impact: _TestImpact) -> str:
+    return json.dumps(
+        {
+            "version": _TEST_IMPACT_VERSION,
+            "tests": {
+                spec: {
+                    file_path: {"blob_id": covered.blob_id, "lines": list(covered.lines)}
+                    for file_path, covered in sorted(covered_files.items())
+                }
+                for spec, covered_files in sorted(test_impact.items())
+            },
+        }
+    )
+
+
+@dataclass(frozen=True)
+class TestImpactReport(CoverageReport):
+    """Materializes the lines executed by each test to the `[coverage-py].test_impact_file`.
+
+    The recorded lines of tests which did not run are preserved.
+    """
+
+    path: PurePath
+    tests: FrozenDict[str, FrozenDict[str, _CoveredFile]]
+    # Tests which failed, whose previously recorded lines are discarded.
+    failed: tuple[str, ...]
+
+    # Prevent this class from being detected by pytest as a test class.
+    __test__ = False
+
+    def materialize(self, console: Console, workspace: Workspace) -> None:
+        path = os.path.join(get_buildroot(), self.path)
+        test_impact = {**load_test_impact(path), **self.tests}
+        for spec in self.failed:
+            test_impact.pop(spec, None)
+        safe_file_dump(path, _dump_test_impact(test_impact), makedirs=True)
+        console.print_stderr(
+            f"\nWrote the lines executed by {pluralize(len(self.tests), 'test')} to `{self.path}`"
+        )
+        return None
+
+
+async def _get_test_impact_report(
+    data_collection: PytestCoverageDataCollection,
+    sources_digest: Digest,
+    coverage_setup: CoverageSetup,
+    coverage_config: CoverageConfig,
+    path: PurePath,
+) -> TestImpactReport:
+    passed = [data for data in data_collection if data.passed]
+    input_digests = await MultiGet(
+        Get(Digest, MergeDigests((data.digest, coverage_config.digest, sources_digest)))
+        for data in passed
+    )
+    results = await MultiGet(
+        Get(
+            ProcessResult,
+            VenvPexProcess(
+                coverage_setup.pex,
+                argv=(
+                    "json",
+                    f"--rcfile={coverage_config.path}",
+                    "--ignore-errors",
+                    "--fail-under=0",
+                    "-o",
+                    "executed_lines.json",
+                ),
+                input_digest=input_digest,
+                output_files=("executed_lines.json",),
+                description=(
+                    f"Find the lines executed by {pluralize(len(data.addresses), 'test')}."
+                ),
+                level=LogLevel.DEBUG,
+            ),
+        )
+        for data, input_digest in zip(passed, input_digests)
+    )
+    all_contents = await MultiGet(
+        Get(DigestContents, Digest, result.output_digest) for result in results
+    )
+    # All of the files which were measured, including those which were not executed.
+    executed_lines = [
+        {
+            file_path: tuple(file_report["executed_lines"])
+            for file_path, file_report in json.loads(contents[0].content)["files"].items()
+        }
+        for contents in all_contents
+    ]
+    test_paths = {
+        address: address.filename
+        for data in passed
+        for address in data.addresses
+        if address.is_file_target
+    }
+
+    covered_paths = sorted(
+        {file_path for lines in executed_lines for file_path in lines} | {*test_paths.values()}
+    )
+    source_contents = await Get(
+        DigestContents, DigestSubset(sources_digest, PathGlobs(covered_paths))
+    )
+    blob_ids = {
+        file_content.path: _git_blob_id(file_content.content) for file_content in source_contents
+    }
+
+    tests = {}
+    for data, lines in zip(passed, executed_lines):
+        # The tests of a batch share a `.coverage` file, so each is recorded as having executed
+        # the lines executed by the whole batch.
+        covered_files = FrozenDict(
+            (file_path, _CoveredFile(blob_ids[file_path], file_lines))
+            for file_path, file_lines in lines.items()
+            if file_path in blob_ids
+        )
+        for address in data.addresses:
+            test_path = test_paths.get(address)
+            if test_path in blob_ids and test_path not in covered_files:
+                # Record the test file even if it was not measured, so that edits to it are seen.
+                tests[address.spec] = FrozenDict(
+                    {**covered_files, test_path: _CoveredFile(blob_ids[test_path], ())}
+                )
+            else:
+                tests[address.spec] = covered_files
+    return TestImpactReport(
+        coverage_insufficient=False,
+        path=path,
+        tests=FrozenDict(tests),
+        failed=tuple(
+            address.spec
+            for data in data_collection
+            if not data.passed
+            for address in data.addresses
+        ),
+    )
+
+
 @rule(desc="Generate Pytest coverage reports", level=LogLevel.DEBUG)
 async def generate_coverage_reports(
+    data_collection: PytestCoverageDataCollection,
     merged_coverage_data: MergedCoverageData,
     coverage_setup: CoverageSetup,
     coverage_config: CoverageConfig,
@@ -585,6 +870,17 @@ async def generate_coverage_reports(
         )
     )
 
+    if coverage_subsystem.test_impact_analysis:
+        coverage_reports.append(
+            await _get_test_impact_report(
+                data_collection,
+                sources.source_files.snapshot.digest,
+                coverage_setup,
+                coverage_config,
+                coverage_subsystem.test_impact_file(distdir),
+            )
+        )
+
     return CoverageReports(tuple(coverage_reports))
 
 
@@ -617,6 +913,110 @@ def _get_coverage_report(
     )
 
 
+def _is_affected(
+    covered_files: Mapping[str, _CoveredFile],
+    changed_files: Iterable[str],
+    base_blob_ids: Mapping[str, str],
+    changed_lines: Mapping[str, tuple[tuple[int, int], ...]],
+) -> bool:
+    """Whether a test which covered the given files might be affected by the given changes.
+
+    `base_blob_ids` must contain the ids in the base commit of each of the covered files and of the
+    changed files, and `changed_lines` describes the changed files relative to the base commit.
+    """
+    for path, covered in covered_files.items():
+        if base_blob_ids.get(path) != covered.blob_id:
+            # The lines were recorded for different content than that of the base commit.
+            return True
+    for path in changed_files:
+        covered = covered_files.get(path)
+        if covered is None:
+            # The file was not measured while the test ran (e.g. it is new), so it is unknown
+            # whether the test would execute it.
+            return True
+        ranges = changed_lines.get(path)
+        if ranges is None:
+            return True
+        lines = set(covered.lines)
+        for start, count in ranges:
+            # For an insertion, consider the lines on either side of it to have changed.
+            changed_range = range(start, start + count) if count else range(start, start + 2)
+            if any(line in lines for line in changed_range):
+                return True
+    return False
+
+
+@dataclass(frozen=True)
+class UnaffectedPythonTestsRequest:
+    field_sets: tuple[PythonTestFieldSet, ...]
+
+
+class UnaffectedPythonTests(Collection[Address]):
+    """The tests which need not run because they did not execute any lines which have changed."""
+
+
+@rule(desc="Find Python tests unaffected by changes", level=LogLevel.DEBUG)
+async def find_unaffected_python_tests(
+    request: UnaffectedPythonTestsRequest,
+    coverage_subsystem: CoverageSubsystem,
+    changed: Changed,
+    build_root: BuildRoot,
+    distdir: DistDir,
+) -> UnaffectedPythonTests:
+    if not coverage_subsystem.test_impact_analysis or not changed.since:
+        return UnaffectedPythonTests()
+    maybe_git_worktree = await Get(MaybeGitWorktree, GitWorktreeRequest())
+    git_worktree = maybe_git_worktree.git_worktree
+    if git_worktree is None:
+        return UnaffectedPythonTests()
+
+    test_impact = load_test_impact(
+        os.path.join(build_root.path, coverage_subsystem.test_impact_file(distdir))
+    )
+    if not test_impact:
+        return UnaffectedPythonTests()
+
+    try:
+        changed_files = git_worktree.changed_files(
+            from_commit=changed.since, include_untracked=True, relative_to=build_root.path
+        )
+        if not changed_files or any(not path.endswith(".py") for path in changed_files):
+            return UnaffectedPythonTests()
+        merge_base = git_worktree.merge_base(changed.since)
+        covered_paths = {
+            path
+            for field_set in request.field_sets
+            for path in test_impact.get(field_set.address.spec, {})
+        }
+        base_blob_ids = git_worktree.blob_ids(
+            merge_base, sorted(covered_paths | set(changed_files)), build_root.path
+        )
+        changed_lines = git_worktree.changed_lines(merge_base, changed_files, build_root.path)
+    except GitBinaryException as e:
+        logger.warning(f"Not using test impact analysis, since Git failed: {e}")
+        return UnaffectedPythonTests()
+
+    unaffected = [
+        field_set.address
+        for field_set in request.field_sets
+        if field_set.address.spec in test_impact
+        and field_set.source.file_path not in changed_files
+        and not _is_affected(
+            test_impact[field_set.address.spec], changed_files, base_blob_ids, changed_lines
+        )
+    ]
+    if unaffected:
+        logger.info(
+            softwrap(
+                f"""
+                Skipping {pluralize(len(unaffected), 'test')} which did not execute any of the
+                lines changed since `{changed.since}`.
+                """
+            )
+        )
+    return UnaffectedPythonTests(unaffected)
+
+
 def rules():
     return [
         *collect_rules(),
@@ -3,14 +3,31 @@
 
 from __future__ import annotations
 
+import json
+from pathlib import Path
 from textwrap import dedent
 
+from pants.backend.python.goals import coverage_py
 from pants.backend.python.goals.coverage_py import (
+    _COMBINE_FAN_IN,
+    CoverageSetup,
     CoverageSubsystem,
+    MergedCoverageData,
+    PytestCoverageData,
+    PytestCoverageDataCollection,
+    _CoveredFile,
+    _dump_test_impact,
+    _git_blob_id,
+    _is_affected,
     create_or_update_coverage_config,
     get_branch_value_from_config,
+    load_test_impact,
 )
+from pants.backend.python.util_rules import pex
+from pants.backend.python.util_rules.pex import VenvPexProcess
+from pants.core.util_rules import config_files
 from pants.core.util_rules.config_files import ConfigFiles, ConfigFilesRequest
+from pants.engine.addresses import Address
 from pants.engine.fs import (
     EMPTY_DIGEST,
     EMPTY_SNAPSHOT,
@@ -19,8 +36,16 @@ from pants.engine.fs import (
     DigestContents,
     FileContent,
 )
+from pants.engine.process import Process, ProcessResult
+from pants.source import source_root
 from pants.testutil.option_util import create_subsystem
-from pants.testutil.rule_runner import MockGet, RuleRunner, run_rule_with_mocks
+from pants.testutil.rule_runner import (
+    PYTHON_BOOTSTRAP_ENV,
+    MockGet,
+    QueryRule,
+    RuleRunner,
+    run_rule_with_mocks,
+)
 
 
 def resolve_config(path: str | None, content: str | None) -> str:
@@ -339,3 +364,149 @@ def test_get_branch_value_from_config() -> None:
         )
         is True
     )
+
+
+def test_git_blob_id() -> None:
+    # As computed by `git hash-object`.
+    assert "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391" == _git_blob_id(b"")
+    assert "ce013625030ba8dba906f756967f9e9ca394464a" == _git_blob_id(b"hello\n")
+
+
+def test_test_impact_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "test_impact.json"
+    assert {} == load_test_impact(str(path))
+
+    test_impact = {
+        "src/app_test.py": {
+            "src/app.py": _CoveredFile("abc", (1, 2, 5)),
+            "src/app_test.py": _CoveredFile("def", (1, 3)),
+        },
+        "src/lib_test.py": {},
+    }
+    path.write_text(_dump_test_impact(test_impact))
+    assert test_impact == load_test_impact(str(path))
+
+    path.write_text('{"version": 2, "tests": []}')
+    assert {} == load_test_impact(str(path))
+    path.write_text("not json")
+    assert {} == load_test_impact(str(path))
+
+
+def test_is_affected() -> None:
+    covered_files = {
+        "app.py": _CoveredFile("base", (1, 2, 5, 10)),
+        "unused.py": _CoveredFile("unused", ()),
+    }
+    base_blob_ids = {"app.py": "base", "unused.py": "unused", "other.py": "other"}
+
+    def is_affected(*changed_lines: tuple[int, int], blob_id: str = "base") -> bool:
+        return _is_affected(
+            covered_files,
+            ["app.py", "unused.py"],
+            {**base_blob_ids, "app.py": blob_id},
+            {"app.py": changed_lines, "unused.py": ((1, 1),)},
+        )
+
+    # Changes to the lines which the test executed.
+    assert is_affected((5, 1)) is True
+    assert is_affected((3, 3)) is True
+    assert is_affected((3, 2), (9, 1)) is False
+    assert is_affected((6, 4)) is False
+    # Insertions next to the lines which the test executed.
+    assert is_affected((4, 0)) is True
+    assert is_affected((2, 0)) is True
+    assert is_affected((6, 0)) is False
+    # The coverage was recorded for different content.
+    assert is_affected((3, 1), blob_id="changed") is True
+    # Changed files without changed lines (e.g. binary files) are always affected.
+    assert _is_affected(covered_files, ["app.py"], base_blob_ids, {}) is True
+    # Changes to files which were measured, but which the test did not execute.
+    assert _is_affected(covered_files, ["unused.py"], base_blob_ids, {"unused.py": ((1, 1),)}) is (
+        False
+    )
+    # Changes to files which were not measured (e.g. new files).
+    assert _is_affected(covered_files, ["other.py"], base_blob_ids, {"other.py": ((1, 1),)}) is True
+    assert _is_affected(covered_files, ["new.py"], base_blob_ids, {}) is True
+    # Unchanged files whose recorded content differs from that of the base commit, e.g. because
+    # the coverage was recorded before a later commit.
+    stale_blob_ids = {**base_blob_ids, "unused.py": "later"}
+    assert _is_affected(covered_files, ["app.py"], stale_blob_ids, {"app.py": ((3, 1),)}) is True
+    assert _is_affected(covered_files, ["app.py"], base_blob_ids, {"app.py": ((3, 1),)}) is False
+
+
+def test_merge_coverage_data() -> None:
+    rule_runner = RuleRunner(
+        rules=[
+            *coverage_py.rules(),
+            *pex.rules(),
+            *config_files.rules(),
+            *source_root.rules(),
+            QueryRule(CoverageSetup, []),
+            QueryRule(MergedCoverageData, [PytestCoverageDataCollection]),
+            QueryRule(Process, [VenvPexProcess]),
+            QueryRule(ProcessResult, [Process]),
+        ]
+    )
+    rule_runner.set_options([], env_inherit=PYTHON_BOOTSTRAP_ENV)
+    coverage_setup = rule_runner.request(CoverageSetup, [])
+
+    def run_python(script: str, input_digest: Digest = EMPTY_DIGEST, **kwargs) -> ProcessResult:
+        process = rule_runner.request(
+            Process,
+            [
+                VenvPexProcess(
+                    coverage_setup.pex,
+                    argv=("-c", dedent(script)),
+                    input_digest=input_digest,
+                    extra_env={"PEX_INTERPRETER": "1"},
+                    description="Run Python with coverage.py",
+                    **kwargs,
+                )
+            ],
+        )
+        return rule_runner.request(ProcessResult, [process])
+
+    # Enough data files to require more than one level of merges.
+    count = 2 * _COMBINE_FAN_IN + 1
+    result = run_python(
+        f"""\
+        import os
+        from coverage import CoverageData
+
+        for i in range({count}):
+            os.mkdir(f"data{{i}}")
+            data = CoverageData(basename=f"data{{i}}/.coverage")
+            data.add_lines({{f"src/module{{i}}.py": [1, 2], "src/shared.py": [i + 1]}})
+            data.write()
+        """,
+        output_directories=tuple(f"data{i}" for i in range(count)),
+    )
+    data_files = {
+        file_content.path: file_content.content
+        for file_content in rule_runner.request(DigestContents, [result.output_digest])
+    }
+    data_collection = PytestCoverageDataCollection(
+        PytestCoverageData(
+            (Address("src", relative_file_path=f"module{i}_test.py"),),
+            rule_runner.make_snapshot({".coverage": data_files[f"data{i}/.coverage"]}).digest,
+        )
+        for i in range(count)
+    )
+
+    merged = rule_runner.request(MergedCoverageData, [data_collection])
+    assert len(merged.addresses) == count
+    result = run_python(
+        """\
+        import json, os
+        from coverage import CoverageData
+
+        data = CoverageData()
+        data.read()
+        print(json.dumps({os.path.relpath(f): sorted(data.lines(f)) for f in data.measured_files()}))
+        """,
+        input_digest=merged.coverage_data,
+    )
+    assert json.loads(result.stdout) == {
+        **{f"src/module{i}.py": [1, 2] for i in range(count)},
+        "src/shared.py": list(range(1, count + 1)),
+    }
@@ -0,0 +1,183 @@
+# Copyright 2023 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""A pytest plugin which runs the tests of each file in a process forked from the pytest process.
+
+See `[pytest].fork_per_file`. The pytest process collects all of the files of a batch, and so imports
+pytest, `conftest.py` files, the test modules and their (third-party) dependencies once. The tests of
+each file then run in a child process forked from it, so that the files of a batch can not observe
+each other's side effects (including session-scoped fixtures, which are set up once per file).
+
+Children do not report their results themselves: they send them to the pytest process, which
+reports them as if it had run the tests, so that the terminal summary, JUnit XML results and exit
+code cover the whole batch.
+"""
+
+#
+# Note: This file is loaded as a pytest plugin (via `-p`) in the execution sandbox, and must only
+# depend on pytest and the standard library.
+#
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import traceback
+
+import pytest  # pants: no-infer-dep
+from _pytest.reports import TestReport  # pants: no-infer-dep
+
+
+def _file_of(item) -> str:
+    return item.nodeid.split("::", 1)[0]
+
+
+def _save_forked_coverage() -> None:
+    """Save the coverage data collected by this child, for pytest-cov to combine at the end of the
+    session.
+
+    The child never reaches the end of the session (where pytest-cov would usually save the data),
+    so the data is saved alongside the parallel data files of the pytest process.
+    """
+    try:
+        import coverage  # pants: no-infer-dep
+    except ImportError:
+        return
+    cov = coverage.Coverage.current()
+    if cov is None:
+        return
+    cov.stop()
+    data = cov.get_data()
+    forked_data = coverage.CoverageData(
+        basename=data.base_filename(), suffix=f"pants-fork.{os.getpid()}"
+    )
+    forked_data.update(data)
+    forked_data.write()
+
+
+class _ReportForwarder:
+    """Sends the reports of a child to the pytest process, one JSON object per line."""
+
+    def __init__(self, config, out) -> None:
+        self._config = config
+        self._out = out
+
+    def _send(self, event: str, **kwargs) -> None:
+        self._out.write(json.dumps({"event": event, **kwargs}) + "\n")
+        self._out.flush()
+
+    def pytest_runtest_logstart(self, nodeid, location) -> None:
+        self._send("logstart", nodeid=nodeid, location=location)
+
+    def pytest_runtest_logreport(self, report) -> None:
+        self._send(
+            "logreport",
+            report=self._config.hook.pytest_report_to_serializable(
+                config=self._config, report=report
+            ),
+        )
+
+    def pytest_runtest_logfinish(self, nodeid, location) -> None:
+        self._send("logfinish", nodeid=nodeid, location=location)
+
+
+def _run_child(session, items, out) -> None:
+    config = session.config
+    # The pytest process reports the results of the child.
+    config.pluginmanager.set_blocked("terminalreporter")
+    config.pluginmanager.register(_ReportForwarder(config, out), "pants_report_forwarder")
+    for i, item in enumerate(items):
+        nextitem = items[i + 1] if i + 1 < len(items) else None
+        item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+        if session.shouldfail or session.shouldstop:
+            break
+    _save_forked_coverage()
+
+
+def _run_forked(session, items) -> None:
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        status = 1
+        try:
+            with os.fdopen(write_fd, "w") as out:
+                _run_child(session, items, out)
+            status = 0
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    os.close(write_fd)
+    config = session.config
+    ihook = items[0].ihook
+    running = None
+    with os.fdopen(read_fd) as reports:
+        for line in reports:
+            message = json.loads(line)
+            event = message["event"]
+            if event == "logstart":
+                running = (message["nodeid"], tuple(message["location"]))
+                ihook.pytest_runtest_logstart(nodeid=running[0], location=running[1])
+            elif event == "logreport":
+                report = config.hook.pytest_report_from_serializable(
+                    config=config, data=message["report"]
+                )
+                ihook.pytest_runtest_logreport(report=report)
+            elif event == "logfinish":
+                ihook.pytest_runtest_logfinish(
+                    nodeid=message["nodeid"], location=tuple(message["location"])
+                )
+                running = None
+
+    _, status = os.waitpid(pid, 0)
+    if status == 0:
+        return
+    if os.WIFSIGNALED(status):
+        cause = f"was killed by signal {os.WTERMSIG(status)}"
+    else:
+        cause = f"exited with code {os.WEXITSTATUS(status)}"
+    crash = f"The process running the tests of {_file_of(items[0])} {cause}."
+    if running is None:
+        sys.stderr.write(f"{crash}\n")
+        session.testsfailed += 1
+        return
+    nodeid, location = running
+    ihook.pytest_runtest_logreport(
+        report=TestReport(
+            nodeid=nodeid,
+            location=location,
+            keywords={},
+            outcome="failed",
+            longrepr=crash,
+            when="call",
+        )
+    )
+    ihook.pytest_runtest_logfinish(nodeid=nodeid, location=location)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    if session.testsfailed and not session.config.option.continue_on_collection_errors:
+        # Let pytest report the collection errors.
+        return None
+    if session.config.option.collectonly or not hasattr(os, "fork"):
+        return None
+
+    items_by_file: dict[str, list] = {}
+    for item in session.items:
+        items_by_file.setdefault(_file_of(item), []).append(item)
+    if len(items_by_file) < 2:
+        return None
+
+    for items in items_by_file.values():
+        _run_forked(session, items)
+        if session.shouldfail:
+            raise session.Failed(session.shouldfail)
+        if session.shouldstop:
+            raise session.Interrupted(session.shouldstop)
+    return True
@@ -14,6 +14,8 @@ from pants.backend.python.goals.coverage_py import (
     CoverageConfig,
     CoverageSubsystem,
     PytestCoverageData,
+    UnaffectedPythonTests,
+    UnaffectedPythonTestsRequest,
 )
 from pants.backend.python.subsystems import pytest
 from pants.backend.python.subsystems.debugpy import DebugPy
@@ -53,6 +55,7 @@ from pants.engine.fs import (
     DigestContents,
     DigestSubset,
     Directory,
+    FileContent,
     MergeDigests,
     PathGlobs,
     RemovePrefix,
@@ -76,6 +79,7 @@ from pants.engine.unions import UnionMembership, UnionRule, union
 from pants.option.global_options import GlobalOptions
 from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
+from pants.util.resources import read_resource
 
 logger = logging.getLogger()
 
@@ -154,6 +158,12 @@ async def run_all_setup_plugins(
 # ./pants test <target> -- --html=extra-output/report.html
 _EXTRA_OUTPUT_DIR = "extra-output"
 
+# See `[pytest].fork_per_file`.
+_FORK_PLUGIN_PACKAGE = "pants.backend.python.goals"
+_FORK_PLUGIN_SOURCE = "pytest_fork_plugin.py"
+_FORK_PLUGIN_DIR = "__pants_pytest_plugins__"
+_FORK_PLUGIN_MODULE = "pants_fork_per_file"
+
 
 @dataclass(frozen=True)
 class TestMetadata:
@@ -378,6 +388,30 @@ async def setup_pytest_for_target(
             concurrency = _count_pytest_tests(contents)
         xdist_concurrency = concurrency
 
+    fork_plugin_args: tuple[str, ...] = ()
+    if (
+        pytest.fork_per_file
+        and len(request.field_sets) > 1
+        and not request.is_debug
+        and not xdist_concurrency
+    ):
+        fork_plugin_content = read_resource(_FORK_PLUGIN_PACKAGE, _FORK_PLUGIN_SOURCE)
+        if not fork_plugin_content:
+            raise ValueError(
+                f"Unable to find source to {_FORK_PLUGIN_SOURCE!r} in {_FORK_PLUGIN_PACKAGE}."
+            )
+        fork_plugin_digest = await Get(
+            Digest,
+            CreateDigest(
+                [FileContent(f"{_FORK_PLUGIN_DIR}/{_FORK_PLUGIN_MODULE}.py", fork_plugin_content)]
+            ),
+        )
+        input_digest = await Get(Digest, MergeDigests((input_digest, fork_plugin_digest)))
+        extra_env["PEX_EXTRA_SYS_PATH"] = ":".join(
+            path for path in (extra_env.get("PEX_EXTRA_SYS_PATH"), _FORK_PLUGIN_DIR) if path
+        )
+        fork_plugin_args = ("-p", _FORK_PLUGIN_MODULE)
+
     timeout_seconds: int | None = None
     for field_set in request.field_sets:
         timeout = field_set.timeout.calculate_from_global_options(test_subsystem, pytest)
@@ -399,6 +433,7 @@ async def setup_pytest_for_target(
                 *pytest.args,
                 *(("-c", pytest.config) if pytest.config else ()),
                 *(("-n", "{pants_concurrency}") if xdist_concurrency else ()),
+                *fork_plugin_args,
                 # N.B.: Now that we're using command-line options instead of the PYTEST_ADDOPTS
                 # environment variable, it's critical that `pytest_args` comes after `pytest.args`.
                 *pytest_args,
@@ -435,7 +470,12 @@ async def partition_python_tests(
     partitions = []
     compatible_tests = defaultdict(list)
 
+    unaffected_tests = await Get(
+        UnaffectedPythonTests, UnaffectedPythonTestsRequest(request.field_sets)
+    )
     for field_set in request.field_sets:
+        if field_set.address in unaffected_tests:
+            continue
         metadata = TestMetadata(
             interpreter_constraints=InterpreterConstraints.create_from_compatibility_fields(
                 [field_set.interpreter_constraints], python_setup
@@ -486,7 +526,9 @@ async def run_python_tests(
         )
         if coverage_snapshot.files == (".coverage",):
             coverage_data = PytestCoverageData(
-                tuple(field_set.address for field_set in batch.elements), coverage_snapshot.digest
+                tuple(field_set.address for field_set in batch.elements),
+                coverage_snapshot.digest,
+                passed=result.exit_code == 0,
             )
         else:
             logger.warning(f"Failed to generate coverage data for {warning_description()}.")
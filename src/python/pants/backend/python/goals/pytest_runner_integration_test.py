@@ -14,7 +14,10 @@ import pytest
 from pants.backend.python import target_types_rules
 from pants.backend.python.dependency_inference import rules as dependency_inference_rules
 from pants.backend.python.goals import package_pex_binary, pytest_runner, setup_py
-from pants.backend.python.goals.coverage_py import create_or_update_coverage_config
+from pants.backend.python.goals.coverage_py import (
+    create_or_update_coverage_config,
+    find_unaffected_python_tests,
+)
 from pants.backend.python.goals.pytest_runner import (
     PytestPluginSetup,
     PytestPluginSetupRequest,
@@ -55,6 +58,7 @@ from pants.testutil.python_interpreter_selection import (
     skip_unless_python27_and_python3_present,
 )
 from pants.testutil.rule_runner import QueryRule, RuleRunner, mock_console
+from pants.vcs import git
 
 
 @pytest.fixture
@@ -63,6 +67,8 @@ def rule_runner() -> RuleRunner:
         rules=[
             build_runtime_package_dependencies,
             create_or_update_coverage_config,
+            find_unaffected_python_tests,
+            *git.rules(),
             *pytest_runner.rules(),
             *pex_from_targets.rules(),
             *dependency_inference_rules.rules(),
@@ -971,3 +977,46 @@ def test_batched_failing(rule_runner: RuleRunner) -> None:
     assert result.exit_code == 1
     assert f"{PACKAGE}/test_1.py ." in result.stdout
     assert f"{PACKAGE}/test_2.py F" in result.stdout
+
+
+def test_batched_fork_per_file(rule_runner: RuleRunner) -> None:
+    # Each file observes the state of the module as it was after collection, regardless of what
+    # the other file of the batch did to it.
+    isolated_test = dedent(
+        """\
+        from pants_test import state
+
+        def test():
+            assert state.VALUES == []
+            state.VALUES.append(1)
+        """
+    )
+    rule_runner.write_files(
+        {
+            f"{PACKAGE}/__init__.py": "",
+            f"{PACKAGE}/state.py": "VALUES = []\n",
+            f"{PACKAGE}/test_1.py": isolated_test,
+            f"{PACKAGE}/test_2.py": isolated_test,
+            f"{PACKAGE}/BUILD": dedent(
+                """\
+                python_sources(name="lib")
+                python_tests(batch_compatibility_tag='default')
+                """
+            ),
+        }
+    )
+    targets = tuple(
+        rule_runner.get_target(Address(PACKAGE, relative_file_path=path))
+        for path in ("test_1.py", "test_2.py")
+    )
+    _configure_pytest_runner(rule_runner, extra_args=["--pytest-fork-per-file"])
+    result = rule_runner.request(TestResult, [_get_pytest_batch(rule_runner, targets)])
+    assert result.exit_code == 0
+    assert result.xml_results is not None
+    assert f"{PACKAGE}/test_1.py ." in result.stdout
+    assert f"{PACKAGE}/test_2.py ." in result.stdout
+
+    _configure_pytest_runner(rule_runner)
+    result = rule_runner.request(TestResult, [_get_pytest_batch(rule_runner, targets)])
+    assert result.exit_code == 1
+    assert f"{PACKAGE}/test_2.py F" in result.stdout
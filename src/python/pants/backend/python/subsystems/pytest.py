@@ -147,6 +147,26 @@ class PyTest(PythonToolBase):
             """
         ),
     )
+    fork_per_file = BoolOption(
+        default=False,
+        advanced=True,
+        help=softwrap(
+            """
+            If true, Pants will run the tests of each file of a batch (see the
+            `batch_compatibility_tag` field of `python_test`) in a separate process, forked from a
+            Pytest process which has already imported Pytest, `conftest.py` files and the
+            dependencies of the batch.
+
+            This isolates the files of a batch from one another (including from `session`-scoped
+            fixtures, which are set up once per file), while still only paying the cost of
+            starting Pytest and importing shared dependencies once per batch. This allows batching
+            test files which are not safe to run in the same process.
+
+            Results are still reported (and cached) per batch. Has no effect when `pytest-xdist`
+            is used, or on platforms which do not support `fork`.
+            """
+        ),
+    )
 
     export = ExportToolOption()
 
@@ -361,6 +361,31 @@ class PythonSetup(Subsystem):
         ),
         advanced=True,
     )
+    subset_lockfiles_from_repository_pex = BoolOption(
+        default=False,
+        help=softwrap(
+            """
+            If enabled, when running binaries, tests, and repls against a subset of a Pex
+            lockfile, Pants will first install the entire lockfile into a single "repository" PEX,
+            and then build each subset from the distributions already installed in it.
+
+            By default, each distinct subset of a lockfile is built by Pex from the lockfile
+            itself, which requires Pex to resolve the subset's requirements against the lockfile
+            and to install them. When many processes use different subsets of the same lockfile
+            (for example, the tests of a large repository), enabling this option means that the
+            lockfile is only resolved and installed once, and that each subset is merely copied
+            out of the repository PEX.
+
+            Installing the entire lockfile may take longer than installing any single subset of
+            it, and will fail if any requirement of the lockfile cannot be installed for the
+            interpreter that is used.
+
+            Like `[python].run_against_entire_lockfile`, this option does not affect packaging
+            deployable artifacts, such as PEX files, wheels and cloud functions.
+            """
+        ),
+        advanced=True,
+    )
 
     __constraints_deprecation_msg = softwrap(
         f"""
@@ -24,7 +24,7 @@ from pants.backend.python.target_types import (
     PexLayout,
 )
 from pants.backend.python.target_types import PexPlatformsField as PythonPlatformsField
-from pants.backend.python.util_rules import pex_cli, pex_requirements
+from pants.backend.python.util_rules import pex_cli, pex_requirements, venv_cache
 from pants.backend.python.util_rules.interpreter_constraints import InterpreterConstraints
 from pants.backend.python.util_rules.pex_cli import PexCliProcess, PexPEX
 from pants.backend.python.util_rules.pex_environment import (
@@ -680,17 +680,29 @@ class VenvScriptWriter:
     complete_pex_env: CompletePexEnvironment
     pex: Pex
     venv_dir: PurePath
+    # Whether to mark the venv as used each time it is run, for `[pex].venv_cache_max_size`.
+    track_usage: bool = False
 
     @classmethod
     def create(
-        cls, complete_pex_env: CompletePexEnvironment, pex: Pex, venv_rel_dir: PurePath
+        cls,
+        complete_pex_env: CompletePexEnvironment,
+        pex: Pex,
+        venv_rel_dir: PurePath,
+        *,
+        track_usage: bool = False,
     ) -> VenvScriptWriter:
         # N.B.: We don't know the working directory that will be used in any given
         # invocation of the venv scripts; so we deal with working_directory once in an
         # `adjust_relative_paths` function inside the script to save rule authors from having to do
         # CWD offset math in every rule for all the relative paths their process depends on.
         venv_dir = complete_pex_env.pex_root / venv_rel_dir
-        return cls(complete_pex_env=complete_pex_env, pex=pex, venv_dir=venv_dir)
+        return cls(
+            complete_pex_env=complete_pex_env,
+            pex=pex,
+            venv_dir=venv_dir,
+            track_usage=track_usage,
+        )
 
     def _create_venv_script(
         self,
@@ -712,6 +724,9 @@ class VenvScriptWriter:
             f"$(adjust_relative_paths {shlex.quote(arg)})"
             for arg in self.complete_pex_env.create_argv(self.pex.name, python=self.pex.python)
         )
+        # Mark the venv as used, since the venv cache evicts the venvs which have gone unused the
+        # longest: see `venv_cache.py`.
+        mark_used = 'touch -c "${venv_dir}" 2>/dev/null || true' if self.track_usage else ""
 
         script = dedent(
             f"""\
@@ -766,7 +781,7 @@ class VenvScriptWriter:
             if [ ! -e "${{venv_dir}}" ]; then
                 PEX_INTERPRETER=1 ${{execute_pex_args}} -c ''
             fi
-
+            {mark_used}
             exec "${{target_venv_executable}}" "$@"
             """
         )
@@ -900,6 +915,7 @@ async def create_venv_pex(
         complete_pex_env=request.complete_pex_env,
         pex=venv_pex_result.create_pex(),
         venv_rel_dir=venv_rel_dir,
+        track_usage=pex_environment.venv_cache_max_size is not None,
     )
     pex = venv_script_writer.exe(bash)
     python = venv_script_writer.python(bash)
@@ -1183,4 +1199,9 @@ async def determine_pex_resolve_info(pex_pex: PexPEX, pex: Pex) -> PexResolveInf
 
 
 def rules():
-    return [*collect_rules(), *pex_cli.rules(), *pex_requirements.rules()]
+    return [
+        *collect_rules(),
+        *pex_cli.rules(),
+        *pex_requirements.rules(),
+        *venv_cache.rules(),
+    ]
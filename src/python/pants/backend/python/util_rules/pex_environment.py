@@ -15,7 +15,7 @@ from pants.core.util_rules.system_binaries import BinaryPath, PythonBinary
 from pants.engine.engine_aware import EngineAwareReturnType
 from pants.engine.rules import collect_rules, rule
 from pants.option.global_options import NamedCachesDirOption
-from pants.option.option_types import BoolOption, IntOption, StrListOption
+from pants.option.option_types import BoolOption, IntOption, MemorySizeOption, StrListOption
 from pants.option.subsystem import Subsystem
 from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
@@ -80,6 +80,28 @@ class PexSubsystem(Subsystem):
         ),
         advanced=True,
     )
+    venv_cache_max_size = MemorySizeOption(
+        default=None,
+        help=softwrap(
+            """
+            The maximum total size of the venvs that Pants runs PEXes in, which are kept in the
+            `pex_root` directory of `--named-caches-dir`.
+
+            When set, at the end of each Pants run, the venvs which have gone unused the longest are
+            evicted from the cache if it exceeds this size. A venv which is used again after having
+            been evicted is re-created on demand. Venvs which were used within the last hour, or (on
+            Linux) which a running process was started from, are never evicted, so the cache may
+            temporarily exceed this size.
+
+            On other platforms, a process which runs for longer than an hour (e.g. a long test, or
+            a server started by `run`) may have its venv evicted while it is running.
+
+            You can suffix with `GiB`, `MiB`, `KiB`, or `B` to indicate the unit, e.g.
+            `2GiB` or `2.12GiB`. A bare number will be in bytes.
+            """
+        ),
+        advanced=True,
+    )
 
     @property
     def verbosity(self) -> int:
@@ -114,6 +136,7 @@ class PexEnvironment(EngineAwareReturnType):
     named_caches_dir: PurePath
     bootstrap_python: PythonExecutable | None = None
     venv_use_symlinks: bool = False
+    venv_cache_max_size: int | None = None
 
     _PEX_ROOT_DIRNAME = "pex_root"
 
@@ -176,6 +199,7 @@ async def find_pex_python(
         named_caches_dir=named_caches_dir.val,
         bootstrap_python=PythonExecutable.from_python_binary(python_binary),
         venv_use_symlinks=pex_subsystem.venv_use_symlinks,
+        venv_cache_max_size=pex_subsystem.venv_cache_max_size,
     )
 
 
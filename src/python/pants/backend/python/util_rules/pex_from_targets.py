@@ -391,6 +391,7 @@ async def _determine_requirements_for_pex_from_targets(
         return PexRequirements()
 
     requirements = await Get(PexRequirements, _PexRequirementsRequest(request.addresses))
+    loaded_lockfile: LoadedLockfile | None = None
     pex_native_subsetting_supported = False
     if python_setup.enable_resolves:
         # TODO: Once `requirement_constraints` is removed in favor of `enable_resolves`,
@@ -418,16 +419,14 @@ async def _determine_requirements_for_pex_from_targets(
         # A non-PEX-native lockfile was used, and so we cannot directly subset it from a
         # LoadedLockfile.
         or not pex_native_subsetting_supported
+        # Subsets of the PEX-native lockfile should be copied out of a repository PEX, rather than
+        # each being resolved from the lockfile by Pex.
+        or (python_setup.subset_lockfiles_from_repository_pex and request.internal_only)
     )
 
     if not should_request_repository_pex:
         if not pex_native_subsetting_supported:
             return requirements
-
-        chosen_resolve = await Get(
-            ChosenPythonResolve, ChosenPythonResolveRequest(request.addresses)
-        )
-        loaded_lockfile = await Get(LoadedLockfile, LoadedLockfileRequest(chosen_resolve.lockfile))
         return dataclasses.replace(requirements, from_superset=loaded_lockfile)
 
     # Else, request the repository PEX and possibly subset it.
@@ -455,6 +454,15 @@ async def _determine_requirements_for_pex_from_targets(
             )
         return repository_pex_request.maybe_pex_request
 
+    if (
+        python_setup.subset_lockfiles_from_repository_pex
+        and pex_native_subsetting_supported
+        and repository_pex_request.maybe_pex_request is None
+    ):
+        # The repository PEX was only requested in order to subset it, but could not be built
+        # (e.g. because platforms were requested): subset the lockfile directly instead.
+        return dataclasses.replace(requirements, from_superset=loaded_lockfile)
+
     repository_pex = await Get(OptionalPex, OptionalPexRequest, repository_pex_request)
     return dataclasses.replace(requirements, from_superset=repository_pex.maybe_pex)
 
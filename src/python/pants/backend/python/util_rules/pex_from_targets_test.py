@@ -180,6 +180,7 @@ def test_determine_requirements_for_pex_from_targets() -> None:
         _platforms: bool,
         include_requirements: bool = True,
         run_against_entire_lockfile: bool = False,
+        subset_lockfiles_from_repository_pex: bool = False,
         expected: PexRequirements | PexRequest,
     ) -> None:
         lockfile_used = _mode in (RequirementMode.PEX_LOCKFILE, RequirementMode.NON_PEX_LOCKFILE)
@@ -192,6 +193,7 @@ def test_determine_requirements_for_pex_from_targets() -> None:
             PythonSetup,
             enable_resolves=lockfile_used,
             run_against_entire_lockfile=run_against_entire_lockfile,
+            subset_lockfiles_from_repository_pex=subset_lockfiles_from_repository_pex,
             resolve_all_constraints=_mode != RequirementMode.CONSTRAINTS_NO_RESOLVE_ALL,
             requirement_constraints="foo.constraints" if requirement_constraints_used else None,
         )
@@ -304,6 +306,25 @@ def test_determine_requirements_for_pex_from_targets() -> None:
         expected=repository_pex_request__lockfile,
     )
 
+    # Pex lockfiles with subset_lockfiles_from_repository_pex: return PexRequirements with
+    #   from_superset as the lockfile repository Pex for internal_only Pexes, unless platforms are
+    #   used.
+    assert_setup(
+        RequirementMode.PEX_LOCKFILE,
+        _internal_only=True,
+        subset_lockfiles_from_repository_pex=True,
+        _platforms=False,
+        expected=PexRequirements(req_strings, from_superset=repository_pex__lockfile),
+    )
+    for internal_only, platforms in ((True, True), (False, False), (False, True)):
+        assert_setup(
+            RequirementMode.PEX_LOCKFILE,
+            _internal_only=internal_only,
+            subset_lockfiles_from_repository_pex=True,
+            _platforms=platforms,
+            expected=PexRequirements(req_strings, from_superset=loaded_lockfile__pex),
+        )
+
     # Non-Pex lockfiles: except for when run_against_entire_lockfile is applicable, return
     # PexRequirements with from_superset as the lockfile repository Pex and constraint_strings as
     # the lockfile's requirements.
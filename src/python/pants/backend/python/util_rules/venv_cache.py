@@ -0,0 +1,236 @@
+# Copyright 2023 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+"""Eviction of the least recently used venvs from the `PEX_ROOT` named cache.
+
+See `[pex].venv_cache_max_size`. Pex seeds a venv in the `PEX_ROOT` for each distinct PEX that is
+run in `--venv` mode, keyed by the hash of the PEX's code and distributions, so PEXes with the same
+content share a venv. Pex never removes venvs though, so the cache grows without bound.
+
+The shim scripts of a `VenvPex` re-seed a venv that has been removed, so venvs may be evicted at any
+time, except while they are in use. When a maximum size is configured, the shims mark a venv as used
+(by touching it) each time they run it, and at the end of each Pants run the venvs which have gone
+unused the longest are removed until the cache fits. Venvs which running processes were started
+from are skipped where this can be detected (i.e. on Linux).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+
+from fasteners import InterProcessLock
+
+from pants.backend.python.util_rules.pex_environment import PexSubsystem
+from pants.engine.rules import collect_rules, rule
+from pants.engine.streaming_workunit_handler import (
+    StreamingWorkunitContext,
+    WorkunitsCallback,
+    WorkunitsCallbackFactory,
+    WorkunitsCallbackFactoryRequest,
+)
+from pants.engine.unions import UnionRule
+from pants.option.global_options import NamedCachesDirOption
+from pants.util.strutil import pluralize
+
+logger = logging.getLogger(__name__)
+
+# Venvs used more recently than this are never evicted, since they might still be running, and
+# running processes cannot be detected on all platforms (see `_venvs_in_use`).
+_MIN_IDLE_SECONDS = 60 * 60
+# Measuring the size of the cache requires walking it, so do so at most this often.
+_PRUNE_INTERVAL_SECONDS = 10 * 60
+_PEX_ROOT_DIRNAME = "pex_root"
+# Pex places short symlinks to venvs in this directory, for use in shebangs.
+_SHORT_LINKS_DIRNAME = "s"
+# Held while pruning, so that concurrent Pants processes do not prune the same venvs. Its
+# modification time records when the venvs were last pruned.
+_PRUNE_LOCK_FILENAME = ".prune.lck"
+
+
+def _tree_size(path: str) -> int:
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for name in (*dirs, *files):
+            try:
+                size += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return size
+
+
+def _last_used(path: str) -> float:
+    """The most recent modification time of the directory or of any of its immediate children.
+
+    A venv is seeded in a subdirectory of `path`, which the shim scripts touch when they run it.
+    """
+    last_used = os.lstat(path).st_mtime
+    for entry in os.scandir(path):
+        try:
+            last_used = max(last_used, entry.stat(follow_symlinks=False).st_mtime)
+        except OSError:
+            pass
+    return last_used
+
+
+def _venvs_in_use(venvs_dir: str) -> set[str]:
+    """The names of the venvs below `venvs_dir` which running processes were started from.
+
+    A venv is run via its absolute path, or via a path relative to the working directory of the
+    process, so any argument of a process which resolves to a path in a venv marks it as in use.
+    This requires `/proc`, so elsewhere no venvs are detected as in use.
+    """
+    real_venvs_dir = os.path.realpath(venvs_dir) + os.sep
+    in_use: set[str] = set()
+    try:
+        pids = [entry.name for entry in os.scandir("/proc") if entry.name.isdigit()]
+    except OSError:
+        return in_use
+    for pid in pids:
+        try:
+            cwd = os.readlink(f"/proc/{pid}/cwd")
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                args = f.read().split(b"\0")
+        except OSError:
+            # The process exited, or is owned by another user.
+            continue
+        for arg in args:
+            if os.sep.encode() not in arg:
+                continue
+            path = os.path.realpath(os.path.join(cwd, os.fsdecode(arg)))
+            if path.startswith(real_venvs_dir):
+                in_use.add(path[len(real_venvs_dir) :].split(os.sep, 1)[0])
+    return in_use
+
+
+def _remove_dangling_short_links(venvs_dir: str) -> None:
+    short_links_dir = os.path.join(venvs_dir, _SHORT_LINKS_DIRNAME)
+    if not os.path.isdir(short_links_dir):
+        return
+    for entry in os.scandir(short_links_dir):
+        link = os.path.join(entry.path, "venv")
+        if os.path.islink(link) and not os.path.exists(link):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def prune_venvs(venvs_dir: str, max_size: int, *, now: float | None = None) -> tuple[str, ...]:
+    """Remove the least recently used venvs below `venvs_dir` until their total size is at most
+    `max_size` bytes, and return the paths of the removed venvs."""
+    now = time.time() if now is None else now
+    entries = []
+    for entry in os.scandir(venvs_dir):
+        if entry.name == _SHORT_LINKS_DIRNAME or not entry.is_dir(follow_symlinks=False):
+            continue
+        try:
+            entries.append((_last_used(entry.path), _tree_size(entry.path), entry.path))
+        except OSError:
+            # The venv was concurrently removed.
+            continue
+
+    total_size = sum(size for _, size, _ in entries)
+    removed = []
+    in_use: set[str] | None = None
+    for last_used, size, path in sorted(entries):
+        if total_size <= max_size or now - last_used < _MIN_IDLE_SECONDS:
+            break
+        # A venv may run for longer than the idle threshold (e.g. a long test, or a server started
+        # by `run`), so the running processes are also checked.
+        if in_use is None:
+            in_use = _venvs_in_use(venvs_dir)
+        if os.path.basename(path) in in_use:
+            continue
+        # Rename the venv before deleting it, so that a shim never observes a partial venv: it will
+        # either run the complete venv, or re-seed it.
+        evicted_path = f"{path}.evicted.{uuid.uuid4().hex}"
+        try:
+            os.rename(path, evicted_path)
+        except OSError:
+            continue
+        shutil.rmtree(evicted_path, ignore_errors=True)
+        total_size -= size
+        removed.append(path)
+
+    if removed:
+        _remove_dangling_short_links(venvs_dir)
+    return tuple(removed)
+
+
+def maybe_prune_venvs(pex_root: str, max_size: int) -> None:
+    """Prune the venvs of the given `PEX_ROOT`, unless another process is doing so or did so
+    recently."""
+    venvs_dir = os.path.join(pex_root, "venvs")
+    if not os.path.isdir(venvs_dir):
+        return
+    lock_path = os.path.join(venvs_dir, _PRUNE_LOCK_FILENAME)
+    now = time.time()
+    try:
+        if now - os.stat(lock_path).st_mtime < _PRUNE_INTERVAL_SECONDS:
+            return
+    except FileNotFoundError:
+        pass
+
+    lock = InterProcessLock(lock_path)
+    if not lock.acquire(blocking=False):
+        return
+    try:
+        os.utime(lock_path)
+        removed = prune_venvs(venvs_dir, max_size, now=now)
+    except OSError as e:
+        logger.debug(f"Failed to prune the venvs in {venvs_dir}: {e}")
+        return
+    finally:
+        lock.release()
+    if removed:
+        logger.debug(f"Evicted {pluralize(len(removed), 'venv')} from {venvs_dir}.")
+
+
+class VenvCachePruner(WorkunitsCallback):
+    """Prunes the venv cache once the run has finished, rather than while rules are running."""
+
+    def __init__(self, pex_root: str, max_size: int) -> None:
+        self.pex_root = pex_root
+        self.max_size = max_size
+
+    @property
+    def can_finish_async(self) -> bool:
+        return True
+
+    def __call__(
+        self,
+        *,
+        started_workunits: tuple[dict, ...],
+        completed_workunits: tuple[dict, ...],
+        finished: bool,
+        context: StreamingWorkunitContext,
+    ) -> None:
+        if finished:
+            maybe_prune_venvs(self.pex_root, self.max_size)
+
+
+@dataclass(frozen=True)
+class VenvCachePrunerFactoryRequest:
+    """A unique request type that is installed to trigger construction of the WorkunitsCallback."""
+
+
+@rule
+def construct_venv_cache_pruner(
+    _: VenvCachePrunerFactoryRequest,
+    pex_subsystem: PexSubsystem,
+    named_caches_dir: NamedCachesDirOption,
+) -> WorkunitsCallbackFactory:
+    max_size = pex_subsystem.venv_cache_max_size
+    # See `PexEnvironment.in_workspace`.
+    pex_root = str(named_caches_dir.val / _PEX_ROOT_DIRNAME)
+    return WorkunitsCallbackFactory(
+        lambda: VenvCachePruner(pex_root, max_size) if max_size is not None else None
+    )
+
+
+def rules():
+    return [
+        UnionRule(WorkunitsCallbackFactoryRequest, VenvCachePrunerFactoryRequest),
+        *collect_rules(),
+    ]
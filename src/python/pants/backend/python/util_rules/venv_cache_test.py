@@ -0,0 +1,91 @@
+# Copyright 2023 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pants.backend.python.util_rules.venv_cache import maybe_prune_venvs, prune_venvs
+
+NOW = 1_000_000_000.0
+HOUR = 60 * 60
+MB = 1024 * 1024
+
+
+def create_venv(venvs_dir: Path, name: str, *, size: int, last_used: float) -> Path:
+    venv = venvs_dir / name / "contents"
+    (venv / "bin").mkdir(parents=True)
+    (venv / "bin" / "python").write_bytes(b"x" * size)
+    os.utime(venv / "bin" / "python", (last_used, last_used))
+    os.utime(venv / "bin", (last_used, last_used))
+    os.utime(venv, (last_used, last_used))
+    os.utime(venv.parent, (last_used, last_used))
+    short_link_dir = venvs_dir / "s" / name
+    short_link_dir.mkdir(parents=True)
+    (short_link_dir / "venv").symlink_to(venv)
+    return venv.parent
+
+
+def test_prune_least_recently_used(tmp_path: Path) -> None:
+    oldest = create_venv(tmp_path, "oldest", size=MB, last_used=NOW - 30 * HOUR)
+    old = create_venv(tmp_path, "old", size=MB, last_used=NOW - 20 * HOUR)
+    recent = create_venv(tmp_path, "recent", size=MB, last_used=NOW - 10 * HOUR)
+
+    assert prune_venvs(str(tmp_path), int(2.5 * MB), now=NOW) == (str(oldest),)
+    assert not oldest.exists()
+    assert old.exists()
+    assert recent.exists()
+    assert sorted(os.listdir(tmp_path / "s")) == ["old", "recent"]
+
+    assert prune_venvs(str(tmp_path), 10 * MB, now=NOW) == ()
+    assert prune_venvs(str(tmp_path), 0, now=NOW) == (str(old), str(recent))
+    assert sorted(os.listdir(tmp_path)) == ["s"]
+    assert os.listdir(tmp_path / "s") == []
+
+
+def test_prune_skips_venvs_in_use(tmp_path: Path) -> None:
+    idle = create_venv(tmp_path, "idle", size=MB, last_used=NOW - 2 * HOUR)
+    in_use = create_venv(tmp_path, "in_use", size=MB, last_used=NOW - 60)
+
+    assert prune_venvs(str(tmp_path), 0, now=NOW) == (str(idle),)
+    assert in_use.exists()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="Running processes are detected via /proc.")
+def test_prune_skips_venvs_of_running_processes(tmp_path: Path) -> None:
+    idle = create_venv(tmp_path, "idle", size=MB, last_used=NOW - 2 * HOUR)
+    running = create_venv(tmp_path, "running", size=MB, last_used=NOW - 2 * HOUR)
+
+    # The process refers to the venv via its short link, and relative to its working directory.
+    process = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(60)", "s/running/venv/bin/python"],
+        cwd=tmp_path,
+    )
+    try:
+        assert prune_venvs(str(tmp_path), 0, now=NOW) == (str(idle),)
+        assert running.exists()
+    finally:
+        process.kill()
+        process.wait()
+    assert prune_venvs(str(tmp_path), 0, now=NOW) == (str(running),)
+
+
+def test_maybe_prune_venvs(tmp_path: Path) -> None:
+    venvs_dir = tmp_path / "venvs"
+    old = create_venv(venvs_dir, "old", size=MB, last_used=NOW)
+    maybe_prune_venvs(str(tmp_path), 0)
+    assert not old.exists()
+
+    # Pruning is skipped if any process pruned the venvs recently.
+    old = create_venv(venvs_dir, "old2", size=MB, last_used=NOW)
+    maybe_prune_venvs(str(tmp_path), 0)
+    assert old.exists()
+
+    os.utime(venvs_dir / ".prune.lck", (NOW, NOW))
+    maybe_prune_venvs(str(tmp_path), 0)
+    assert not old.exists()
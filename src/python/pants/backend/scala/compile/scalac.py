@@ -141,6 +141,7 @@ async def compile_scala_source(
     local_scalac_plugins_relpath = "__localplugincp"
     usercp = "__cp"
 
+    # NB: `[jvm].compile_against_abi_jars` does not apply to scalac: see its help.
     user_classpath = Classpath(direct_dependency_classpath_entries, request.resolve)
 
     tool_classpath, sources_digest, jdk = await MultiGet(
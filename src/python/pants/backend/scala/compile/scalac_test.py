@@ -713,6 +713,76 @@ def test_compile_with_multiple_scalac_plugins(
     rule_runner.request(RenderedClasspath, [request])
 
 
+@maybe_skip_jdk_test
+def test_compile_with_macro_with_abi_jars_enabled(
+    rule_runner: RuleRunner, multiple_scala_plugins_jvm_lockfile: JVMLockfileFixture
+) -> None:
+    # Scala 2 macro implementations are executed from the compile classpath, so `scalac` must
+    # compile against full JAR files even when `[jvm].compile_against_abi_jars` is enabled.
+    rule_runner.write_files(
+        {
+            "3rdparty/jvm/BUILD": multiple_scala_plugins_jvm_lockfile.requirements_as_jvm_artifact_targets(),
+            "3rdparty/jvm/default.lock": multiple_scala_plugins_jvm_lockfile.serialized_lockfile,
+            "macros/BUILD": "scala_sources(dependencies=['3rdparty/jvm:org.scala-lang_scala-reflect'])",
+            "macros/Macros.scala": dedent(
+                """\
+                package org.pantsbuild.example.macros
+
+                import scala.language.experimental.macros
+                import scala.reflect.macros.blackbox
+
+                object Macros {
+                  def greeting: String = macro greetingImpl
+
+                  def greetingImpl(c: blackbox.Context): c.Expr[String] = {
+                    import c.universe._
+                    c.Expr[String](Literal(Constant("Hello from a macro!")))
+                  }
+                }
+                """
+            ),
+            "BUILD": "scala_sources(name='main', dependencies=['macros:macros'])",
+            "Main.scala": dedent(
+                """\
+                package org.pantsbuild.example
+
+                import org.pantsbuild.example.macros.Macros
+
+                object Main {
+                  def main(args: Array[String]): Unit = println(Macros.greeting)
+                }
+                """
+            ),
+        }
+    )
+    rule_runner.set_options(
+        args=[
+            "--scala-version-for-resolve={'jvm-default': '2.13.8'}",
+            "--jvm-compile-against-abi-jars",
+        ],
+        env_inherit=PYTHON_BOOTSTRAP_ENV,
+    )
+
+    classpath = rule_runner.request(
+        RenderedClasspath,
+        [
+            CompileScalaSourceRequest(
+                component=expect_single_expanded_coarsened_target(
+                    rule_runner, Address(spec_path="", target_name="main")
+                ),
+                resolve=make_resolve(rule_runner),
+            )
+        ],
+    )
+    assert classpath.content == {
+        ".Main.scala.main.scalac.jar": {
+            "META-INF/MANIFEST.MF",
+            "org/pantsbuild/example/Main$.class",
+            "org/pantsbuild/example/Main.class",
+        }
+    }
+
+
 @pytest.fixture
 def scala_2_12_lockfile_def() -> JVMLockfileFixtureDefinition:
     return JVMLockfileFixtureDefinition(
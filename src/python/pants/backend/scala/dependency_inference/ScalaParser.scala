@@ -486,19 +486,34 @@ object ScalaParser {
     analysisTraverser.toAnalysis
   }
 
+  // Analyzes each of the given sources in turn, and writes one JSON object per line, containing the
+  // path of a source and its analysis.
   def main(args: Array[String]): Unit = {
     val outputPath = java.nio.file.Paths.get(args(0))
-    val pathStr = args(1)
-    val scalaVersion = args(2)
-    val source3 = args(3).toBoolean
-    val analysis = analyze(pathStr, scalaVersion, source3)
+    val scalaVersion = args(1)
+    val source3 = args(2).toBoolean
+    val pathStrs = args.drop(3)
 
-    val json = analysis.asJson.noSpaces
-    java.nio.file.Files.write(
+    val writer = java.nio.file.Files.newBufferedWriter(
       outputPath,
-      json.getBytes(),
+      java.nio.charset.StandardCharsets.UTF_8,
       java.nio.file.StandardOpenOption.CREATE_NEW,
       java.nio.file.StandardOpenOption.WRITE
     )
+    try {
+      pathStrs.foreach { pathStr =>
+        val analysis =
+          try {
+            analyze(pathStr, scalaVersion, source3)
+          } catch {
+            case e: Exception => throw new Exception(s"Failed to analyze $pathStr", e)
+          }
+        val json = Json.obj("path" -> pathStr.asJson, "analysis" -> analysis.asJson)
+        writer.write(json.noSpaces)
+        writer.newLine()
+      }
+    } finally {
+      writer.close()
+    }
   }
 }
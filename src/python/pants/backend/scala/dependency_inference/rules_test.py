@@ -12,6 +12,11 @@ from pants.backend.scala.dependency_inference.rules import (
     ScalaSourceDependenciesInferenceFieldSet,
 )
 from pants.backend.scala.dependency_inference.rules import rules as dep_inference_rules
+from pants.backend.scala.dependency_inference.scala_parser import (
+    ScalaImport,
+    ScalaSourceDependencyAnalysis,
+)
+from pants.backend.scala.dependency_inference.symbol_mapper import ScalaTargetAnalysisRequest
 from pants.backend.scala.target_types import ScalaSourcesGeneratorTarget
 from pants.backend.scala.target_types import rules as scala_target_rules
 from pants.core.util_rules import config_files, source_files
@@ -46,6 +51,7 @@ def rule_runner() -> RuleRunner:
             QueryRule(Addresses, [DependenciesRequest]),
             QueryRule(ExplicitlyProvidedDependencies, [DependenciesRequest]),
             QueryRule(InferredDependencies, [InferScalaSourceDependencies]),
+            QueryRule(ScalaSourceDependencyAnalysis, [ScalaTargetAnalysisRequest]),
             QueryRule(Targets, [UnparsedAddressInputs]),
         ],
         target_types=[ScalaSourcesGeneratorTarget],
@@ -367,6 +373,49 @@ def test_multi_resolve_dependency_inference(rule_runner: RuleRunner) -> None:
     )
 
 
+@maybe_skip_jdk_test
+def test_analysis_per_scala_version(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "lib/BUILD": 'scala_sources(resolve=parametrize("scala-2.13", "scala-3"))',
+            "lib/Library.scala": dedent(
+                """\
+                package org.pantsbuild.lib
+
+                import org.pantsbuild.other.*
+
+                object Library
+                """
+            ),
+        }
+    )
+    rule_runner.set_options(
+        [
+            '--jvm-resolves={"scala-2.13":"3rdparty/jvm/scala-2.13.lock", "scala-3":"3rdparty/jvm/scala-3.lock"}',
+            '--scala-version-for-resolve={"scala-2.13":"2.13.8", "scala-3":"3.1.3"}',
+        ],
+        env_inherit=PYTHON_BOOTSTRAP_ENV,
+    )
+
+    def imports(resolve: str) -> tuple[ScalaImport, ...]:
+        analysis = rule_runner.request(
+            ScalaSourceDependencyAnalysis,
+            [
+                ScalaTargetAnalysisRequest(
+                    Address(
+                        "lib", relative_file_path="Library.scala", parameters={"resolve": resolve}
+                    )
+                )
+            ],
+        )
+        return analysis.imports_by_scope["org.pantsbuild.lib"]
+
+    # The file is parsed with the Scala version of each resolve: only Scala 3 parses `*` as a
+    # wildcard import.
+    assert imports("scala-3") == (ScalaImport("org.pantsbuild.other", None, True),)
+    assert imports("scala-2.13") == (ScalaImport("org.pantsbuild.other.*", None, False),)
+
+
 @maybe_skip_jdk_test
 def test_recursive_objects(rule_runner: RuleRunner) -> None:
     rule_runner.write_files(
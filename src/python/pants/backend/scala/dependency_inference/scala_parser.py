@@ -40,12 +40,14 @@ from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
 from pants.util.ordered_set import FrozenOrderedSet
 from pants.util.resources import read_resource
+from pants.util.strutil import pluralize
 
 logger = logging.getLogger(__name__)
 
 
 _PARSER_SCALA_VERSION = "2.13.8"
 _PARSER_SCALA_BINARY_VERSION = _PARSER_SCALA_VERSION.rpartition(".")[0]
+_SOURCE_PREFIX = "__source_to_analyze"
 
 
 class ScalaParserToolLockfileSentinel(GenerateJvmToolLockfileSentinel):
@@ -183,6 +185,13 @@ class ScalaSourceDependencyAnalysis:
         }
 
 
+@dataclass(frozen=True)
+class ScalaSourceDependencyAnalyses:
+    """The analyses of a batch of source files, keyed by file path."""
+
+    analyses: FrozenDict[str, ScalaSourceDependencyAnalysis]
+
+
 @dataclass(frozen=True)
 class FallibleScalaSourceDependencyAnalysisResult:
     process_result: FallibleProcessResult
@@ -194,6 +203,12 @@ class ScalaParserCompiledClassfiles(ClasspathEntry):
 
 @dataclass(frozen=True)
 class AnalyzeScalaSourceRequest:
+    """Analyze the given source files in a single JVM process.
+
+    Request a `ScalaSourceDependencyAnalysis` for a single file, or `ScalaSourceDependencyAnalyses`
+    for a batch of files which share a Scala version.
+    """
+
     source_files: SourceFiles
     scala_version: str
     source3: bool
@@ -231,16 +246,10 @@ async def analyze_scala_source_dependencies(
 ) -> FallibleScalaSourceDependencyAnalysisResult:
     source_files = request.source_files
 
-    if len(source_files.files) > 1:
-        raise ValueError(
-            f"analyze_scala_source_dependencies expects sources with exactly 1 source file, but found {len(source_files.snapshot.files)}."
-        )
-    elif len(source_files.files) == 0:
+    if len(source_files.files) == 0:
         raise ValueError(
-            "analyze_scala_source_dependencies expects sources with exactly 1 source file, but found none."
+            "analyze_scala_source_dependencies expects sources with at least 1 source file."
         )
-    source_prefix = "__source_to_analyze"
-    source_path = os.path.join(source_prefix, source_files.files[0])
     processorcp_relpath = "__processorcp"
     toolcp_relpath = "__toolcp"
 
@@ -253,7 +262,7 @@ async def analyze_scala_source_dependencies(
             ToolClasspath,
             ToolClasspathRequest(lockfile=parser_lockfile_request),
         ),
-        Get(Digest, AddPrefix(source_files.snapshot.digest, source_prefix)),
+        Get(Digest, AddPrefix(source_files.snapshot.digest, _SOURCE_PREFIX)),
     )
 
     extra_immutable_input_digests = {
@@ -261,7 +270,7 @@ async def analyze_scala_source_dependencies(
         processorcp_relpath: processor_classfiles.digest,
     }
 
-    analysis_output_path = "__source_analysis.json"
+    analysis_output_path = "__source_analysis.jsonl"
 
     process_result = await Get(
         FallibleProcessResult,
@@ -274,15 +283,19 @@ async def analyze_scala_source_dependencies(
             argv=[
                 "org.pantsbuild.backend.scala.dependency_inference.ScalaParser",
                 analysis_output_path,
-                source_path,
                 request.scala_version,
                 str(request.source3),
+                *(os.path.join(_SOURCE_PREFIX, path) for path in source_files.files),
             ],
             input_digest=prefixed_source_files_digest,
             extra_immutable_input_digests=extra_immutable_input_digests,
             output_files=(analysis_output_path,),
             extra_nailgun_keys=extra_immutable_input_digests,
-            description=f"Analyzing {source_files.files[0]}",
+            description=(
+                f"Analyzing {source_files.files[0]}"
+                if len(source_files.files) == 1
+                else f"Analyzing {pluralize(len(source_files.files), 'Scala source file')}"
+            ),
             level=LogLevel.DEBUG,
         ),
     )
@@ -291,18 +304,22 @@ async def analyze_scala_source_dependencies(
 
 
 @rule(level=LogLevel.DEBUG)
-async def resolve_fallible_result_to_analysis(
+async def resolve_fallible_result_to_analyses(
     fallible_result: FallibleScalaSourceDependencyAnalysisResult,
     keep_sandboxes: KeepSandboxes,
-) -> ScalaSourceDependencyAnalysis:
+) -> ScalaSourceDependencyAnalyses:
     # TODO(#12725): Just convert directly to a ProcessResult like this:
     # result = await Get(ProcessResult, FallibleProcessResult, fallible_result.process_result)
     if fallible_result.process_result.exit_code == 0:
         analysis_contents = await Get(
             DigestContents, Digest, fallible_result.process_result.output_digest
         )
-        analysis = json.loads(analysis_contents[0].content)
-        return ScalaSourceDependencyAnalysis.from_json_dict(analysis)
+        analyses: dict[str, ScalaSourceDependencyAnalysis] = {}
+        for line in analysis_contents[0].content.decode().splitlines():
+            entry = json.loads(line)
+            path = os.path.relpath(entry["path"], _SOURCE_PREFIX)
+            analyses[path] = ScalaSourceDependencyAnalysis.from_json_dict(entry["analysis"])
+        return ScalaSourceDependencyAnalyses(FrozenDict(analyses))
     raise ProcessExecutionFailure(
         fallible_result.process_result.exit_code,
         fallible_result.process_result.stdout,
@@ -312,6 +329,20 @@ async def resolve_fallible_result_to_analysis(
     )
 
 
+@rule(level=LogLevel.DEBUG)
+async def resolve_fallible_result_to_analysis(
+    fallible_result: FallibleScalaSourceDependencyAnalysisResult,
+) -> ScalaSourceDependencyAnalysis:
+    analyses = await Get(
+        ScalaSourceDependencyAnalyses, FallibleScalaSourceDependencyAnalysisResult, fallible_result
+    )
+    if len(analyses.analyses) != 1:
+        raise ValueError(
+            f"Expected the analysis of exactly 1 source file, but found {len(analyses.analyses)}."
+        )
+    return next(iter(analyses.analyses.values()))
+
+
 # TODO(13879): Consolidate compilation of wrapper binaries to common rules.
 @rule
 async def setup_scala_parser_classfiles(jdk: InternalJdk) -> ScalaParserCompiledClassfiles:
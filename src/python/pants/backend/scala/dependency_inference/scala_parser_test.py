@@ -10,12 +10,13 @@ from pants.backend.scala.dependency_inference.scala_parser import (
     AnalyzeScalaSourceRequest,
     ScalaImport,
     ScalaProvidedSymbol,
+    ScalaSourceDependencyAnalyses,
     ScalaSourceDependencyAnalysis,
 )
 from pants.backend.scala.target_types import ScalaSourceField, ScalaSourceTarget
 from pants.build_graph.address import Address
 from pants.core.util_rules import source_files
-from pants.core.util_rules.source_files import SourceFilesRequest
+from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
 from pants.engine.target import SourcesField
 from pants.jvm import jdk_rules
 from pants.jvm import util_rules as jvm_util_rules
@@ -37,6 +38,8 @@ def rule_runner() -> RuleRunner:
             *jvm_util_rules.rules(),
             QueryRule(AnalyzeScalaSourceRequest, (SourceFilesRequest,)),
             QueryRule(ScalaSourceDependencyAnalysis, (AnalyzeScalaSourceRequest,)),
+            QueryRule(ScalaSourceDependencyAnalyses, (AnalyzeScalaSourceRequest,)),
+            QueryRule(SourceFiles, (SourceFilesRequest,)),
         ],
         target_types=[ScalaSourceTarget],
     )
@@ -449,6 +452,48 @@ def test_package_object(rule_runner: RuleRunner) -> None:
     ]
 
 
+def test_parser_batch(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "BUILD": textwrap.dedent(
+                """\
+                scala_source(name="a", source="A.scala")
+                scala_source(name="b", source="B.scala")
+                """
+            ),
+            "A.scala": textwrap.dedent(
+                """
+                package foo
+                import bar.B
+                object A
+                """
+            ),
+            "B.scala": textwrap.dedent(
+                """
+                package bar
+                class B
+                """
+            ),
+        }
+    )
+
+    targets = [rule_runner.get_target(Address("", target_name=name)) for name in ("a", "b")]
+    source_files = rule_runner.request(
+        SourceFiles, [SourceFilesRequest([target[ScalaSourceField] for target in targets])]
+    )
+    analyses = rule_runner.request(
+        ScalaSourceDependencyAnalyses,
+        [AnalyzeScalaSourceRequest(source_files, "2.13.8", False)],
+    )
+
+    assert {"A.scala", "B.scala"} == set(analyses.analyses)
+    assert [symbol.name for symbol in analyses.analyses["A.scala"].provided_symbols] == ["foo.A"]
+    assert analyses.analyses["A.scala"].imports_by_scope == FrozenDict(
+        {"foo": (ScalaImport("bar.B", None, False),)}
+    )
+    assert [symbol.name for symbol in analyses.analyses["B.scala"].provided_symbols] == ["bar.B"]
+
+
 def test_source3(rule_runner: RuleRunner) -> None:
     rule_runner.set_options(
         args=[
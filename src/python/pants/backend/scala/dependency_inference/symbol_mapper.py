@@ -3,15 +3,22 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from dataclasses import dataclass
 from typing import Mapping
 
-from pants.backend.scala.dependency_inference.scala_parser import ScalaSourceDependencyAnalysis
+from pants.backend.scala.dependency_inference.scala_parser import (
+    AnalyzeScalaSourceRequest,
+    ScalaSourceDependencyAnalyses,
+    ScalaSourceDependencyAnalysis,
+)
+from pants.backend.scala.subsystems.scala import ScalaSubsystem
+from pants.backend.scala.subsystems.scalac import Scalac
 from pants.backend.scala.target_types import ScalaSourceField
-from pants.core.util_rules.source_files import SourceFilesRequest
+from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
 from pants.engine.addresses import Address
 from pants.engine.internals.selectors import Get, MultiGet
 from pants.engine.rules import collect_rules, rule
-from pants.engine.target import AllTargets, Targets
+from pants.engine.target import AllTargets, Target, Targets
 from pants.engine.unions import UnionRule
 from pants.jvm.dependency_inference import symbol_mapper
 from pants.jvm.dependency_inference.artifact_mapper import (
@@ -19,9 +26,11 @@ from pants.jvm.dependency_inference.artifact_mapper import (
     MutableTrieNode,
     SymbolNamespace,
 )
+from pants.jvm.dependency_inference.source_analysis import source_analysis_batches
 from pants.jvm.dependency_inference.symbol_mapper import FirstPartyMappingRequest, SymbolMap
 from pants.jvm.subsystems import JvmSubsystem
 from pants.jvm.target_types import JvmResolveField
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
 
 
@@ -40,6 +49,78 @@ def find_all_scala_targets(targets: AllTargets) -> AllScalaTargets:
     return AllScalaTargets(tgt for tgt in targets if tgt.has_field(ScalaSourceField))
 
 
+@dataclass(frozen=True)
+class AllScalaSourceDependencyAnalyses:
+    """The analysis of the source of each Scala target, keyed by address."""
+
+    analyses: FrozenDict[Address, ScalaSourceDependencyAnalysis]
+
+
+@rule(desc="Analyze all Scala sources", level=LogLevel.DEBUG)
+async def analyze_all_scala_sources(
+    scala_targets: AllScalaTargets,
+    scala_subsystem: ScalaSubsystem,
+    scalac: Scalac,
+    jvm: JvmSubsystem,
+) -> AllScalaSourceDependencyAnalyses:
+    # The sources of a batch must be parsed with the same Scala version.
+    targets_by_version: dict[str, list[Target]] = defaultdict(list)
+    for tgt in scala_targets:
+        resolve = tgt[JvmResolveField].normalized_value(jvm)
+        targets_by_version[scala_subsystem.version_for_resolve(resolve)].append(tgt)
+    source3 = "-Xsource:3" in scalac.args
+
+    batches = [
+        (scala_version, batch)
+        for scala_version, targets in sorted(targets_by_version.items())
+        for batch in source_analysis_batches(targets)
+    ]
+    all_source_files = await MultiGet(
+        Get(SourceFiles, SourceFilesRequest(tgt[ScalaSourceField] for tgt in batch))
+        for _, batch in batches
+    )
+    batches_to_analyze = [
+        (scala_version, batch, source_files)
+        for (scala_version, batch), source_files in zip(batches, all_source_files)
+        if source_files.files
+    ]
+    all_analyses = await MultiGet(
+        Get(
+            ScalaSourceDependencyAnalyses,
+            AnalyzeScalaSourceRequest(source_files, scala_version, source3),
+        )
+        for scala_version, _, source_files in batches_to_analyze
+    )
+    # NB: A file may be owned by targets whose resolves use different Scala versions, and so the
+    # analyses are looked up per batch, rather than by path alone.
+    return AllScalaSourceDependencyAnalyses(
+        FrozenDict(
+            (tgt.address, analyses.analyses[tgt[ScalaSourceField].file_path])
+            for (_, batch, _), analyses in zip(batches_to_analyze, all_analyses)
+            for tgt in batch
+            if tgt[ScalaSourceField].file_path in analyses.analyses
+        )
+    )
+
+
+@dataclass(frozen=True)
+class ScalaTargetAnalysisRequest:
+    """The analysis of the source of a Scala target, from `AllScalaSourceDependencyAnalyses`.
+
+    Inference for a target requests this rather than `AllScalaSourceDependencyAnalyses`, so that it
+    re-runs only when the analysis of its own source changes.
+    """
+
+    address: Address
+
+
+@rule(level=LogLevel.DEBUG)
+def scala_target_analysis(
+    request: ScalaTargetAnalysisRequest, all_analyses: AllScalaSourceDependencyAnalyses
+) -> ScalaSourceDependencyAnalysis:
+    return all_analyses.analyses[request.address]
+
+
 SCALA_PACKAGE_OBJECT_NAMESPACE: SymbolNamespace = "package object"
 
 
@@ -58,19 +139,16 @@ def _symbol_namespace(address: Address) -> SymbolNamespace:
 async def map_first_party_scala_targets_to_symbols(
     _: FirstPartyScalaTargetsMappingRequest,
     scala_targets: AllScalaTargets,
+    all_analyses: AllScalaSourceDependencyAnalyses,
     jvm: JvmSubsystem,
 ) -> SymbolMap:
-    source_analysis = await MultiGet(
-        Get(ScalaSourceDependencyAnalysis, SourceFilesRequest([target[ScalaSourceField]]))
-        for target in scala_targets
-    )
-    address_and_analysis = zip(
-        [(tgt.address, tgt[JvmResolveField].normalized_value(jvm)) for tgt in scala_targets],
-        source_analysis,
-    )
-
     mapping: Mapping[str, MutableTrieNode] = defaultdict(MutableTrieNode)
-    for (address, resolve), analysis in address_and_analysis:
+    for tgt in scala_targets:
+        analysis = all_analyses.analyses.get(tgt.address)
+        if analysis is None:
+            continue
+        address = tgt.address
+        resolve = tgt[JvmResolveField].normalized_value(jvm)
         namespace = _symbol_namespace(address)
         for symbol in analysis.provided_symbols:
             mapping[resolve].insert(
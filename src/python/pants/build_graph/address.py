@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import dataclasses
 import os
+import sys
 from dataclasses import dataclass
 from pathlib import PurePath
 from typing import Any, Iterable, Mapping, Sequence
@@ -24,6 +25,9 @@ BANNED_CHARS_IN_TARGET_NAME = frozenset(r":#!@?/\=")
 BANNED_CHARS_IN_GENERATED_NAME = frozenset(r":#!@?=")
 BANNED_CHARS_IN_PARAMETERS = frozenset(r":#!@?=, ")
 
+# Shared by all unparametrized Addresses.
+_NO_PARAMETERS: FrozenDict[str, str] = FrozenDict()
+
 
 class InvalidAddressError(AddressParseException):
     pass
@@ -362,6 +366,17 @@ class Address(EngineAwareParameter):
     generated from other targets use the format `path/to:generator#generated`.
     """
 
+    # NB: Large repositories have very many Addresses alive at once, so they are kept compact: the
+    # strings they are made of are interned, and they have no `__dict__`.
+    __slots__ = (
+        "spec_path",
+        "parameters",
+        "generated_name",
+        "_relative_file_path",
+        "_target_name",
+        "_hash",
+    )
+
     def __init__(
         self,
         spec_path: str,
@@ -385,10 +400,12 @@ class Address(EngineAwareParameter):
           if any. Because files must always be located below targets that apply metadata to
           them, this will always be relative.
         """
-        self.spec_path = spec_path
-        self.parameters = FrozenDict(parameters) if parameters else FrozenDict()
-        self.generated_name = generated_name
-        self._relative_file_path = relative_file_path
+        self.spec_path = sys.intern(spec_path)
+        self.parameters = FrozenDict(parameters) if parameters else _NO_PARAMETERS
+        self.generated_name = sys.intern(generated_name) if generated_name else generated_name
+        self._relative_file_path = (
+            sys.intern(relative_file_path) if relative_file_path else relative_file_path
+        )
         if generated_name:
             if relative_file_path:
                 raise AssertionError(
@@ -414,7 +431,7 @@ class Address(EngineAwareParameter):
                     f"contains banned characters (`{'`,`'.join(banned_chars)}`). Please replace "
                     "these characters with another separator character like `_` or `-`."
                 )
-            self._target_name = target_name
+            self._target_name = sys.intern(target_name)
 
         self._hash = hash(
             (self.spec_path, self._target_name, self.generated_name, self._relative_file_path)
@@ -335,6 +335,19 @@ def test_address_equality() -> None:
     )
 
 
+def test_address_is_compact() -> None:
+    # Build the strings at runtime, so that they are not already interned as constants.
+    spec_path = "/".join(["a", "b"])
+    addr1 = Address(spec_path, target_name="".join(["t", "gt"]), generated_name="f.py")
+    addr2 = Address("a/b", target_name="tgt", generated_name="".join(["f", ".py"]))
+    assert addr1 == addr2
+    assert addr1.spec_path is addr2.spec_path
+    assert addr1.target_name is addr2.target_name
+    assert addr1.generated_name is addr2.generated_name
+    assert Address("a").parameters is Address("b").parameters
+    assert not hasattr(addr1, "__dict__")
+
+
 def test_address_spec() -> None:
     def assert_spec(address: Address, *, expected: str, expected_path_spec: str) -> None:
         assert address.spec == expected
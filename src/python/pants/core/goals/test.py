@@ -4,13 +4,15 @@
 from __future__ import annotations
 
 import itertools
+import json
 import logging
 from abc import ABC, ABCMeta
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import PurePath
-from typing import Any, ClassVar, Iterable, Optional, TypeVar, cast
+from typing import Any, Callable, ClassVar, Iterable, Optional, TypeVar, cast
 
+from pants.base.build_root import BuildRoot
 from pants.core.goals.multi_tool_goal_helper import SkippableSubsystem
 from pants.core.goals.package import BuiltPackage, EnvironmentAwarePackageRequest, PackageFieldSet
 from pants.core.subsystems.debug_adapter import DebugAdapterSubsystem
@@ -33,7 +35,16 @@ from pants.engine.console import Console
 from pants.engine.desktop import OpenFiles, OpenFilesRequest
 from pants.engine.engine_aware import EngineAwareReturnType
 from pants.engine.env_vars import EnvironmentVars, EnvironmentVarsRequest
-from pants.engine.fs import EMPTY_FILE_DIGEST, Digest, FileDigest, MergeDigests, Snapshot, Workspace
+from pants.engine.fs import (
+    EMPTY_FILE_DIGEST,
+    CreateDigest,
+    Digest,
+    FileContent,
+    FileDigest,
+    MergeDigests,
+    Snapshot,
+    Workspace,
+)
 from pants.engine.goal import Goal, GoalSubsystem
 from pants.engine.internals.session import RunId
 from pants.engine.process import (
@@ -56,12 +67,15 @@ from pants.engine.target import (
     TargetRootsToFieldSetsRequest,
     Targets,
     ValidNumbers,
+    mean_weight,
     parse_shard_spec,
 )
 from pants.engine.unions import UnionMembership, UnionRule, distinct_union_type_per_subclass, union
 from pants.option.option_types import BoolOption, EnumOption, IntOption, StrListOption, StrOption
 from pants.util.collections import partition_sequentially
+from pants.util.dirutil import read_file
 from pants.util.docutil import bin_name
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
 from pants.util.memo import memoized
 from pants.util.meta import classproperty
@@ -259,6 +273,13 @@ class ShowOutput(Enum):
     NONE = "none"
 
 
+class ShardStrategy(Enum):
+    """How to partition the targets to test between shards."""
+
+    COUNT = "count"
+    DURATION = "duration"
+
+
 @dataclass(frozen=True)
 class TestDebugRequest:
     process: InteractiveProcess
@@ -566,9 +587,42 @@ class TestSubsystem(GoalSubsystem):
             Useful for splitting large numbers of test files across multiple machines in CI.
             For example, you can run three shards with --shard=0/3, --shard=1/3, --shard=2/3.
 
-            Note that the shards are roughly equal in size as measured by number of files.
-            No attempt is made to consider the size of different files, the time they have
-            taken to run in the past, or other such sophisticated measures.
+            Note that by default the shards are roughly equal in size as measured by number of
+            files. See `--shard-strategy` to instead balance them by the time that their tests have
+            taken to run in the past.
+            """
+        ),
+    )
+    shard_strategy = EnumOption(
+        default=ShardStrategy.COUNT,
+        help=softwrap(
+            f"""
+            How to partition targets between shards when `--shard` is set.
+
+            `{ShardStrategy.COUNT.value}`: each shard receives roughly the same number of targets,
+            based on a hash of their addresses. A target remains in the same shard as other targets
+            are added or removed.
+
+            `{ShardStrategy.DURATION.value}`: each shard receives targets whose tests took roughly
+            the same total time to run in the past, as recorded in `--durations-file`. Targets with
+            no recorded duration are assumed to take the mean of all recorded durations. Targets
+            may move between shards as their durations change, so every shard must be run with the
+            same `--durations-file` content for the shards to be disjoint.
+            """
+        ),
+    )
+    default_durations_path = str(PurePath("{distdir}", "test", "durations.json"))
+    _durations_file = StrOption(
+        default=default_durations_path,
+        advanced=True,
+        help=softwrap(
+            f"""
+            Path to a file in which the time taken by the tests of each target is recorded, for use
+            by `--shard-strategy={ShardStrategy.DURATION.value}` and `--batch-max-duration`. Must
+            be relative to the build root.
+
+            The file is updated after each run, but only when one of those options is in use. To
+            balance shards in CI, persist the file between CI runs (or commit it).
             """
         ),
     )
@@ -628,10 +682,34 @@ class TestSubsystem(GoalSubsystem):
             """
         ),
     )
+    batch_max_duration = IntOption(
+        default=None,
+        advanced=True,
+        help=softwrap(
+            """
+            The maximum total time (in seconds) that the tests of each batch should take to run,
+            based on the durations recorded in `--durations-file`. Targets with no recorded duration
+            are assumed to take the mean of all recorded durations.
+
+            Batches are split further than `--batch-size` alone would split them, to avoid a single
+            long-running batch determining the duration of the whole run.
+
+            NOTE: This parameter has no effect on test runners/plugins that do not implement support
+            for batched testing.
+            """
+        ),
+    )
 
     def report_dir(self, distdir: DistDir) -> PurePath:
         return PurePath(self._report_dir.format(distdir=distdir.relpath))
 
+    def durations_file(self, distdir: DistDir) -> PurePath:
+        return PurePath(self._durations_file.format(distdir=distdir.relpath))
+
+    @property
+    def records_durations(self) -> bool:
+        return self.shard_strategy == ShardStrategy.DURATION or self.batch_max_duration is not None
+
 
 class Test(Goal):
     subsystem_cls = TestSubsystem
@@ -688,11 +766,72 @@ class TestExtraEnvVarsField(StringSequenceField, metaclass=ABCMeta):
     )
 
 
+@dataclass(frozen=True)
+class _TestDurations:
+    """The time (in seconds) that the tests of each target took to run, by address spec."""
+
+    durations: FrozenDict[str, float]
+
+    _VERSION = 1
+
+    @classmethod
+    def load(cls, build_root: BuildRoot, durations_file: PurePath) -> _TestDurations:
+        """Load the durations recorded at `durations_file`, relative to the build root.
+
+        N.B.: The distdir is ignored by the engine, so the file cannot be read via `PathGlobs`.
+        """
+        try:
+            content = json.loads(read_file(str(build_root.pathlib_path / durations_file)))
+            if content.get("version") == cls._VERSION:
+                return cls(
+                    FrozenDict(
+                        (spec, float(duration)) for spec, duration in content["durations"].items()
+                    )
+                )
+            logger.debug(
+                f"Ignoring test durations in {durations_file} with an unsupported version."
+            )
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, AttributeError, KeyError) as e:
+            logger.warning(f"Ignoring invalid test durations in {durations_file}: {e}")
+        return cls(FrozenDict())
+
+    def weight(self, default: float) -> Callable[[TestFieldSet], float]:
+        return lambda field_set: self.durations.get(field_set.address.spec, default)
+
+    def updated(self, results: Iterable[TestResult]) -> _TestDurations:
+        """Record the durations of the given results.
+
+        Batched results only report the duration of the whole batch, which is attributed evenly to
+        the targets in the batch.
+        """
+        durations = dict(self.durations)
+        for result in results:
+            if (
+                result.result_metadata is None
+                or result.result_metadata.total_elapsed_ms is None
+                or not result.addresses
+            ):
+                continue
+            duration = result.result_metadata.total_elapsed_ms / 1000 / len(result.addresses)
+            for address in result.addresses:
+                durations[address.spec] = round(duration, 3)
+        return _TestDurations(FrozenDict(durations))
+
+    def to_json(self) -> bytes:
+        return json.dumps(
+            {"version": self._VERSION, "durations": dict(sorted(self.durations.items()))},
+            indent=2,
+        ).encode()
+
+
 async def _get_test_batches(
     core_request_types: Iterable[type[TestRequest]],
     targets_to_field_sets: TargetRootsToFieldSets,
     local_environment_name: ChosenLocalEnvironmentName,
     test_subsystem: TestSubsystem,
+    durations: _TestDurations | None = None,
 ) -> list[TestRequest.Batch]:
     def partitions_get(request_type: type[TestRequest]) -> Get[Partitions]:
         partition_type = cast(TestRequest, request_type)
@@ -715,6 +854,10 @@ async def _get_test_batches(
         partitions_get(request_type) for request_type in core_request_types
     )
 
+    weight: Callable[[TestFieldSet], float] | None = None
+    if durations is not None and test_subsystem.batch_max_duration is not None:
+        weight = durations.weight(default=mean_weight(durations.durations) or 0.0)
+
     return [
         request_type.Batch(
             cast(TestRequest, request_type).tool_name, tuple(batch), partition.metadata
@@ -726,6 +869,8 @@ async def _get_test_batches(
             key=lambda x: str(x),
             size_target=test_subsystem.batch_size,
             size_max=2 * test_subsystem.batch_size,
+            weight=weight,
+            weight_max=test_subsystem.batch_max_duration,
         )
     ]
 
@@ -784,6 +929,7 @@ async def run_tests(
     workspace: Workspace,
     union_membership: UnionMembership,
     distdir: DistDir,
+    build_root: BuildRoot,
     run_id: RunId,
     local_environment_name: ChosenLocalEnvironmentName,
 ) -> Test:
@@ -797,6 +943,13 @@ async def run_tests(
         goal_description = f"The `{test_subsystem.name}` goal"
         no_applicable_targets_behavior = NoApplicableTargetsBehavior.warn
 
+    durations_file = test_subsystem.durations_file(distdir)
+    durations = (
+        _TestDurations.load(build_root, durations_file)
+        if test_subsystem.records_durations
+        else None
+    )
+
     shard, num_shards = parse_shard_spec(test_subsystem.shard, "the [test].shard option")
     targets_to_valid_field_sets = await Get(
         TargetRootsToFieldSets,
@@ -806,6 +959,11 @@ async def run_tests(
             no_applicable_targets_behavior=no_applicable_targets_behavior,
             shard=shard,
             num_shards=num_shards,
+            shard_weights=(
+                durations.durations
+                if durations is not None and test_subsystem.shard_strategy == ShardStrategy.DURATION
+                else None
+            ),
         ),
     )
 
@@ -815,6 +973,7 @@ async def run_tests(
         targets_to_valid_field_sets,
         local_environment_name,
         test_subsystem,
+        durations,
     )
 
     if test_subsystem.debug or test_subsystem.debug_adapter:
@@ -863,6 +1022,13 @@ async def run_tests(
                     f"Wrote extra output from test `{result.addresses[0]}` to `{path_prefix}`."
                 )
 
+    if durations is not None and results:
+        durations_digest = await Get(
+            Digest,
+            CreateDigest([FileContent(str(durations_file), durations.updated(results).to_json())]),
+        )
+        workspace.write_digest(durations_digest)
+
     if test_subsystem.report:
         report_dir = test_subsystem.report_dir(distdir)
         merged_reports = await Get(
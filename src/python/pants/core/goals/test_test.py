@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import json
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
 from functools import partial
@@ -16,6 +17,7 @@ from pants.backend.python.goals import package_pex_binary
 from pants.backend.python.target_types import PexBinary, PythonSourcesGeneratorTarget
 from pants.backend.python.target_types_rules import rules as python_target_type_rules
 from pants.backend.python.util_rules import pex_from_targets
+from pants.base.build_root import BuildRoot
 from pants.core.goals.test import (
     BuildPackageDependenciesRequest,
     BuiltPackageDependencies,
@@ -24,6 +26,7 @@ from pants.core.goals.test import (
     CoverageDataCollection,
     CoverageReports,
     RuntimePackageDependenciesField,
+    ShardStrategy,
     ShowOutput,
     Test,
     TestDebugAdapterRequest,
@@ -51,6 +54,7 @@ from pants.engine.environment import EnvironmentName
 from pants.engine.fs import (
     EMPTY_DIGEST,
     EMPTY_FILE_DIGEST,
+    CreateDigest,
     Digest,
     MergeDigests,
     Snapshot,
@@ -211,6 +215,9 @@ def run_test_rule(
     output: ShowOutput = ShowOutput.ALL,
     valid_targets: bool = True,
     run_id: RunId = RunId(999),
+    shard_strategy: ShardStrategy = ShardStrategy.COUNT,
+    durations_file: str = TestSubsystem.default_durations_path,
+    batch_max_duration: int | None = None,
 ) -> tuple[int, str]:
     test_subsystem = create_goal_subsystem(
         TestSubsystem,
@@ -223,7 +230,10 @@ def run_test_rule(
         output=output,
         extra_env_vars=[],
         shard="",
+        shard_strategy=shard_strategy,
+        durations_file=durations_file,
         batch_size=1,
+        batch_max_duration=batch_max_duration,
     )
     debug_adapter_subsystem = create_subsystem(
         DebugAdapterSubsystem,
@@ -288,6 +298,7 @@ def run_test_rule(
                 workspace,
                 union_membership,
                 DistDir(relpath=Path("dist")),
+                BuildRoot(),
                 run_id,
                 ChosenLocalEnvironmentName(EnvironmentName(None)),
             ],
@@ -328,6 +339,12 @@ def run_test_rule(
                     input_types=(MergeDigests,),
                     mock=lambda _: EMPTY_DIGEST,
                 ),
+                # Write test durations.
+                MockGet(
+                    output_type=Digest,
+                    input_types=(CreateDigest,),
+                    mock=lambda create_digest: rule_runner.request(Digest, [create_digest]),
+                ),
                 MockGet(
                     output_type=CoverageReports,
                     input_types=(CoverageDataCollection, EnvironmentName),
@@ -479,6 +496,28 @@ def test_report_dir(rule_runner: RuleRunner) -> None:
     assert f"Wrote test reports to {report_dir}" in stderr
 
 
+def test_record_durations(rule_runner: RuleRunner) -> None:
+    durations_file = "dist/test/durations.json"
+    rule_runner.write_files(
+        {durations_file: json.dumps({"version": 1, "durations": {"//:t1": 5, "//:other": 2}})}
+    )
+    addr1 = Address("", target_name="t1")
+    addr2 = Address("", target_name="t2")
+    exit_code, _ = run_test_rule(
+        rule_runner,
+        request_type=SuccessfulRequest,
+        targets=[make_target(addr1), make_target(addr2)],
+        shard_strategy=ShardStrategy.DURATION,
+        durations_file=durations_file,
+    )
+    assert exit_code == 0
+    content = json.loads(Path(rule_runner.build_root, durations_file).read_text())
+    assert content == {
+        "version": 1,
+        "durations": {"//:other": 2.0, "//:t1": 0.999, "//:t2": 0.999},
+    }
+
+
 def test_coverage(rule_runner: RuleRunner) -> None:
     addr1 = Address("", target_name="t1")
     addr2 = Address("", target_name="t2")
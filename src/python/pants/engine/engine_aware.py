@@ -21,6 +21,9 @@ class EngineAwareParameter(ABC):
     will do nothing; otherwise, it will use the additional metadata provided.
     """
 
+    # Allow subclasses to declare `__slots__`.
+    __slots__ = ()
+
     def debug_hint(self) -> str | None:
         """If implemented, this string will be shown in `@rule` debug contexts if that rule takes
         the annotated type as a parameter."""
@@ -0,0 +1,202 @@
+# Copyright 2023 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+"""Persistent snapshots of the result of evaluating the BUILD files of a directory.
+
+See `[GLOBAL].build_file_snapshots`. A snapshot holds the `AddressMap`s (i.e. the addresses and
+field values) declared in a directory, along with the defaults and dependency rules it declares. It
+is keyed by everything which went into evaluating the directory: the path, content and referenced
+environment variables of its BUILD files, the state inherited from its ancestors, the content of
+the prelude files, and a fingerprint of the Pants version and of the symbols available to BUILD
+files. A snapshot is only ever reused for identical inputs, so it does not need to be validated
+when it is loaded.
+
+Since snapshots are shared between processes, the key is computed from a canonical encoding of the
+inputs, which (unlike a pickle) does not depend on e.g. the iteration order of sets, which varies
+with the hash seed of the process.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import threading
+from enum import Enum
+from typing import Any, Mapping
+
+from pants.engine.internals import python_metrics
+from pants.engine.internals.build_file_workers import BuildFileParseRequest, BuildFileParseResult
+from pants.engine.internals.parser import BuildFilePreludeSymbols, Parser
+from pants.engine.target import RegisteredTargetTypes
+from pants.engine.unions import UnionMembership
+from pants.util.dirutil import safe_concurrent_creation
+from pants.version import VERSION
+
+logger = logging.getLogger(__name__)
+
+
+def _schema_fingerprint(
+    parser: Parser,
+    registered_target_types: RegisteredTargetTypes,
+    union_membership: UnionMembership,
+) -> str:
+    """Fingerprint the symbols which BUILD files may use, and the fields of each target type."""
+    hasher = hashlib.sha256()
+    hasher.update(VERSION.encode())
+    for alias, target_type in sorted(registered_target_types.aliases_to_types.items()):
+        hasher.update(f"\0{alias}={target_type.__module__}.{target_type.__qualname__}".encode())
+        for field_type in target_type.class_field_types(union_membership):
+            hasher.update(f"\0{field_type.alias}={field_type.__module__}".encode())
+    for name, symbol in sorted(parser.builtin_symbols.items()):
+        symbol_type = symbol if isinstance(symbol, type) else type(symbol)
+        hasher.update(f"\0{name}={symbol_type.__module__}.{symbol_type.__qualname__}".encode())
+    return hasher.hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    """Convert the value to a JSON-serializable structure which is independent of hash ordering.
+
+    Raises TypeError for values which have no canonical form.
+    """
+    if isinstance(value, Enum):
+        return ["enum", f"{type(value).__module__}.{type(value).__qualname__}", value.name]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, type):
+        return ["type", f"{value.__module__}.{value.__qualname__}"]
+    if isinstance(value, bytes):
+        return ["bytes", value.hex()]
+    if isinstance(value, re.Pattern):
+        return ["pattern", _canonical(value.pattern), value.flags]
+    if isinstance(value, Mapping):
+        items = [[_canonical(k), _canonical(v)] for k, v in value.items()]
+        return ["map", sorted(items, key=json.dumps)]
+    if isinstance(value, (set, frozenset)):
+        return ["set", sorted((_canonical(item) for item in value), key=json.dumps)]
+    if isinstance(value, (tuple, list)):
+        return ["seq", [_canonical(item) for item in value]]
+    if dataclasses.is_dataclass(value):
+        return [
+            "dataclass",
+            f"{type(value).__module__}.{type(value).__qualname__}",
+            [[f.name, _canonical(getattr(value, f.name))] for f in dataclasses.fields(value)],
+        ]
+    raise TypeError(f"Can not canonically encode a value of type {type(value).__name__}.")
+
+
+def request_fingerprint(
+    request: BuildFileParseRequest, prelude_symbols: BuildFilePreludeSymbols
+) -> str:
+    """Fingerprint everything which evaluating the request depends on, in a way which is stable
+    across processes.
+
+    Raises TypeError if the request contains values which have no canonical form.
+    """
+    encoded = json.dumps(
+        [
+            request.directory,
+            sorted(
+                [path, content, _canonical(env_vars)]
+                for path, content, env_vars in request.build_files
+            ),
+            request.is_bootstrap,
+            _canonical(request.defaults),
+            _canonical(request.dependents_rules),
+            _canonical(request.dependencies_rules),
+            _canonical(request.dependency_rules_class),
+            # Prelude files are evaluated in order.
+            [[path, content] for path, content in prelude_symbols.prelude_files],
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class BuildFileSnapshots:
+    """A store of `BuildFileParseResult`s, persisted (as pickles) below `snapshot_dir`."""
+
+    HITS = "build_file_snapshot_hits"
+    MISSES = "build_file_snapshot_misses"
+
+    # Bump when the content of `BuildFileParseResult` changes, to invalidate persisted snapshots.
+    _FORMAT_VERSION = b"1"
+
+    _lock = threading.Lock()
+    _instance: BuildFileSnapshots | None = None
+
+    def __init__(self, snapshot_dir: str, parser: Parser, schema_fingerprint: str) -> None:
+        self.snapshot_dir = snapshot_dir
+        self.parser = parser
+        self._schema_fingerprint = schema_fingerprint
+        python_metrics.register_counters(self.HITS, self.MISSES)
+
+    @classmethod
+    def get(
+        cls,
+        snapshot_dir: str,
+        parser: Parser,
+        registered_target_types: RegisteredTargetTypes,
+        union_membership: UnionMembership,
+    ) -> BuildFileSnapshots:
+        """Return the snapshots for the given Parser, replacing those for a previous Parser."""
+        with cls._lock:
+            instance = cls._instance
+            if (
+                instance is None
+                or instance.snapshot_dir != snapshot_dir
+                or instance.parser is not parser
+            ):
+                instance = cls(
+                    snapshot_dir,
+                    parser,
+                    _schema_fingerprint(parser, registered_target_types, union_membership),
+                )
+                cls._instance = instance
+            return instance
+
+    def key(
+        self, request: BuildFileParseRequest, prelude_symbols: BuildFilePreludeSymbols
+    ) -> str | None:
+        """Compute the key of the request, or return None if it can not be snapshotted."""
+        try:
+            fingerprint = request_fingerprint(request, prelude_symbols)
+        except TypeError as e:
+            logger.debug(f"Not snapshotting BUILD files in {request.directory!r}: {e}")
+            return None
+        hasher = hashlib.sha256()
+        hasher.update(self._FORMAT_VERSION)
+        hasher.update(self._schema_fingerprint.encode())
+        hasher.update(fingerprint.encode())
+        return hasher.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.snapshot_dir, key[:2], key)
+
+    def load(self, key: str) -> BuildFileParseResult | None:
+        path = self._path(key)
+        result = None
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    result = pickle.load(f)
+            except Exception as e:
+                logger.debug(f"Ignoring invalid BUILD file snapshot {path}: {e}")
+            if not isinstance(result, BuildFileParseResult):
+                result = None
+        python_metrics.increment_counter(self.MISSES if result is None else self.HITS)
+        return result
+
+    def store(self, key: str, result: BuildFileParseResult) -> None:
+        path = self._path(key)
+        try:
+            with safe_concurrent_creation(path) as tmp_path:
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            # Snapshots are only an optimization: e.g. a macro may have produced an unpicklable
+            # value.
+            logger.debug(f"Failed to write BUILD file snapshot {path}: {e}")
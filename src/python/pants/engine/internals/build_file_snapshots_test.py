@@ -0,0 +1,111 @@
+# Copyright 2023 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from textwrap import dedent
+
+import pytest
+
+from pants.engine.env_vars import EnvironmentVars
+from pants.engine.internals.build_file_snapshots import request_fingerprint
+from pants.engine.internals.build_file_workers import BuildFileParseRequest
+from pants.engine.internals.defaults import BuildFileDefaults
+from pants.engine.internals.parser import BuildFilePreludeSymbols
+from pants.util.frozendict import FrozenDict
+
+_FINGERPRINT_SCRIPT = dedent(
+    """\
+    from pants.engine.env_vars import EnvironmentVars
+    from pants.engine.internals.build_file_snapshots import request_fingerprint
+    from pants.engine.internals.build_file_workers import BuildFileParseRequest
+    from pants.engine.internals.defaults import BuildFileDefaults
+    from pants.engine.internals.parser import BuildFilePreludeSymbols
+    from pants.util.frozendict import FrozenDict
+
+    request = BuildFileParseRequest(
+        directory="src/project",
+        build_files=tuple(
+            (
+                f"src/project/BUILD.{i}",
+                f"tgt(name='t{i}')",
+                EnvironmentVars({f"VAR_{j}": str(j) for j in range(10)}),
+            )
+            for i in range(3)
+        ),
+        is_bootstrap=False,
+        defaults=BuildFileDefaults(
+            {
+                f"tgt_{i}": FrozenDict(
+                    {"tags": tuple(f"tag_{j}" for j in range(5)), "labels": frozenset("abcdefgh")}
+                )
+                for i in range(10)
+            }
+        ),
+        dependents_rules=None,
+        dependencies_rules=None,
+        dependency_rules_class=None,
+    )
+    prelude_symbols = BuildFilePreludeSymbols.create({}, (), [("prelude.py", "X = 1")])
+    print(request_fingerprint(request, prelude_symbols))
+    """
+)
+
+
+def test_request_fingerprint_is_stable_across_processes() -> None:
+    def fingerprint(hash_seed: str) -> str:
+        return subprocess.run(
+            [sys.executable, "-c", _FINGERPRINT_SCRIPT],
+            env={
+                **os.environ,
+                "PYTHONPATH": os.pathsep.join(sys.path),
+                "PYTHONHASHSEED": hash_seed,
+            },
+            check=True,
+            stdout=subprocess.PIPE,
+            text=True,
+        ).stdout.strip()
+
+    fingerprints = {fingerprint(hash_seed) for hash_seed in ("1", "2", "3")}
+    assert len(fingerprints) == 1
+
+
+def test_request_fingerprint() -> None:
+    def request(
+        build_files: tuple[tuple[str, str, EnvironmentVars], ...] = (
+            ("dir/BUILD", "tgt()", EnvironmentVars({"A": "1"})),
+        ),
+        defaults: BuildFileDefaults = BuildFileDefaults({}),
+    ) -> BuildFileParseRequest:
+        return BuildFileParseRequest(
+            directory="dir",
+            build_files=build_files,
+            is_bootstrap=False,
+            defaults=defaults,
+            dependents_rules=None,
+            dependencies_rules=None,
+            dependency_rules_class=None,
+        )
+
+    no_preludes = BuildFilePreludeSymbols.create({}, ())
+    fingerprint = request_fingerprint(request(), no_preludes)
+    assert fingerprint == request_fingerprint(request(), no_preludes)
+    assert fingerprint != request_fingerprint(
+        request(build_files=(("dir/BUILD", "tgt()", EnvironmentVars({"A": "2"})),)), no_preludes
+    )
+    assert fingerprint != request_fingerprint(
+        request(defaults=BuildFileDefaults({"tgt": FrozenDict({"tags": ("a",)})})), no_preludes
+    )
+    assert fingerprint != request_fingerprint(
+        request(), BuildFilePreludeSymbols.create({}, (), [("prelude.py", "X = 1")])
+    )
+
+    # Values without a canonical encoding can not be fingerprinted.
+    with pytest.raises(TypeError):
+        request_fingerprint(
+            request(defaults=BuildFileDefaults({"tgt": FrozenDict({"tags": object()})})),
+            no_preludes,
+        )
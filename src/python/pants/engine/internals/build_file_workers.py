@@ -0,0 +1,255 @@
+# Copyright 2023 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+"""Evaluation of the BUILD files of a directory, either in-process or in a pool of forked worker
+processes.
+
+See `[GLOBAL].build_file_parse_workers`. Since the symbols available to BUILD files (target type
+registrars, context aware object factories, etc.) are not picklable, workers are forked from the
+Pants process when the scheduler is set up, after the `Parser` has been created, and inherit it. Everything else that a directory
+needs to be parsed (the content of its BUILD files, the defaults and dependency rules inherited from
+its closest ancestor `AddressFamily`, and the source of the prelude files) is sent to the worker
+with each request, and the resulting `AddressMap`s, defaults and rules are sent back.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import cast
+
+from pants.engine.env_vars import EnvironmentVars
+from pants.engine.internals import python_metrics
+from pants.engine.internals.defaults import BuildFileDefaults, BuildFileDefaultsParserState
+from pants.engine.internals.dep_rules import BuildFileDependencyRules
+from pants.engine.internals.mapper import AddressMap
+from pants.engine.internals.parser import BuildFilePreludeSymbols, Parser
+from pants.engine.target import RegisteredTargetTypes
+from pants.engine.unions import UnionMembership
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BuildFileParseRequest:
+    """The BUILD files of a single directory, along with the state they inherit."""
+
+    directory: str
+    # The (path, content, env vars) of each BUILD file.
+    build_files: tuple[tuple[str, str, EnvironmentVars], ...]
+    is_bootstrap: bool
+    defaults: BuildFileDefaults
+    dependents_rules: BuildFileDependencyRules | None
+    dependencies_rules: BuildFileDependencyRules | None
+    dependency_rules_class: type[BuildFileDependencyRules] | None
+
+
+@dataclass(frozen=True)
+class BuildFileParseResult:
+    address_maps: tuple[AddressMap, ...]
+    defaults: BuildFileDefaults
+    dependents_rules: BuildFileDependencyRules | None
+    dependencies_rules: BuildFileDependencyRules | None
+
+
+def parse_build_files(
+    request: BuildFileParseRequest,
+    *,
+    parser: Parser,
+    prelude_symbols: BuildFilePreludeSymbols,
+    registered_target_types: RegisteredTargetTypes,
+    union_membership: UnionMembership,
+) -> BuildFileParseResult:
+    defaults_parser_state = BuildFileDefaultsParserState.create(
+        request.directory, request.defaults, registered_target_types, union_membership
+    )
+    if request.dependency_rules_class is not None:
+        dependents_rules_parser_state = request.dependency_rules_class.create_parser_state(
+            request.directory,
+            request.dependents_rules,
+        )
+        dependencies_rules_parser_state = request.dependency_rules_class.create_parser_state(
+            request.directory,
+            request.dependencies_rules,
+        )
+    else:
+        dependents_rules_parser_state = None
+        dependencies_rules_parser_state = None
+
+    address_maps = tuple(
+        AddressMap.parse(
+            path,
+            content,
+            parser,
+            prelude_symbols,
+            env_vars,
+            request.is_bootstrap,
+            defaults_parser_state,
+            dependents_rules_parser_state,
+            dependencies_rules_parser_state,
+            compiled=parser.compile(path, content),
+        )
+        for path, content, env_vars in request.build_files
+    )
+
+    # Freeze defaults and dependency rules
+    return BuildFileParseResult(
+        address_maps=address_maps,
+        defaults=defaults_parser_state.get_frozen_defaults(),
+        dependents_rules=cast(
+            "BuildFileDependencyRules | None",
+            dependents_rules_parser_state
+            and dependents_rules_parser_state.get_frozen_dependency_rules(),
+        ),
+        dependencies_rules=cast(
+            "BuildFileDependencyRules | None",
+            dependencies_rules_parser_state
+            and dependencies_rules_parser_state.get_frozen_dependency_rules(),
+        ),
+    )
+
+
+@dataclass(frozen=True)
+class _WorkerContext:
+    parser: Parser
+    registered_target_types: RegisteredTargetTypes
+    union_membership: UnionMembership
+
+
+# State of a worker process: inherited from the parent when the worker is forked.
+_worker_context: _WorkerContext | None = None
+_worker_preludes: dict[tuple[tuple[str, str], ...], BuildFilePreludeSymbols] = {}
+
+
+def _initialize_worker(context: _WorkerContext) -> None:
+    global _worker_context
+    _worker_context = context
+    # The Pants process logs via the engine, which is not usable in a forked child.
+    root = logging.getLogger()
+    root.handlers = [logging.StreamHandler()]
+
+
+def _parse_in_worker(
+    request: BuildFileParseRequest, prelude_files: tuple[tuple[str, str], ...]
+) -> BuildFileParseResult:
+    context = _worker_context
+    assert context is not None, "BUILD file parsing worker was not initialized."
+    prelude_symbols = _worker_preludes.get(prelude_files)
+    if prelude_symbols is None:
+        prelude_symbols = context.parser.evaluate_preludes(prelude_files)
+        _worker_preludes.clear()
+        _worker_preludes[prelude_files] = prelude_symbols
+    return parse_build_files(
+        request,
+        parser=context.parser,
+        prelude_symbols=prelude_symbols,
+        registered_target_types=context.registered_target_types,
+        union_membership=context.union_membership,
+    )
+
+
+class BuildFileParserPool:
+    """A pool of worker processes forked from this process to evaluate BUILD files with.
+
+    The pool is created (and its workers are forked) while the scheduler is set up, before the
+    engine starts to run rules.
+
+    Waiting for a worker blocks the calling rule thread (although not the GIL), so requests are
+    only sent to the pool while it has an idle worker: otherwise the calling thread is better used
+    to parse in-process. A wait is also bounded by `RESULT_TIMEOUT_SECONDS`, after which the caller
+    falls back to parsing in-process.
+    """
+
+    PARSED = "build_file_parse_worker_results"
+    FAILED = "build_file_parse_worker_failures"
+
+    RESULT_TIMEOUT_SECONDS = 60.0
+
+    _lock = threading.Lock()
+    _instance: BuildFileParserPool | None = None
+
+    def __init__(self, workers: int, context: _WorkerContext) -> None:
+        self.workers = workers
+        self.context = context
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_initialize_worker,
+            initargs=(context,),
+        )
+        python_metrics.register_counters(self.PARSED, self.FAILED)
+
+    @classmethod
+    def create(
+        cls,
+        workers: int,
+        parser: Parser,
+        registered_target_types: RegisteredTargetTypes,
+        union_membership: UnionMembership,
+    ) -> BuildFileParserPool:
+        """Create a pool for the given Parser, and fork its workers.
+
+        Any pool for a previous Parser is shut down.
+        """
+        instance = cls(workers, _WorkerContext(parser, registered_target_types, union_membership))
+        # The executor forks all of its workers when the first task is submitted.
+        instance._executor.submit(int).result()
+        with cls._lock:
+            previous, cls._instance = cls._instance, instance
+        if previous is not None:
+            previous.shutdown()
+        return instance
+
+    @classmethod
+    def for_parser(cls, parser: Parser) -> BuildFileParserPool | None:
+        """Return the pool which was created for the given Parser, if any."""
+        with cls._lock:
+            instance = cls._instance
+        if instance is None or instance.context.parser is not parser:
+            return None
+        return instance
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def parse(
+        self, request: BuildFileParseRequest, prelude_symbols: BuildFilePreludeSymbols
+    ) -> BuildFileParseResult | None:
+        """Parse the request in a worker, or return None if that was not possible.
+
+        Returns None without waiting if all of the workers are busy. Failures are logged rather
+        than raised: the caller is expected to fall back to parsing in-process, which will
+        reproduce any genuine error with its usual context.
+        """
+        with self._in_flight_lock:
+            if self._in_flight >= self.workers:
+                return None
+            self._in_flight += 1
+        try:
+            return self._parse(request, prelude_symbols)
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+
+    def _parse(
+        self, request: BuildFileParseRequest, prelude_symbols: BuildFilePreludeSymbols
+    ) -> BuildFileParseResult | None:
+        future = None
+        try:
+            future = self._executor.submit(_parse_in_worker, request, prelude_symbols.prelude_files)
+            result = future.result(timeout=self.RESULT_TIMEOUT_SECONDS)
+        except Exception as e:
+            if future is not None:
+                future.cancel()
+            python_metrics.increment_counter(self.FAILED)
+            logger.warning(
+                f"Failed to parse the BUILD files in {request.directory!r} in a worker process, "
+                f"so parsing them in-process instead: {type(e).__name__}: {e}"
+            )
+            return None
+        python_metrics.increment_counter(self.PARSED)
+        return result
@@ -3,15 +3,12 @@
 
 from __future__ import annotations
 
-import ast
-import builtins
 import itertools
 import logging
 import os.path
-import sys
 from dataclasses import dataclass
 from pathlib import PurePath
-from typing import Any, Sequence, cast
+from typing import Sequence
 
 from pants.build_graph.address import (
     Address,
@@ -23,15 +20,22 @@ from pants.build_graph.address import (
 )
 from pants.engine.engine_aware import EngineAwareParameter
 from pants.engine.env_vars import CompleteEnvironmentVars, EnvironmentVars, EnvironmentVarsRequest
-from pants.engine.fs import DigestContents, FileContent, GlobMatchErrorBehavior, PathGlobs, Paths
-from pants.engine.internals.defaults import BuildFileDefaults, BuildFileDefaultsParserState
+from pants.engine.fs import DigestContents, GlobMatchErrorBehavior, PathGlobs, Paths
+from pants.engine.internals.build_file_snapshots import BuildFileSnapshots
+from pants.engine.internals.build_file_workers import (
+    BuildFileParseRequest,
+    BuildFileParseResult,
+    BuildFileParserPool,
+    parse_build_files,
+)
+from pants.engine.internals.defaults import BuildFileDefaults
 from pants.engine.internals.dep_rules import (
     BuildFileDependencyRules,
     DependencyRuleApplication,
     MaybeBuildFileDependencyRulesImplementation,
 )
-from pants.engine.internals.mapper import AddressFamily, AddressMap
-from pants.engine.internals.parser import BuildFilePreludeSymbols, Parser, error_on_imports
+from pants.engine.internals.mapper import AddressFamily
+from pants.engine.internals.parser import BuildFilePreludeSymbols, CompiledBuildFile, Parser
 from pants.engine.internals.session import SessionValues
 from pants.engine.internals.synthetic_targets import (
     SyntheticAddressMaps,
@@ -58,6 +62,7 @@ class BuildFileOptions:
     patterns: tuple[str, ...]
     ignores: tuple[str, ...] = ()
     prelude_globs: tuple[str, ...] = ()
+    snapshot_dir: str | None = None
 
 
 @rule
@@ -71,6 +76,11 @@ def extract_build_file_options(
         prelude_globs=(
             () if bootstrap_status.in_progress else global_options.build_file_prelude_globs
         ),
+        snapshot_dir=(
+            os.path.join(str(global_options.named_caches_dir), "build_file_snapshots")
+            if global_options.build_file_snapshots
+            else None
+        ),
     )
 
 
@@ -86,30 +96,10 @@ async def evaluate_preludes(
             glob_match_error_behavior=GlobMatchErrorBehavior.ignore,
         ),
     )
-    globals: dict[str, Any] = {
-        **{name: getattr(builtins, name) for name in dir(builtins) if name.endswith("Error")},
-        # Ensure the globals for each prelude includes the builtin symbols (E.g. `python_sources`)
-        **parser.builtin_symbols,
-    }
-    locals: dict[str, Any] = {}
-    env_vars: set[str] = set()
-    for file_content in prelude_digest_contents:
-        try:
-            file_content_str = file_content.content.decode()
-            content = compile(file_content_str, file_content.path, "exec", dont_inherit=True)
-            exec(content, globals, locals)
-        except Exception as e:
-            raise Exception(f"Error parsing prelude file {file_content.path}: {e}")
-        error_on_imports(file_content_str, file_content.path)
-        env_vars.update(BUILDFileEnvVarExtractor.get_env_vars(file_content))
-    # __builtins__ is a dict, so isn't hashable, and can't be put in a FrozenDict.
-    # Fortunately, we don't care about it - preludes should not be able to override builtins, so we just pop it out.
-    # TODO: Give a nice error message if a prelude tries to set a expose a non-hashable value.
-    locals.pop("__builtins__", None)
-    # Ensure preludes can reference each other by populating the shared globals object with references
-    # to the other symbols
-    globals.update(locals)
-    return BuildFilePreludeSymbols.create(locals, env_vars)
+    return parser.evaluate_preludes(
+        (file_content.path, file_content.content.decode())
+        for file_content in prelude_digest_contents
+    )
 
 
 @rule
@@ -178,52 +168,57 @@ async def ensure_address_family(request: OptionalAddressFamily) -> AddressFamily
     return request.ensure()
 
 
-class BUILDFileEnvVarExtractor(ast.NodeVisitor):
-    def __init__(self, filename: str):
-        super().__init__()
-        self.env_vars: set[str] = set()
-        self.filename = filename
-
-    @classmethod
-    def get_env_vars(cls, file_content: FileContent) -> Sequence[str]:
-        obj = cls(file_content.path)
-        obj.visit(ast.parse(file_content.content, file_content.path))
-        return tuple(obj.env_vars)
-
-    def visit_Call(self, node: ast.Call):
-        is_env = isinstance(node.func, ast.Name) and node.func.id == "env"
-        for arg in node.args:
-            if not is_env:
-                self.visit(arg)
-                continue
-
-            # Only first arg may be checked as env name
-            is_env = False
-
-            if sys.version_info[0:2] < (3, 8):
-                value = arg.s if isinstance(arg, ast.Str) else None
-            else:
-                value = arg.value if isinstance(arg, ast.Constant) else None
-            if value:
-                # Found env name in this call, we're done here.
-                self.env_vars.add(value)
-                return
-            else:
-                logger.warning(
-                    f"{self.filename}:{arg.lineno}: Only constant string values as variable name to "
-                    f"`env()` is currently supported. This `env()` call will always result in "
-                    "the default value only."
-                )
+@dataclass(frozen=True)
+class InheritedBuildFileContextRequest(EngineAwareParameter):
+    """The directory to find the inherited BUILD file context for."""
+
+    path: str
+
+    def debug_hint(self) -> str:
+        return self.path
+
+
+@dataclass(frozen=True)
+class InheritedBuildFileContext:
+    """The state that BUILD files inherit from the closest ancestor directory with BUILD files.
+
+    This is a separate node from the ancestor `AddressFamily`, so that when an ancestor BUILD file
+    is edited without changing its defaults or dependency rules, this value is unchanged, and the
+    BUILD files of descendant directories do not need to be parsed again.
+    """
+
+    defaults: BuildFileDefaults
+    dependents_rules: BuildFileDependencyRules | None = None
+    dependencies_rules: BuildFileDependencyRules | None = None
+
 
-        for kwarg in node.keywords:
-            self.visit(kwarg)
+@rule
+async def inherited_build_file_context(
+    request: InheritedBuildFileContextRequest,
+) -> InheritedBuildFileContext:
+    path = PurePath(request.path)
+    if not path.parents:
+        return InheritedBuildFileContext(BuildFileDefaults({}))
+
+    parent_dir = str(path.parent)
+    maybe_parent = await Get(OptionalAddressFamily, AddressFamilyDir(parent_dir))
+    if maybe_parent.address_family is None:
+        return await Get(InheritedBuildFileContext, InheritedBuildFileContextRequest(parent_dir))
+    family = maybe_parent.address_family
+    return InheritedBuildFileContext(
+        defaults=family.defaults,
+        dependents_rules=family.dependents_rules,
+        dependencies_rules=family.dependencies_rules,
+    )
 
 
 async def _extract_env_vars(
-    file_content: FileContent, extra_env: Sequence[str], env: CompleteEnvironmentVars
+    compiled: CompiledBuildFile, extra_env: Sequence[str], env: CompleteEnvironmentVars
 ) -> EnvironmentVars:
     """For BUILD file env vars, we only ever consult the local systems env."""
-    env_vars = (*BUILDFileEnvVarExtractor.get_env_vars(file_content), *extra_env)
+    for warning in compiled.warnings:
+        logger.warning(warning)
+    env_vars = (*compiled.env_vars, *extra_env)
     return await Get(
         EnvironmentVars,
         {
@@ -265,76 +260,59 @@ async def parse_address_family(
     if not digest_contents and not synthetic_address_maps:
         return OptionalAddressFamily(directory.path)
 
-    defaults = BuildFileDefaults({})
-    dependents_rules: BuildFileDependencyRules | None = None
-    dependencies_rules: BuildFileDependencyRules | None = None
-    parent_dirs = tuple(PurePath(directory.path).parents)
-    if parent_dirs:
-        maybe_parents = await MultiGet(
-            Get(OptionalAddressFamily, AddressFamilyDir(str(parent_dir)))
-            for parent_dir in parent_dirs
-        )
-        for maybe_parent in maybe_parents:
-            if maybe_parent.address_family is not None:
-                family = maybe_parent.address_family
-                defaults = family.defaults
-                dependents_rules = family.dependents_rules
-                dependencies_rules = family.dependencies_rules
-                break
-
-    defaults_parser_state = BuildFileDefaultsParserState.create(
-        directory.path, defaults, registered_target_types, union_membership
+    inherited = await Get(
+        InheritedBuildFileContext, InheritedBuildFileContextRequest(directory.path)
     )
-    build_file_dependency_rules_class = (
-        maybe_build_file_dependency_rules_implementation.build_file_dependency_rules_class
-    )
-    if build_file_dependency_rules_class is not None:
-        dependents_rules_parser_state = build_file_dependency_rules_class.create_parser_state(
-            directory.path,
-            dependents_rules,
-        )
-        dependencies_rules_parser_state = build_file_dependency_rules_class.create_parser_state(
-            directory.path,
-            dependencies_rules,
-        )
-    else:
-        dependents_rules_parser_state = None
-        dependencies_rules_parser_state = None
-
+    build_file_contents = [(fc.path, fc.content.decode()) for fc in digest_contents]
     all_env_vars = [
         await _extract_env_vars(
-            fc, prelude_symbols.referenced_env_vars, session_values[CompleteEnvironmentVars]
+            parser.compile(path, content),
+            prelude_symbols.referenced_env_vars,
+            session_values[CompleteEnvironmentVars],
         )
-        for fc in digest_contents
+        for path, content in build_file_contents
     ]
 
-    address_maps = [
-        AddressMap.parse(
-            fc.path,
-            fc.content.decode(),
-            parser,
-            prelude_symbols,
-            env_vars,
-            bootstrap_status.in_progress,
-            defaults_parser_state,
-            dependents_rules_parser_state,
-            dependencies_rules_parser_state,
-        )
-        for fc, env_vars in zip(digest_contents, all_env_vars)
-    ]
-
-    # Freeze defaults and dependency rules
-    frozen_defaults = defaults_parser_state.get_frozen_defaults()
-    frozen_dependents_rules = cast(
-        "BuildFileDependencyRules | None",
-        dependents_rules_parser_state
-        and dependents_rules_parser_state.get_frozen_dependency_rules(),
-    )
-    frozen_dependencies_rules = cast(
-        "BuildFileDependencyRules | None",
-        dependencies_rules_parser_state
-        and dependencies_rules_parser_state.get_frozen_dependency_rules(),
+    parse_request = BuildFileParseRequest(
+        directory=directory.path,
+        build_files=tuple(
+            (path, content, env_vars)
+            for (path, content), env_vars in zip(build_file_contents, all_env_vars)
+        ),
+        is_bootstrap=bootstrap_status.in_progress,
+        defaults=inherited.defaults,
+        dependents_rules=inherited.dependents_rules,
+        dependencies_rules=inherited.dependencies_rules,
+        dependency_rules_class=(
+            maybe_build_file_dependency_rules_implementation.build_file_dependency_rules_class
+        ),
     )
+    snapshots: BuildFileSnapshots | None = None
+    snapshot_key: str | None = None
+    parse_result: BuildFileParseResult | None = None
+    if build_file_options.snapshot_dir is not None and build_file_contents:
+        snapshots = BuildFileSnapshots.get(
+            build_file_options.snapshot_dir, parser, registered_target_types, union_membership
+        )
+        snapshot_key = snapshots.key(parse_request, prelude_symbols)
+        if snapshot_key is not None:
+            parse_result = snapshots.load(snapshot_key)
+    if parse_result is None:
+        parser_pool = BuildFileParserPool.for_parser(parser) if build_file_contents else None
+        if parser_pool is not None:
+            parse_result = parser_pool.parse(parse_request, prelude_symbols)
+        if parse_result is None:
+            parse_result = parse_build_files(
+                parse_request,
+                parser=parser,
+                prelude_symbols=prelude_symbols,
+                registered_target_types=registered_target_types,
+                union_membership=union_membership,
+            )
+        if snapshots is not None and snapshot_key is not None:
+            snapshots.store(snapshot_key, parse_result)
+    address_maps = parse_result.address_maps
+    frozen_defaults = parse_result.defaults
 
     # Process synthetic targets.
     for address_map in address_maps:
@@ -348,8 +326,8 @@ async def parse_address_family(
             spec_path=directory.path,
             address_maps=(*address_maps, *synthetic_address_maps),
             defaults=frozen_defaults,
-            dependents_rules=frozen_dependents_rules,
-            dependencies_rules=frozen_dependencies_rules,
+            dependents_rules=parse_result.dependents_rules,
+            dependencies_rules=parse_result.dependencies_rules,
         ),
     )
 
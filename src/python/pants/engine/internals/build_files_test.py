@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import logging
+import pickle
 import re
 from textwrap import dedent
 from typing import cast
@@ -16,14 +17,19 @@ from pants.core.target_types import GenericTarget
 from pants.engine.addresses import Address, AddressInput, BuildFileAddress
 from pants.engine.env_vars import CompleteEnvironmentVars, EnvironmentVars, EnvironmentVarsRequest
 from pants.engine.fs import DigestContents, FileContent, PathGlobs
+from pants.engine.internals import python_metrics
+from pants.engine.internals.build_file_workers import BuildFileParseResult, BuildFileParserPool
 from pants.engine.internals.build_files import (
     AddressFamilyDir,
     BuildFileOptions,
+    InheritedBuildFileContext,
+    InheritedBuildFileContextRequest,
     OptionalAddressFamily,
     evaluate_preludes,
+    inherited_build_file_context,
     parse_address_family,
 )
-from pants.engine.internals.defaults import ParametrizeDefault
+from pants.engine.internals.defaults import BuildFileDefaults, ParametrizeDefault
 from pants.engine.internals.dep_rules import MaybeBuildFileDependencyRulesImplementation
 from pants.engine.internals.mapper import AddressFamily
 from pants.engine.internals.parametrize import Parametrize
@@ -85,9 +91,9 @@ def test_parse_address_family_empty() -> None:
                 mock=lambda _: DigestContents([FileContent(path="/dev/null/BUILD", content=b"")]),
             ),
             MockGet(
-                output_type=OptionalAddressFamily,
-                input_types=(AddressFamilyDir,),
-                mock=lambda _: OptionalAddressFamily("/dev"),
+                output_type=InheritedBuildFileContext,
+                input_types=(InheritedBuildFileContextRequest,),
+                mock=lambda _: InheritedBuildFileContext(BuildFileDefaults({})),
             ),
             MockGet(
                 output_type=SyntheticAddressMaps,
@@ -108,6 +114,43 @@ def test_parse_address_family_empty() -> None:
     assert len(af.name_to_target_adaptors) == 0
 
 
+def test_inherited_build_file_context() -> None:
+    root_defaults = BuildFileDefaults({"target": FrozenDict({"tags": ("root",)})})
+    families = {
+        ".": OptionalAddressFamily(
+            ".",
+            AddressFamily.create(".", (), defaults=root_defaults),
+        ),
+        "a": OptionalAddressFamily("a"),
+    }
+
+    def run_rule(path: str) -> InheritedBuildFileContext:
+        return cast(
+            InheritedBuildFileContext,
+            run_rule_with_mocks(
+                inherited_build_file_context,
+                rule_args=[InheritedBuildFileContextRequest(path)],
+                mock_gets=[
+                    MockGet(
+                        output_type=OptionalAddressFamily,
+                        input_types=(AddressFamilyDir,),
+                        mock=lambda request: families[request.path],
+                    ),
+                    MockGet(
+                        output_type=InheritedBuildFileContext,
+                        input_types=(InheritedBuildFileContextRequest,),
+                        mock=lambda request: run_rule(request.path),
+                    ),
+                ],
+            ),
+        )
+
+    assert run_rule("").defaults == BuildFileDefaults({})
+    assert run_rule("a").defaults == root_defaults
+    # Directories without BUILD files are skipped over.
+    assert run_rule("a/b").defaults == root_defaults
+
+
 def run_prelude_parsing_rule(prelude_content: str) -> BuildFilePreludeSymbols:
     symbols = run_rule_with_mocks(
         evaluate_preludes,
@@ -448,6 +491,75 @@ def test_inherit_defaults(target_adaptor_rule_runner: RuleRunner) -> None:
     assert target_adaptor.kwargs["tags"] == ("root",)
 
 
+def test_parse_in_worker_processes() -> None:
+    rule_runner = RuleRunner(
+        rules=[QueryRule(TargetAdaptor, (TargetAdaptorRequest,))],
+        target_types=[MockTgt],
+        bootstrap_args=["--build-file-parse-workers=2"],
+    )
+    rule_runner.write_files(
+        {
+            "prelude.py": "def macro(**kwargs):\n    mock_tgt(**kwargs)\n",
+            "BUILD": """__defaults__(all=dict(tags=["root"]))""",
+            "helloworld/dir/BUILD": dedent(
+                """\
+                __defaults__({mock_tgt: dict(resolve="mock")}, extend=True)
+                macro(description=env("DESC"))
+                """
+            ),
+        }
+    )
+    rule_runner.set_options(
+        ["--build-file-prelude-globs=prelude.py"],
+        env={"DESC": "from env"},
+    )
+    baseline = python_metrics.snapshot()
+    target_adaptor = rule_runner.request(
+        TargetAdaptor,
+        [TargetAdaptorRequest(Address("helloworld/dir"), description_of_origin="tests")],
+    )
+    assert target_adaptor.kwargs["resolve"] == "mock"
+    assert target_adaptor.kwargs["tags"] == ("root",)
+    assert target_adaptor.kwargs["description"] == "from env"
+    # Both directories were parsed in a worker, rather than by the in-process fallback.
+    metrics = python_metrics.since(baseline)
+    assert metrics.get(BuildFileParserPool.PARSED) == 2
+    assert metrics.get(BuildFileParserPool.FAILED, 0) == 0
+
+
+def test_build_file_snapshots(target_adaptor_rule_runner: RuleRunner, tmp_path) -> None:
+    target_adaptor_rule_runner.write_files(
+        {
+            "BUILD": """__defaults__(all=dict(tags=["root"]))""",
+            "helloworld/dir/BUILD": """mock_tgt(description=env("DESC"))""",
+        }
+    )
+    target_adaptor_rule_runner.set_options(
+        ["--build-file-snapshots", f"--named-caches-dir={tmp_path}"],
+        env={"DESC": "from env"},
+    )
+    target_adaptor = target_adaptor_rule_runner.request(
+        TargetAdaptor,
+        [TargetAdaptorRequest(Address("helloworld/dir"), description_of_origin="tests")],
+    )
+    assert target_adaptor.kwargs["tags"] == ("root",)
+    assert target_adaptor.kwargs["description"] == "from env"
+
+    # One snapshot per directory with BUILD files, each of which holds what was parsed.
+    snapshots = sorted((tmp_path / "build_file_snapshots").glob("*/*"))
+    assert len(snapshots) == 2
+    parsed = []
+    for snapshot in snapshots:
+        result = pickle.loads(snapshot.read_bytes())
+        assert isinstance(result, BuildFileParseResult)
+        parsed.extend(
+            adaptor
+            for address_map in result.address_maps
+            for adaptor in address_map.name_to_target_adaptor.values()
+        )
+    assert parsed == [target_adaptor]
+
+
 def test_parametrize_defaults(target_adaptor_rule_runner: RuleRunner) -> None:
     target_adaptor_rule_runner.write_files(
         {
@@ -8,9 +8,11 @@ import itertools
 import json
 import logging
 import os.path
+import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import PurePath
-from typing import Iterable, Iterator, NamedTuple, Sequence, Type, cast
+from typing import Iterable, Iterator, Mapping, NamedTuple, Sequence, Type, cast
 
 from pants.base.deprecated import warn_or_error
 from pants.base.specs import AncestorGlobSpec, RawSpecsWithoutFileOwners, RecursiveGlobSpec
@@ -25,7 +27,7 @@ from pants.engine.addresses import (
 from pants.engine.collection import Collection
 from pants.engine.environment import ChosenLocalEnvironmentName, EnvironmentName
 from pants.engine.fs import EMPTY_SNAPSHOT, GlobMatchErrorBehavior, PathGlobs, Paths, Snapshot
-from pants.engine.internals import native_engine
+from pants.engine.internals import native_engine, python_metrics
 from pants.engine.internals.native_engine import AddressParseException
 from pants.engine.internals.parametrize import Parametrize, _TargetParametrization
 from pants.engine.internals.parametrize import (  # noqa: F401
@@ -93,6 +95,7 @@ from pants.option.global_options import (
     OwnersNotFoundBehavior,
     UnmatchedBuildFileGlobs,
 )
+from pants.source.filespec import Filespec
 from pants.util.docutil import bin_name, doc_url
 from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
@@ -492,10 +495,23 @@ async def find_all_unexpanded_targets_singleton() -> AllUnexpandedTargets:
 
 
 class CycleException(Exception):
-    def __init__(self, subject: Address, path: tuple[Address, ...]) -> None:
+    def __init__(
+        self,
+        subject: Address,
+        path: tuple[Address, ...],
+        other_cycles: tuple[tuple[Address, ...], ...] = (),
+    ) -> None:
         path_string = "\n".join((f"-> {a}" if a == subject else f"   {a}") for a in path)
+        other_cycles_string = (
+            "\n\nThe dependency graph also contained "
+            f"{pluralize(len(other_cycles), 'other cycle')}:"
+            + "".join(f"\n  {' -> '.join(str(a) for a in cycle)}" for cycle in other_cycles)
+            if other_cycles
+            else ""
+        )
         super().__init__(
-            f"The dependency graph contained a cycle:\n{path_string}\n\nTo fix this, first verify "
+            f"The dependency graph contained a cycle:\n{path_string}{other_cycles_string}\n\n"
+            "To fix this, first verify "
             "if your code has an actual import cycle. If it does, you likely need to re-architect "
             "your code to avoid the cycle.\n\nIf there is no cycle in your code, then you may need "
             "to use more granular targets. Split up the problematic targets into smaller targets "
@@ -507,55 +523,90 @@ class CycleException(Exception):
         )
         self.subject = subject
         self.path = path
+        self.other_cycles = other_cycles
 
 
-def _detect_cycles(
-    roots: tuple[Address, ...], dependency_mapping: dict[Address, tuple[Address, ...]]
-) -> None:
-    path_stack: OrderedSet[Address] = OrderedSet()
-    visited: set[Address] = set()
-
-    def maybe_report_cycle(address: Address) -> None:
-        # NB: File-level dependencies are cycle tolerant.
-        if address.is_file_target or address not in path_stack:
-            return
-
-        # The path of the cycle is shorter than the entire path to the cycle: if the suffix of
-        # the path representing the cycle contains a file dep, it is ignored.
-        in_cycle = False
-        for path_address in path_stack:
-            if in_cycle and path_address.is_file_target:
-                # There is a file address inside the cycle: do not report it.
-                return
-            elif in_cycle:
-                # Not a file address.
+def _cycle_from(
+    address: Address,
+    component: set[Address],
+    dependency_mapping: Mapping[Address, tuple[Address, ...]],
+) -> tuple[Address, ...]:
+    """Find a shortest cycle from the address back to itself within its component."""
+    parents: dict[Address, Address] = {}
+    queue = deque([address])
+    while queue:
+        current = queue.popleft()
+        for dep in dependency_mapping[current]:
+            if dep not in component:
                 continue
-            else:
-                # We're entering the suffix of the path that contains the cycle if we've reached
-                # the address in question.
-                in_cycle = path_address == address
-        # If we did not break out early, it's because there were no file addresses in the cycle.
-        raise CycleException(address, (*path_stack, address))
+            if dep == address:
+                cycle = [current]
+                while cycle[-1] != address:
+                    cycle.append(parents[cycle[-1]])
+                return (*reversed(cycle), address)
+            if dep not in parents:
+                parents[dep] = current
+                queue.append(dep)
+    raise AssertionError(f"{address} was not part of a cycle in {component}.")
 
-    def visit(address: Address):
-        if address in visited:
-            maybe_report_cycle(address)
-            return
-        path_stack.add(address)
-        visited.add(address)
 
-        for dep_address in dependency_mapping[address]:
-            visit(dep_address)
+def _detect_cycles(
+    roots: tuple[Address, ...], dependency_mapping: Mapping[Address, tuple[Address, ...]]
+) -> None:
+    """Raise a CycleException if the graph contains any cycle which does not include a file-level
+    target.
 
-        path_stack.remove(address)
+    File-level dependencies are cycle tolerant, so only the subgraph of non-file-level targets is
+    checked, using a (linear time) strongly connected components pass.
+    """
+    target_level_mapping = [
+        (address, tuple(d for d in deps if not d.is_file_target))
+        for address, deps in dependency_mapping.items()
+        if not address.is_file_target
+    ]
+    cyclic_components = [
+        set(component)
+        for component in native_engine.strongly_connected_components(target_level_mapping)
+        if len(component) > 1 or component[0] in dependency_mapping[component[0]]
+    ]
+    if not cyclic_components:
+        return
 
+    # Report the first cycle reachable from the roots, via a shortest path from a root.
+    component_by_address = {a: component for component in cyclic_components for a in component}
+    parents: dict[Address, Address | None] = {}
+    queue: deque[Address] = deque()
     for root in roots:
-        visit(root)
-        if path_stack:
-            raise AssertionError(
-                f"The stack of visited nodes should have been empty at the end of recursion, "
-                f"but it still contained: {path_stack}"
-            )
+        if root not in parents:
+            parents[root] = None
+            queue.append(root)
+    subject: Address | None = None
+    while queue:
+        address = queue.popleft()
+        if address in component_by_address:
+            subject = address
+            break
+        for dep in dependency_mapping[address]:
+            if dep not in parents:
+                parents[dep] = address
+                queue.append(dep)
+    if subject is None:
+        raise AssertionError(f"None of the cycles in {cyclic_components} were reachable.")
+
+    path_to_subject = [subject]
+    while (parent := parents[path_to_subject[-1]]) is not None:
+        path_to_subject.append(parent)
+    component = component_by_address[subject]
+    cycle = _cycle_from(subject, component, dependency_mapping)
+    raise CycleException(
+        subject,
+        (*reversed(path_to_subject[1:]), *cycle),
+        other_cycles=tuple(
+            _cycle_from(min(other), other, dependency_mapping)
+            for other in cyclic_components
+            if other is not component
+        ),
+    )
 
 
 @dataclass(frozen=True)
@@ -773,6 +824,49 @@ def _log_or_raise_unmatched_owners(
         raise ResolveError(msg)
 
 
+_OWNERS_CANDIDATE_TARGETS = "find_owners_candidate_targets"
+_OWNERS_MATCHING_TIME_MICROS = "find_owners_matching_time_micros"
+python_metrics.register_counters(_OWNERS_CANDIDATE_TARGETS, _OWNERS_MATCHING_TIME_MICROS)
+
+_GLOB_CHARS = frozenset("*?[{")
+
+
+class _FilesByDirectory:
+    """An index of file paths by each of their ancestor directories.
+
+    Used to only match the globs of a target against the files which could possibly match them,
+    rather than against all of the files that owners were requested for.
+    """
+
+    def __init__(self, files: Iterable[str]) -> None:
+        self._files_by_dir: dict[str, list[str]] = {}
+        for f in files:
+            directory = os.path.dirname(f)
+            while True:
+                self._files_by_dir.setdefault(directory, []).append(f)
+                if not directory:
+                    break
+                directory = os.path.dirname(directory)
+
+    @staticmethod
+    def _literal_dir(glob: str) -> str:
+        """The longest directory prefix of the glob which does not contain wildcards."""
+        components = glob.split("/")[:-1]
+        for i, component in enumerate(components):
+            if _GLOB_CHARS.intersection(component):
+                components = components[:i]
+                break
+        literal_dir = os.path.normpath("/".join(components))
+        return "" if literal_dir == "." else literal_dir
+
+    def files_matching(self, filespec: Filespec) -> list[str]:
+        """The files which could match the `includes` of the filespec."""
+        dirs = {self._literal_dir(glob) for glob in filespec["includes"]}
+        if len(dirs) == 1:
+            return self._files_by_dir.get(dirs.pop(), [])
+        return list({f: None for d in dirs for f in self._files_by_dir.get(d, ())})
+
+
 @dataclass(frozen=True)
 class OwnersRequest:
     """A request for the owners of a set of file paths.
@@ -863,22 +957,25 @@ async def find_owners(
             for tgt in candidate_tgts
         )
 
+        index = _FilesByDirectory(sources_set)
+        start = time.perf_counter()
         for candidate_tgt, bfa in zip(candidate_tgts, build_file_addresses):
-            matching_files = set(
-                candidate_tgt.get(SourcesField).filespec_matcher.matches(list(sources_set))
-            )
             # Also consider secondary ownership, meaning it's not a `SourcesField` field with
             # primary ownership, but the target still should match the file. We can't use
             # `tgt.get()` because this is a mixin, and there technically may be >1 field.
-            secondary_owner_fields = tuple(
-                field
-                for field in candidate_tgt.field_values.values()
-                if isinstance(field, SecondaryOwnerMixin)
+            owner_fields = (
+                candidate_tgt.get(SourcesField),
+                *(
+                    field
+                    for field in candidate_tgt.field_values.values()
+                    if isinstance(field, SecondaryOwnerMixin)
+                ),
             )
-            for secondary_owner_field in secondary_owner_fields:
-                matching_files.update(
-                    *secondary_owner_field.filespec_matcher.matches(list(sources_set))
-                )
+            matching_files: set[str] = set()
+            for owner_field in owner_fields:
+                candidate_files = index.files_matching(owner_field.filespec)
+                if candidate_files:
+                    matching_files.update(owner_field.filespec_matcher.matches(candidate_files))
             if not matching_files and not (
                 owners_request.match_if_owning_build_file_included_in_sources
                 and bfa.rel_path in sources_set
@@ -887,6 +984,10 @@ async def find_owners(
 
             unmatched_sources -= matching_files
             matching_addresses.add(candidate_tgt.address)
+        python_metrics.increment_counter(
+            _OWNERS_MATCHING_TIME_MICROS, int((time.perf_counter() - start) * 1_000_000)
+        )
+        python_metrics.increment_counter(_OWNERS_CANDIDATE_TARGETS, len(candidate_tgts))
 
     if (
         unmatched_sources
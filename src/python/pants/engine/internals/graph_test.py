@@ -528,6 +528,42 @@ def test_dep_cycle_indirect(transitive_targets_rule_runner: RuleRunner) -> None:
     )
 
 
+def test_dep_cycles_reported_together(transitive_targets_rule_runner: RuleRunner) -> None:
+    transitive_targets_rule_runner.write_files(
+        {
+            "BUILD": dedent(
+                """\
+                target(name='root', dependencies=[':a1', ':b1'])
+                target(name='a1', dependencies=[':a2'])
+                target(name='a2', dependencies=[':a1'])
+                target(name='b1', dependencies=[':b2'])
+                target(name='b2', dependencies=[':b1'])
+                """
+            )
+        }
+    )
+    assert_failed_cycle(
+        transitive_targets_rule_runner,
+        root_target_name="root",
+        subject_target_name="a1",
+        path_target_names=("root", "a1", "a2", "a1"),
+    )
+    with pytest.raises(ExecutionError) as e:
+        transitive_targets_rule_runner.request(
+            TransitiveTargets, [TransitiveTargetsRequest([Address("", target_name="root")])]
+        )
+    (cycle_exception,) = e.value.wrapped_exceptions
+    assert isinstance(cycle_exception, CycleException)
+    assert cycle_exception.other_cycles == (
+        (
+            Address("", target_name="b1"),
+            Address("", target_name="b2"),
+            Address("", target_name="b1"),
+        ),
+    )
+    assert "also contained 1 other cycle" in str(cycle_exception)
+
+
 def test_dep_no_cycle_indirect(transitive_targets_rule_runner: RuleRunner) -> None:
     transitive_targets_rule_runner.write_files(
         {
@@ -863,6 +899,40 @@ def test_owners_build_file(owners_rule_runner: RuleRunner) -> None:
     )
 
 
+def test_owners_in_nested_directories(owners_rule_runner: RuleRunner) -> None:
+    """Targets own files in subdirectories, but never in sibling or parent directories."""
+    owners_rule_runner.write_files(
+        {
+            "demo/f.txt": "",
+            "demo/sub/f.txt": "",
+            "demo/sub/deeper/f.txt": "",
+            "other/f.txt": "",
+            "demo/BUILD": "target(name='recursive', sources=['**/*.txt'])",
+            "demo/sub/BUILD": dedent(
+                """\
+                target(name='shallow', sources=['*.txt'])
+                target(name='nested', sources=['deeper/f.txt'])
+                """
+            ),
+            "other/BUILD": "target(sources=['*.txt'])",
+        }
+    )
+    assert_owners(
+        owners_rule_runner,
+        ["demo/sub/f.txt", "demo/sub/deeper/f.txt"],
+        expected={
+            Address("demo", target_name="recursive"),
+            Address("demo/sub", target_name="shallow"),
+            Address("demo/sub", target_name="nested"),
+        },
+    )
+    assert_owners(
+        owners_rule_runner,
+        ["demo/f.txt", "other/f.txt"],
+        expected={Address("demo", target_name="recursive"), Address("other")},
+    )
+
+
 # -----------------------------------------------------------------------------------------------
 # Test file-level target generation and parameterization.
 # -----------------------------------------------------------------------------------------------
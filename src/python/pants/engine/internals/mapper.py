@@ -16,7 +16,7 @@ from pants.engine.internals.dep_rules import (
     BuildFileDependencyRules,
     BuildFileDependencyRulesParserState,
 )
-from pants.engine.internals.parser import BuildFilePreludeSymbols, Parser
+from pants.engine.internals.parser import BuildFilePreludeSymbols, CompiledBuildFile, Parser
 from pants.engine.internals.target_adaptor import TargetAdaptor
 from pants.engine.target import RegisteredTargetTypes, Tags, Target
 from pants.util.filtering import TargetFilter, and_filters, create_filters
@@ -49,6 +49,7 @@ class AddressMap:
         defaults: BuildFileDefaultsParserState,
         dependents_rules: BuildFileDependencyRulesParserState | None,
         dependencies_rules: BuildFileDependencyRulesParserState | None,
+        compiled: CompiledBuildFile | None = None,
     ) -> AddressMap:
         """Parses a source for targets.
 
@@ -65,6 +66,7 @@ class AddressMap:
                 defaults,
                 dependents_rules,
                 dependencies_rules,
+                compiled=compiled,
             )
         except Exception as e:
             raise MappingError(f"Failed to parse ./{filepath}:\n{type(e).__name__}: {e}")
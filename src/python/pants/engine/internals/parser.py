@@ -3,14 +3,21 @@
 
 from __future__ import annotations
 
+import ast
+import builtins
+import hashlib
+import importlib.util
 import inspect
+import logging
+import marshal
+import os
 import re
 import threading
-import tokenize
+import time
 from dataclasses import dataclass
 from difflib import get_close_matches
-from io import StringIO
 from pathlib import PurePath
+from types import CodeType
 from typing import Any, Callable, Iterable, Mapping, TypeVar
 
 from pants.base.deprecated import warn_or_error
@@ -18,16 +25,20 @@ from pants.base.exceptions import MappingError
 from pants.base.parse_context import ParseContext
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.engine.env_vars import EnvironmentVars
+from pants.engine.internals import python_metrics
 from pants.engine.internals.defaults import BuildFileDefaultsParserState, SetDefaultsT
 from pants.engine.internals.dep_rules import BuildFileDependencyRulesParserState
 from pants.engine.internals.target_adaptor import TargetAdaptor
 from pants.engine.target import Field, ImmutableValue, RegisteredTargetTypes
 from pants.engine.unions import UnionMembership
+from pants.util.dirutil import safe_concurrent_creation
 from pants.util.docutil import doc_url
 from pants.util.frozendict import FrozenDict
 from pants.util.memo import memoized_property
 from pants.util.strutil import softwrap
 
+logger = logging.getLogger(__name__)
+
 T = TypeVar("T")
 
 
@@ -35,17 +46,29 @@ T = TypeVar("T")
 class BuildFilePreludeSymbols:
     info: FrozenDict[str, BuildFileSymbolInfo]
     referenced_env_vars: tuple[str, ...]
+    # The (path, content) of the prelude files that the symbols were evaluated from, which allows
+    # the symbols to be re-created in BUILD file parsing worker processes.
+    prelude_files: tuple[tuple[str, str], ...] = ()
 
     @memoized_property
     def symbols(self) -> FrozenDict[str, Any]:
         return FrozenDict({name: symbol.value for name, symbol in self.info.items()})
 
     @classmethod
-    def create(cls, ns: Mapping[str, Any], env_vars: Iterable[str]) -> BuildFilePreludeSymbols:
+    def create(
+        cls,
+        ns: Mapping[str, Any],
+        env_vars: Iterable[str],
+        prelude_files: Iterable[tuple[str, str]] = (),
+    ) -> BuildFilePreludeSymbols:
         info = {}
         for name, symb in ns.items():
             info[name] = BuildFileSymbolInfo(name, symb)
-        return cls(info=FrozenDict(info), referenced_env_vars=tuple(sorted(env_vars)))
+        return cls(
+            info=FrozenDict(info),
+            referenced_env_vars=tuple(sorted(env_vars)),
+            prelude_files=tuple(prelude_files),
+        )
 
 
 @dataclass(frozen=True)
@@ -164,6 +187,245 @@ class ParseState(threading.local):
             self._dependencies_rules.set_dependency_rules(self.filepath(), *args, **kwargs)
 
 
+class BUILDFileAnalyzer(ast.NodeVisitor):
+    """Statically extracts everything that we need to know about a BUILD file in a single pass.
+
+    This collects the environment variables referenced via `env()`, the first import statement (if
+    any), and all of the names which are loaded by the file.
+    """
+
+    def __init__(self, filename: str):
+        super().__init__()
+        self.env_vars: set[str] = set()
+        self.import_lineno: int | None = None
+        self.referenced_names: set[str] = set()
+        self.warnings: list[str] = []
+        self.filename = filename
+
+    def visit_Name(self, node: ast.Name):
+        if isinstance(node.ctx, ast.Load):
+            self.referenced_names.add(node.id)
+
+    def visit_Import(self, node: ast.Import):
+        self._record_import(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        self._record_import(node)
+
+    def _record_import(self, node: ast.stmt) -> None:
+        if self.import_lineno is None or node.lineno < self.import_lineno:
+            self.import_lineno = node.lineno
+
+    def visit_Call(self, node: ast.Call):
+        self.visit(node.func)
+        args = node.args
+        if isinstance(node.func, ast.Name) and node.func.id == "env" and args:
+            # Only first arg may be checked as env name
+            value = args[0].value if isinstance(args[0], ast.Constant) else None
+            if value:
+                self.env_vars.add(value)
+                args = args[1:]
+            else:
+                self.warnings.append(
+                    f"{self.filename}:{args[0].lineno}: Only constant string values as variable "
+                    "name to `env()` is currently supported. This `env()` call will always result "
+                    "in the default value only."
+                )
+
+        for arg in args:
+            self.visit(arg)
+        for kwarg in node.keywords:
+            self.visit(kwarg)
+
+
+@dataclass(frozen=True)
+class CompiledBuildFile:
+    """A compiled BUILD file, along with everything else that we statically extract from it."""
+
+    code: CodeType
+    # The names of the environment variables referenced via `env()`.
+    env_vars: tuple[str, ...]
+    # The line of the first import statement in the file, if any.
+    import_lineno: int | None
+    # All names loaded by the file, which may include names which the file itself defines.
+    referenced_names: tuple[str, ...] = ()
+    # Warnings to log each time the file is parsed.
+    warnings: tuple[str, ...] = ()
+
+
+class BuildFileCodeCache:
+    """A cache of compiled BUILD files, keyed by a hash of their path and content.
+
+    Entries are held in memory for the lifetime of the process (i.e. across pantsd runs), and are
+    optionally persisted (as `marshal`ed tuples) below `cache_dir`, so that a cold start does not
+    need to parse, compile and analyze BUILD files which have not changed.
+
+    The persisted entries are capped at `max_size` bytes: when the cache is created, the entries
+    which were least recently used (i.e. stored or loaded) are removed until the rest fit. Since
+    measuring the entries requires walking all of them, this is done at most once per
+    `_PRUNE_INTERVAL_SECONDS` (across processes), rather than on every start.
+
+    The hit and miss counters only account for the persistent cache: i.e. a miss is a BUILD file
+    which needed to be compiled.
+    """
+
+    HITS = "build_file_code_cache_hits"
+    MISSES = "build_file_code_cache_misses"
+
+    # Bump when the content of `CompiledBuildFile` changes, to invalidate persisted entries.
+    _FORMAT_VERSION = b"2"
+
+    # Bounds memory usage for a very long-lived pantsd.
+    _MAX_IN_MEMORY_ENTRIES = 200_000
+
+    _PRUNE_INTERVAL_SECONDS = 60 * 60
+    # Touched when the persisted entries are pruned: its modification time records when they were
+    # last pruned.
+    _PRUNE_MARKER_FILENAME = ".pruned"
+
+    def __init__(self, cache_dir: str | None = None, max_size: int | None = None) -> None:
+        self._cache_dir = cache_dir
+        self._entries: dict[str, CompiledBuildFile] = {}
+        self._lock = threading.Lock()
+        python_metrics.register_counters(self.HITS, self.MISSES)
+        if cache_dir is not None and max_size is not None:
+            self._prune(cache_dir, max_size)
+
+    @classmethod
+    def _prune(cls, cache_dir: str, max_size: int) -> None:
+        marker_path = os.path.join(cache_dir, cls._PRUNE_MARKER_FILENAME)
+        try:
+            if time.time() - os.stat(marker_path).st_mtime < cls._PRUNE_INTERVAL_SECONDS:
+                return
+        except FileNotFoundError:
+            if not os.path.isdir(cache_dir):
+                return
+        except OSError:
+            return
+        # NB: Concurrent processes may both prune the entries, which is harmless.
+        try:
+            with open(marker_path, "a"):
+                pass
+            os.utime(marker_path)
+        except OSError:
+            return
+
+        entries = []
+        for root, _, files in os.walk(cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if path == marker_path:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= max_size:
+                break
+            # A concurrent reader of a removed entry will fail to open it, and recompile.
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total_size -= size
+
+    @staticmethod
+    def _key(filepath: str, build_file_content: str) -> str:
+        hasher = hashlib.sha256()
+        # Code objects may only be loaded by the interpreter version which created them.
+        hasher.update(importlib.util.MAGIC_NUMBER)
+        hasher.update(BuildFileCodeCache._FORMAT_VERSION)
+        hasher.update(filepath.encode())
+        hasher.update(b"\0")
+        hasher.update(build_file_content.encode())
+        return hasher.hexdigest()
+
+    def get(self, filepath: str, build_file_content: str) -> CompiledBuildFile:
+        key = self._key(filepath, build_file_content)
+        with self._lock:
+            compiled = self._entries.get(key)
+        if compiled is not None:
+            return compiled
+        compiled = self._load(key)
+        if compiled is None:
+            python_metrics.increment_counter(self.MISSES)
+            compiled = self._compile(filepath, build_file_content)
+            self._store(key, compiled)
+        else:
+            python_metrics.increment_counter(self.HITS)
+        with self._lock:
+            if len(self._entries) >= self._MAX_IN_MEMORY_ENTRIES:
+                self._entries.clear()
+            self._entries[key] = compiled
+        return compiled
+
+    @staticmethod
+    def _compile(filepath: str, build_file_content: str) -> CompiledBuildFile:
+        tree = ast.parse(build_file_content, filepath)
+        analyzer = BUILDFileAnalyzer(filepath)
+        analyzer.visit(tree)
+        return CompiledBuildFile(
+            code=compile(tree, filepath, "exec", dont_inherit=True),
+            env_vars=tuple(sorted(analyzer.env_vars)),
+            import_lineno=analyzer.import_lineno,
+            referenced_names=tuple(sorted(analyzer.referenced_names)),
+            warnings=tuple(analyzer.warnings),
+        )
+
+    def _path(self, key: str) -> str | None:
+        if self._cache_dir is None:
+            return None
+        return os.path.join(self._cache_dir, key[:2], key)
+
+    def _load(self, key: str) -> CompiledBuildFile | None:
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                code, env_vars, import_lineno, referenced_names, warnings = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            logger.debug(f"Ignoring invalid BUILD file cache entry {path}: {e}")
+            return None
+        try:
+            # Mark the entry as recently used, for `_prune`.
+            os.utime(path)
+        except OSError:
+            pass
+        return CompiledBuildFile(
+            code=code,
+            env_vars=env_vars,
+            import_lineno=import_lineno,
+            referenced_names=referenced_names,
+            warnings=warnings,
+        )
+
+    def _store(self, key: str, compiled: CompiledBuildFile) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            with safe_concurrent_creation(path) as tmp_path:
+                with open(tmp_path, "wb") as f:
+                    marshal.dump(
+                        (
+                            compiled.code,
+                            compiled.env_vars,
+                            compiled.import_lineno,
+                            compiled.referenced_names,
+                            compiled.warnings,
+                        ),
+                        f,
+                    )
+        except OSError as e:
+            # The persistent cache is only an optimization.
+            logger.debug(f"Failed to write BUILD file cache entry {path}: {e}")
+
+
 class RegistrarField:
     __slots__ = ("_field_type", "_default")
 
@@ -185,6 +447,7 @@ class Parser:
         union_membership: UnionMembership,
         object_aliases: BuildFileAliases,
         ignore_unrecognized_symbols: bool,
+        code_cache: BuildFileCodeCache | None = None,
     ) -> None:
         self._symbols, self._parse_state = self._generate_symbols(
             build_root,
@@ -193,6 +456,7 @@ class Parser:
             union_membership,
         )
         self.ignore_unrecognized_symbols = ignore_unrecognized_symbols
+        self._code_cache = code_cache or BuildFileCodeCache()
 
     @staticmethod
     def _generate_symbols(
@@ -290,6 +554,41 @@ class Parser:
     def builtin_symbols(self) -> FrozenDict[str, Any]:
         return self._symbols
 
+    def compile(self, filepath: str, build_file_content: str) -> CompiledBuildFile:
+        """Compile a BUILD file (or prelude), consulting the code cache."""
+        return self._code_cache.get(filepath, build_file_content)
+
+    def evaluate_preludes(
+        self, prelude_files: Iterable[tuple[str, str]]
+    ) -> BuildFilePreludeSymbols:
+        """Evaluate the given (path, content) prelude files, in order."""
+        prelude_files = tuple(prelude_files)
+        globals: dict[str, Any] = {
+            **{name: getattr(builtins, name) for name in dir(builtins) if name.endswith("Error")},
+            # Ensure the globals for each prelude includes the builtin symbols (E.g. `python_sources`)
+            **self._symbols,
+        }
+        locals: dict[str, Any] = {}
+        env_vars: set[str] = set()
+        for path, content in prelude_files:
+            try:
+                compiled = self.compile(path, content)
+                exec(compiled.code, globals, locals)
+            except Exception as e:
+                raise Exception(f"Error parsing prelude file {path}: {e}")
+            error_on_imports(content, path, compiled)
+            for warning in compiled.warnings:
+                logger.warning(warning)
+            env_vars.update(compiled.env_vars)
+        # __builtins__ is a dict, so isn't hashable, and can't be put in a FrozenDict.
+        # Fortunately, we don't care about it - preludes should not be able to override builtins, so we just pop it out.
+        # TODO: Give a nice error message if a prelude tries to set a expose a non-hashable value.
+        locals.pop("__builtins__", None)
+        # Ensure preludes can reference each other by populating the shared globals object with references
+        # to the other symbols
+        globals.update(locals)
+        return BuildFilePreludeSymbols.create(locals, env_vars, prelude_files)
+
     def parse(
         self,
         filepath: str,
@@ -300,7 +599,15 @@ class Parser:
         defaults: BuildFileDefaultsParserState,
         dependents_rules: BuildFileDependencyRulesParserState | None,
         dependencies_rules: BuildFileDependencyRulesParserState | None,
+        compiled: CompiledBuildFile | None = None,
     ) -> list[TargetAdaptor]:
+        """Parse the given BUILD file content.
+
+        If the caller has already compiled the content using `Parser.compile`, it should pass the
+        result as `compiled`.
+        """
+        if compiled is None:
+            compiled = self.compile(filepath, build_file_content)
         self._parse_state.reset(
             filepath=filepath,
             is_bootstrap=is_bootstrap,
@@ -316,10 +623,16 @@ class Parser:
         }
 
         if self.ignore_unrecognized_symbols:
+            # Bind all unrecognized symbols up front, so that the file is executed only once.
+            for name in compiled.referenced_names:
+                if name not in global_symbols and not hasattr(builtins, name):
+                    global_symbols[name] = _unrecognized_symbol_func
+            # Names may still be looked up dynamically, e.g. by code compiled elsewhere, so retry on
+            # any remaining unrecognized symbols.
             defined_symbols = set()
             while True:
                 try:
-                    exec(build_file_content, global_symbols)
+                    exec(compiled.code, global_symbols)
                 except NameError as e:
                     bad_symbol = _extract_symbol_from_name_error(e)
                     if bad_symbol in defined_symbols:
@@ -341,11 +654,11 @@ class Parser:
                     continue
                 break
 
-            error_on_imports(build_file_content, filepath)
+            error_on_imports(build_file_content, filepath, compiled)
             return self._parse_state.parsed_targets()
 
         try:
-            exec(build_file_content, global_symbols)
+            exec(compiled.code, global_symbols)
         except NameError as e:
             valid_symbols = sorted(s for s in global_symbols.keys() if s != "__builtins__")
             original = e.args[0].capitalize()
@@ -369,22 +682,23 @@ class Parser:
                 f"{original}.\n\n{help_str}\n\nAll registered symbols: {valid_symbols}"
             )
 
-        error_on_imports(build_file_content, filepath)
+        error_on_imports(build_file_content, filepath, compiled)
         return self._parse_state.parsed_targets()
 
 
-def error_on_imports(build_file_content: str, filepath: str) -> None:
+def error_on_imports(
+    build_file_content: str, filepath: str, compiled: CompiledBuildFile | None = None
+) -> None:
     # This is poor sandboxing; there are many ways to get around this. But it's sufficient to tell
     # users who aren't malicious that they're doing something wrong, and it has a low performance
     # overhead.
-    if "import" not in build_file_content:
-        return
-    io_wrapped_python = StringIO(build_file_content)
-    for token in tokenize.generate_tokens(io_wrapped_python.readline):
-        token_str = token[1]
-        lineno, _ = token[2]
-        if token_str != "import":
-            continue
+    if compiled is None:
+        analyzer = BUILDFileAnalyzer(filepath)
+        analyzer.visit(ast.parse(build_file_content, filepath))
+        lineno = analyzer.import_lineno
+    else:
+        lineno = compiled.import_lineno
+    if lineno is not None:
         raise ParseError(
             f"Import used in {filepath} at line {lineno}. Import statements are banned in "
             "BUILD files and macros (that act like a normal BUILD file) because they can easily "
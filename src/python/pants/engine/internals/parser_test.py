@@ -3,13 +3,19 @@
 
 from __future__ import annotations
 
+import os
+from pathlib import Path
+from textwrap import dedent
+
 import pytest
 
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.core.target_types import GenericTarget
 from pants.engine.env_vars import EnvironmentVars
+from pants.engine.internals import python_metrics
 from pants.engine.internals.defaults import BuildFileDefaults, BuildFileDefaultsParserState
 from pants.engine.internals.parser import (
+    BuildFileCodeCache,
     BuildFilePreludeSymbols,
     ParseError,
     Parser,
@@ -125,3 +131,122 @@ def test_unrecognized_symbol(defaults_parser_state: BuildFileDefaultsParserState
 @pytest.mark.parametrize("symbol", ["a", "bad", "BAD", "a___b_c", "a231", "áç"])
 def test_extract_symbol_from_name_error(symbol: str) -> None:
     assert _extract_symbol_from_name_error(NameError(f"name '{symbol}' is not defined")) == symbol
+
+
+def test_build_file_code_cache(tmp_path) -> None:
+    def metrics_since(baseline: dict[str, int]) -> tuple[int, int]:
+        delta = python_metrics.since(baseline)
+        return delta.get(BuildFileCodeCache.HITS, 0), delta.get(BuildFileCodeCache.MISSES, 0)
+
+    content = "tgt(name=env('NAME'))\n"
+    baseline = python_metrics.snapshot()
+    cache = BuildFileCodeCache(str(tmp_path))
+    compiled = cache.get("dir/BUILD", content)
+    assert compiled.env_vars == ("NAME",)
+    assert compiled.import_lineno is None
+    assert cache.get("dir/BUILD", content) is compiled
+    assert metrics_since(baseline) == (0, 1)
+
+    # A new cache instance (e.g. after a restart) loads the persisted entry rather than compiling.
+    baseline = python_metrics.snapshot()
+    reloaded = BuildFileCodeCache(str(tmp_path)).get("dir/BUILD", content)
+    assert reloaded == compiled
+    assert metrics_since(baseline) == (1, 0)
+
+    # The path is part of the key.
+    baseline = python_metrics.snapshot()
+    assert cache.get("other/BUILD", content).code.co_filename == "other/BUILD"
+    assert cache.get("dir/BUILD", "import os\n").import_lineno == 1
+    assert metrics_since(baseline) == (0, 2)
+
+
+def test_build_file_code_cache_max_size(tmp_path) -> None:
+    def persisted_entries() -> list[Path]:
+        return sorted(
+            path
+            for path in tmp_path.rglob("*")
+            if path.is_file() and path.name != BuildFileCodeCache._PRUNE_MARKER_FILENAME
+        )
+
+    cache = BuildFileCodeCache(str(tmp_path))
+    for i in range(4):
+        cache.get(f"dir{i}/BUILD", "tgt()\n")
+    entries = persisted_entries()
+    assert len(entries) == 4
+    for mtime, path in enumerate(entries):
+        os.utime(path, (mtime, mtime))
+    entry_size = entries[0].stat().st_size
+
+    # The least recently used entries are removed until the rest fit.
+    BuildFileCodeCache(str(tmp_path), max_size=2 * entry_size)
+    assert persisted_entries() == entries[2:]
+
+    # The entries are pruned at most once per interval.
+    BuildFileCodeCache(str(tmp_path), max_size=0)
+    assert persisted_entries() == entries[2:]
+
+    # Loading an entry marks it as recently used.
+    baseline = python_metrics.snapshot()
+    used = BuildFileCodeCache(str(tmp_path))
+    for i in range(4):
+        used.get(f"dir{i}/BUILD", "tgt()\n")
+    assert python_metrics.since(baseline).get(BuildFileCodeCache.HITS, 0) == 2
+    assert all(path.stat().st_mtime > 3 for path in entries[2:])
+
+    # Without a cache directory, nothing is persisted.
+    BuildFileCodeCache(None, max_size=0).get("dir/BUILD", "tgt(name='other')\n")
+    assert len(persisted_entries()) == 4
+
+    # Once the interval has passed, the entries are pruned again.
+    marker = tmp_path / BuildFileCodeCache._PRUNE_MARKER_FILENAME
+    os.utime(marker, (0, 0))
+    BuildFileCodeCache(str(tmp_path), max_size=0)
+    assert persisted_entries() == []
+    assert marker.stat().st_mtime > 0
+
+
+def test_unrecognized_symbols_evaluated_once(
+    defaults_parser_state: BuildFileDefaultsParserState,
+) -> None:
+    calls = []
+    parser = Parser(
+        build_root="",
+        registered_target_types=RegisteredTargetTypes({"tgt": GenericTarget}),
+        union_membership=UnionMembership({}),
+        object_aliases=BuildFileAliases(objects={"record_call": lambda: calls.append(1)}),
+        ignore_unrecognized_symbols=True,
+    )
+    targets = parser.parse(
+        "dir/BUILD",
+        "record_call()\nfake1()\ntgt(name='t', tags=[fake2])\nfake3(x=fake4)\n",
+        BuildFilePreludeSymbols(FrozenDict(), ()),
+        EnvironmentVars({}),
+        True,
+        defaults_parser_state,
+        dependents_rules=None,
+        dependencies_rules=None,
+    )
+    assert len(calls) == 1
+    assert [target.name for target in targets] == ["t"]
+
+
+def test_build_file_analyzer() -> None:
+    compiled = BuildFileCodeCache().get(
+        "dir/BUILD",
+        dedent(
+            """\
+            NAME = "VAR"
+            def macro(**kwargs):
+                tgt(description=env("DESC", default=default_desc()), **kwargs)
+            macro(tags=[env(NAME)])
+            from os import path
+            """
+        ),
+    )
+    assert compiled.env_vars == ("DESC",)
+    assert compiled.import_lineno == 5
+    assert compiled.referenced_names == ("NAME", "default_desc", "env", "kwargs", "macro", "tgt")
+    assert compiled.warnings == (
+        "dir/BUILD:4: Only constant string values as variable name to `env()` is currently "
+        "supported. This `env()` call will always result in the default value only.",
+    )
@@ -0,0 +1,50 @@
+# Copyright 2023 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+"""Counters for work performed by Python code running inside the engine.
+
+The engine's own counters are maintained natively, and are not extensible from Python. Counters
+registered here are merged into `SchedulerSession.get_metrics()`, so that they are reported
+alongside the native counters (for example, by `--stats-log`).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+
+_lock = threading.Lock()
+_counters: Counter[str] = Counter()
+_counter_names: set[str] = set()
+
+
+def register_counters(*names: str) -> None:
+    """Declare counter names, so that they are reported even when they are never incremented."""
+    with _lock:
+        _counter_names.update(names)
+
+
+def increment_counter(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counter_names.add(name)
+        _counters[name] += amount
+
+
+def counter_names() -> tuple[str, ...]:
+    with _lock:
+        return tuple(sorted(_counter_names))
+
+
+def snapshot() -> dict[str, int]:
+    """Return the current value of all counters, which are cumulative for the whole process."""
+    with _lock:
+        return dict(_counters)
+
+
+def since(baseline: dict[str, int]) -> dict[str, int]:
+    """Return the amount by which each counter has increased since the `baseline` snapshot."""
+    with _lock:
+        return {
+            name: count - baseline.get(name, 0)
+            for name, count in _counters.items()
+            if count != baseline.get(name, 0)
+        }
@@ -33,7 +33,7 @@ from pants.engine.fs import (
     SymlinkEntry,
 )
 from pants.engine.goal import Goal
-from pants.engine.internals import native_engine
+from pants.engine.internals import native_engine, python_metrics
 from pants.engine.internals.docker import DockerResolveImageRequest, DockerResolveImageResult
 from pants.engine.internals.native_engine import (
     PyExecutionRequest,
@@ -354,6 +354,8 @@ class SchedulerSession:
     def __init__(self, scheduler: Scheduler, session: PySession) -> None:
         self._scheduler = scheduler
         self._py_session = session
+        # Python-side counters are cumulative for the process, so record where this Session began.
+        self._python_metrics_baseline = python_metrics.snapshot()
 
     @property
     def scheduler(self) -> Scheduler:
@@ -618,7 +620,9 @@ class SchedulerSession:
         self._scheduler.garbage_collect_store(target_size_bytes)
 
     def get_metrics(self) -> dict[str, int]:
-        return native_engine.session_get_metrics(self.py_session)
+        metrics = native_engine.session_get_metrics(self.py_session)
+        metrics.update(python_metrics.since(self._python_metrics_baseline))
+        return metrics
 
     def get_observation_histograms(self) -> dict[str, Any]:
         return native_engine.session_get_observation_histograms(self.py_scheduler, self.py_session)
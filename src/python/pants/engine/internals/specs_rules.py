@@ -55,6 +55,7 @@ from pants.engine.target import (
     Targets,
     WrappedTarget,
     WrappedTargetRequest,
+    get_weighted_shards,
 )
 from pants.engine.unions import UnionMembership
 from pants.option.global_options import GlobalOptions
@@ -521,11 +522,23 @@ async def find_valid_field_sets_for_target_roots(
             logger.warning(str(no_applicable_exception))
 
     if request.num_shards > 0:
-        sharded_targets_to_applicable_field_sets = {
-            tgt: value
-            for tgt, value in targets_to_applicable_field_sets.items()
-            if request.is_in_shard(tgt.address.spec)
-        }
+        if request.shard_weights is not None:
+            shards = get_weighted_shards(
+                (tgt.address.spec for tgt in targets_to_applicable_field_sets),
+                request.shard_weights,
+                request.num_shards,
+            )
+            sharded_targets_to_applicable_field_sets = {
+                tgt: value
+                for tgt, value in targets_to_applicable_field_sets.items()
+                if shards[tgt.address.spec] == request.shard
+            }
+        else:
+            sharded_targets_to_applicable_field_sets = {
+                tgt: value
+                for tgt, value in targets_to_applicable_field_sets.items()
+                if request.is_in_shard(tgt.address.spec)
+            }
         return TargetRootsToFieldSets(sharded_targets_to_applicable_field_sets)
     return TargetRootsToFieldSets(targets_to_applicable_field_sets)
 
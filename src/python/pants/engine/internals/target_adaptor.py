@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import dataclasses
+import sys
 from dataclasses import dataclass
 from typing import Any
 
@@ -29,9 +30,11 @@ class TargetAdaptor:
     """A light-weight object to store target information before being converted into the Target
     API."""
 
+    __slots__ = ("type_alias", "name", "kwargs")
+
     def __init__(self, type_alias: str, name: str | None, **kwargs: Any) -> None:
-        self.type_alias = type_alias
-        self.name = name
+        self.type_alias = sys.intern(type_alias)
+        self.name = sys.intern(name) if isinstance(name, str) else name
         self.kwargs = kwargs
 
     def __repr__(self) -> str:
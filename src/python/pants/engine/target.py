@@ -7,6 +7,7 @@ import collections.abc
 import dataclasses
 import enum
 import glob as glob_stdlib
+import heapq
 import itertools
 import logging
 import os.path
@@ -1493,6 +1494,36 @@ def get_shard(key: str, num_shards: int) -> int:
     return zlib.crc32(key.encode()) % num_shards
 
 
+def mean_weight(weights: Mapping[str, float]) -> float | None:
+    """The weight assumed for keys which have no weight, or None if no key has a weight."""
+    if not weights:
+        return None
+    return sum(weights.values()) / len(weights)
+
+
+def get_weighted_shards(
+    keys: Iterable[str], weights: Mapping[str, float], num_shards: int
+) -> dict[str, int]:
+    """Assign each key to a shard, such that the total weight of each shard is roughly equal.
+
+    Keys which have no weight are assumed to have the `mean_weight` of all weights. The
+    assignment only depends on the keys and their weights, so it is the same for every shard.
+    """
+    unique_keys = set(keys)
+    default_weight = mean_weight(weights)
+    if default_weight is None:
+        default_weight = 1.0
+
+    # Greedily assign the heaviest remaining key to the lightest shard.
+    shard_weights = [(0.0, shard) for shard in range(num_shards)]
+    result = {}
+    for key in sorted(unique_keys, key=lambda k: (-weights.get(k, default_weight), k)):
+        shard_weight, shard = heapq.heappop(shard_weights)
+        result[key] = shard
+        heapq.heappush(shard_weights, (shard_weight + weights.get(key, default_weight), shard))
+    return result
+
+
 @dataclass(frozen=True)
 class TargetRootsToFieldSetsRequest(Generic[_FS]):
     field_set_superclass: Type[_FS]
@@ -1500,6 +1531,9 @@ class TargetRootsToFieldSetsRequest(Generic[_FS]):
     no_applicable_targets_behavior: NoApplicableTargetsBehavior
     shard: int
     num_shards: int
+    # If set, targets are sharded by the weights of their address specs (see `get_weighted_shards`)
+    # rather than by the hash of their address specs.
+    shard_weights: FrozenDict[str, float] | None
 
     def __init__(
         self,
@@ -1509,12 +1543,16 @@ class TargetRootsToFieldSetsRequest(Generic[_FS]):
         no_applicable_targets_behavior: NoApplicableTargetsBehavior,
         shard: int = 0,
         num_shards: int = -1,
+        shard_weights: Mapping[str, float] | None = None,
     ) -> None:
         object.__setattr__(self, "field_set_superclass", field_set_superclass)
         object.__setattr__(self, "goal_description", goal_description)
         object.__setattr__(self, "no_applicable_targets_behavior", no_applicable_targets_behavior)
         object.__setattr__(self, "shard", shard)
         object.__setattr__(self, "num_shards", num_shards)
+        object.__setattr__(
+            self, "shard_weights", None if shard_weights is None else FrozenDict(shard_weights)
+        )
 
     def is_in_shard(self, key: str) -> bool:
         return get_shard(key, self.num_shards) == self.shard
@@ -45,6 +45,8 @@ from pants.engine.target import (
     ValidNumbers,
     generate_file_based_overrides_field_help_message,
     get_shard,
+    get_weighted_shards,
+    mean_weight,
     parse_shard_spec,
     targets_with_sources_types,
 )
@@ -1498,6 +1500,21 @@ def test_get_shard() -> None:
     assert get_shard("foo/bar/4", 2) == 1
 
 
+def test_get_weighted_shards() -> None:
+    weights = {"a": 10.0, "b": 6.0, "c": 5.0, "unused": 3.0}
+    # `d` has no weight, and so is assumed to take the mean of all weights (6.0), including those
+    # of keys which are not being sharded.
+    assert mean_weight(weights) == 6.0
+    assert get_weighted_shards(["c", "a", "d", "b", "a"], weights, 2) == {
+        "a": 0,
+        "d": 1,
+        "b": 1,
+        "c": 0,
+    }
+    assert mean_weight({}) is None
+    assert get_weighted_shards(["a", "b"], {}, 3) == {"a": 0, "b": 1}
+
+
 def test_generate_file_based_overrides_field_help_message() -> None:
     # Just test the Example: part looks right
     message = generate_file_based_overrides_field_help_message(
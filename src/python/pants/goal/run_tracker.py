@@ -15,7 +15,7 @@ from typing import Any
 
 from pants.base.build_environment import get_buildroot
 from pants.base.exiter import PANTS_SUCCEEDED_EXIT_CODE, ExitCode
-from pants.engine.internals import native_engine
+from pants.engine.internals import native_engine, python_metrics
 from pants.option.errors import ConfigValidationError
 from pants.option.options import Options
 from pants.option.options_fingerprinter import CoercingOptionEncoder
@@ -254,4 +254,4 @@ class RunTracker:
 
     @property
     def counter_names(self) -> tuple[str, ...]:
-        return tuple(native_engine.all_counter_names())
+        return (*native_engine.all_counter_names(), *python_metrics.counter_names())
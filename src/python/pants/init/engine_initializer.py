@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, ClassVar, Iterable, Mapping, cast
@@ -30,8 +31,9 @@ from pants.engine.internals import (
     specs_rules,
     synthetic_targets,
 )
+from pants.engine.internals.build_file_workers import BuildFileParserPool
 from pants.engine.internals.native_engine import PyExecutor, PySessionCancellationLatch
-from pants.engine.internals.parser import Parser
+from pants.engine.internals.parser import BuildFileCodeCache, Parser
 from pants.engine.internals.scheduler import Scheduler, SchedulerSession
 from pants.engine.internals.selectors import Params
 from pants.engine.internals.session import SessionValues
@@ -210,6 +212,9 @@ class EngineInitializer:
             include_trace_on_error=bootstrap_options.print_stacktrace,
             engine_visualize_to=bootstrap_options.engine_visualize_to,
             watch_filesystem=bootstrap_options.watch_filesystem,
+            build_file_code_cache=bootstrap_options.build_file_code_cache,
+            build_file_code_cache_max_size=bootstrap_options.build_file_code_cache_max_size,
+            build_file_parse_workers=bootstrap_options.build_file_parse_workers,
             is_bootstrap=is_bootstrap,
         )
 
@@ -229,6 +234,9 @@ class EngineInitializer:
         include_trace_on_error: bool = True,
         engine_visualize_to: str | None = None,
         watch_filesystem: bool = True,
+        build_file_code_cache: bool = True,
+        build_file_code_cache_max_size: int | None = None,
+        build_file_parse_workers: int = 0,
         is_bootstrap: bool = False,
     ) -> GraphScheduler:
         build_root_path = build_root or get_buildroot()
@@ -238,16 +246,16 @@ class EngineInitializer:
         registered_target_types = RegisteredTargetTypes.create(build_configuration.target_types)
 
         execution_options = execution_options or DEFAULT_EXECUTION_OPTIONS
+        code_cache = BuildFileCodeCache(
+            os.path.join(named_caches_dir, "build_file_code") if build_file_code_cache else None,
+            max_size=build_file_code_cache_max_size,
+        )
+
+        parser: Parser
 
         @rule
         def parser_singleton() -> Parser:
-            return Parser(
-                build_root=build_root_path,
-                registered_target_types=registered_target_types,
-                union_membership=union_membership,
-                object_aliases=build_configuration.registered_aliases,
-                ignore_unrecognized_symbols=is_bootstrap,
-            )
+            return parser
 
         @rule
         def bootstrap_status() -> BootstrapStatus:
@@ -303,6 +311,20 @@ class EngineInitializer:
             )
         )
 
+        parser = Parser(
+            build_root=build_root_path,
+            registered_target_types=registered_target_types,
+            union_membership=union_membership,
+            object_aliases=build_configuration.registered_aliases,
+            ignore_unrecognized_symbols=is_bootstrap,
+            code_cache=code_cache,
+        )
+        if build_file_parse_workers > 0 and not is_bootstrap:
+            # Fork the workers before the scheduler starts to run rules.
+            BuildFileParserPool.create(
+                build_file_parse_workers, parser, registered_target_types, union_membership
+            )
+
         # param types for goals with the `USES_ENVIRONMENT` behaviour (see `goal.py`)
         environment_selecting_goal_param_types = [
             t for t in GraphSession.goal_param_types if t != EnvironmentName
@@ -0,0 +1,92 @@
+# Copyright 2023 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from pants.core.util_rules import system_binaries
+from pants.core.util_rules.system_binaries import PythonBinary
+from pants.engine.collection import Collection
+from pants.engine.fs import AddPrefix, CreateDigest, Digest, FileContent, MergeDigests, RemovePrefix
+from pants.engine.process import Process, ProcessResult
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.jvm.compile import ClasspathEntry
+from pants.util.logging import LogLevel
+from pants.util.resources import read_resource
+
+_EXTRACT_ABI_PACKAGE = "pants.jvm.abi_jar"
+_EXTRACT_ABI_SOURCE = "extract_abi.py"
+_INPUT_PATH = "__jars"
+_OUTPUT_PATH = "__abi_jars"
+
+
+@dataclass(frozen=True)
+class AbiJarRequest:
+    """Extract the ABI jar of each of the given JAR files (see `extract_abi.py`).
+
+    Results in a Digest containing the ABI jars, under the same filenames.
+    """
+
+    digest: Digest
+    filenames: tuple[str, ...]
+
+
+@rule(level=LogLevel.DEBUG)
+async def abi_jar(request: AbiJarRequest, python: PythonBinary) -> Digest:
+    filenames = list(request.filenames)
+    if not filenames:
+        return request.digest
+
+    extract_abi_content = read_resource(_EXTRACT_ABI_PACKAGE, _EXTRACT_ABI_SOURCE)
+    if not extract_abi_content:
+        raise ValueError(
+            f"Unable to find source to {_EXTRACT_ABI_SOURCE!r} in {_EXTRACT_ABI_PACKAGE}."
+        )
+    script_digest, prefixed_jars_digest = await MultiGet(
+        Get(Digest, CreateDigest([FileContent(_EXTRACT_ABI_SOURCE, extract_abi_content)])),
+        Get(Digest, AddPrefix(request.digest, _INPUT_PATH)),
+    )
+    input_digest = await Get(Digest, MergeDigests((script_digest, prefixed_jars_digest)))
+
+    process_result = await Get(
+        ProcessResult,
+        Process(
+            argv=[python.path, _EXTRACT_ABI_SOURCE, _INPUT_PATH, _OUTPUT_PATH, *filenames],
+            input_digest=input_digest,
+            output_directories=(_OUTPUT_PATH,),
+            description=f"Extract the ABI of {filenames[0]}",
+            level=LogLevel.DEBUG,
+        ),
+    )
+    return await Get(Digest, RemovePrefix(process_result.output_digest, _OUTPUT_PATH))
+
+
+class AbiClasspathEntries(Collection[ClasspathEntry]):
+    """The ABI equivalents of a series of `ClasspathEntry`s, for use on a compile classpath.
+
+    Each entry contains the ABI jars of the JAR files of the corresponding input entry, under the
+    same filenames, and has no dependencies.
+    """
+
+
+@dataclass(frozen=True)
+class AbiClasspathEntriesRequest:
+    entries: tuple[ClasspathEntry, ...]
+
+
+@rule
+async def abi_classpath_entries(request: AbiClasspathEntriesRequest) -> AbiClasspathEntries:
+    digests = await MultiGet(
+        Get(Digest, AbiJarRequest(entry.digest, entry.filenames)) for entry in request.entries
+    )
+    return AbiClasspathEntries(
+        ClasspathEntry(digest, entry.filenames) for digest, entry in zip(digests, request.entries)
+    )
+
+
+def rules():
+    return [
+        *collect_rules(),
+        *system_binaries.rules(),
+    ]
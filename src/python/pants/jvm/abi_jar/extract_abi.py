@@ -0,0 +1,528 @@
+# Copyright 2023 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Extracts the ABI (i.e. the signatures visible to compilers) of JAR files, as "ABI jars".
+
+See `[jvm].compile_against_abi_jars`. The ABI jar of a JAR file contains a classfile for each
+classfile of the JAR file which can be referenced by other sources, with only the members which can
+be referenced by other sources, and without method bodies (`Code` attributes) or any other
+attributes which do not affect compilation. The constant pool of each classfile is rebuilt to
+contain only the constants which remain referenced, in a canonical order. As a result, the ABI jar
+is unchanged by edits which do not affect the ABI, such as changes to method bodies, or to private
+members.
+
+Local and anonymous classes are omitted, and other files (including Scala's `.tasty` files) are
+kept as-is. JAR files containing annotation processors, and JAR files or classfiles which can not be
+parsed, are kept unchanged. Only `javac` compiles against ABI jars: they are not sufficient for
+`scalac` (see `[jvm].compile_against_abi_jars`).
+
+Usage: extract_abi.py <input dir> <output dir> <relative path of JAR file>...
+"""
+
+#
+# Note: This file is run as a script in the execution sandbox (using the Python interpreter which
+# Pants discovers for its own use), and must only depend on the standard library.
+#
+# N.B.: That interpreter may be as old as Python 3.6, so this file must be compatible with Python
+# 3.6+: in particular, it can not use `from __future__ import annotations`, and so annotations
+# which are evaluated (i.e. other than those of local variables) must use `typing`.
+#
+
+import os
+import shutil
+import struct
+import sys
+import zipfile
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+ACC_PRIVATE = 0x0002
+ACC_BRIDGE = 0x0040
+ACC_SYNTHETIC = 0x1000
+
+_MAGIC = 0xCAFEBABE
+_ANNOTATION_PROCESSORS = "META-INF/services/javax.annotation.processing.Processor"
+# The modification time of each file in an ABI jar: the earliest time that a ZIP file supports.
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+# Constant pool tags, and the number of bytes of their content (other than for `Utf8` constants).
+_UTF8 = 1
+_LONG = 5
+_DOUBLE = 6
+_CONSTANT_SIZES = {
+    3: 4,  # Integer
+    4: 4,  # Float
+    _LONG: 8,
+    _DOUBLE: 8,
+    7: 2,  # Class
+    8: 2,  # String
+    9: 4,  # Fieldref
+    10: 4,  # Methodref
+    11: 4,  # InterfaceMethodref
+    12: 4,  # NameAndType
+    15: 3,  # MethodHandle
+    16: 2,  # MethodType
+    17: 4,  # Dynamic
+    18: 4,  # InvokeDynamic
+    19: 2,  # Module
+    20: 2,  # Package
+}
+# The offsets of the constant pool indexes in the content of constants which refer to others.
+_CONSTANT_REFERENCES = {
+    7: (0,),
+    8: (0,),
+    9: (0, 2),
+    10: (0, 2),
+    11: (0, 2),
+    12: (0, 2),
+    15: (1,),
+    16: (0,),
+    19: (0,),
+    20: (0,),
+}
+
+
+class ClassfileError(ValueError):
+    pass
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.offset = 0
+
+    def read(self, size: int) -> bytes:
+        end = self.offset + size
+        if end > len(self.data):
+            raise ClassfileError("Unexpected end of classfile.")
+        content = self.data[self.offset : end]
+        self.offset = end
+        return content
+
+    def u1(self) -> int:
+        return self.read(1)[0]
+
+    def u2(self) -> int:
+        return int(struct.unpack(">H", self.read(2))[0])
+
+    def u4(self) -> int:
+        return int(struct.unpack(">I", self.read(4))[0])
+
+
+def _u1(value: int) -> bytes:
+    return struct.pack(">B", value)
+
+
+def _u2(value: int) -> bytes:
+    return struct.pack(">H", value)
+
+
+def _u4(value: int) -> bytes:
+    return struct.pack(">I", value)
+
+
+class _ConstantPool:
+    """The constant pool of a classfile, and a new constant pool for its ABI.
+
+    Constants are copied to the new pool as they are referenced, so it contains only the constants
+    which are referenced by the ABI, in the order in which they are first referenced.
+    """
+
+    def __init__(self, reader: _Reader) -> None:
+        count = reader.u2()
+        self._constants: List[Optional[Tuple[int, bytes]]] = [None] * count
+        index = 1
+        while index < count:
+            tag = reader.u1()
+            if tag == _UTF8:
+                content = reader.read(reader.u2())
+            elif tag in _CONSTANT_SIZES:
+                content = reader.read(_CONSTANT_SIZES[tag])
+            else:
+                raise ClassfileError(f"Unknown constant pool tag {tag}.")
+            self._constants[index] = (tag, content)
+            # Long and Double constants take two slots.
+            index += 2 if tag in (_LONG, _DOUBLE) else 1
+
+        self._new_constants: List[bytes] = []
+        self._new_size = 1
+        self._new_indexes: Dict[int, int] = {}
+        self._new_indexes_by_constant: Dict[bytes, int] = {}
+
+    def _constant(self, index: int) -> Tuple[int, bytes]:
+        constant = self._constants[index] if 0 < index < len(self._constants) else None
+        if constant is None:
+            raise ClassfileError(f"Invalid constant pool index {index}.")
+        return constant
+
+    def utf8(self, index: int) -> str:
+        tag, content = self._constant(index)
+        if tag != _UTF8:
+            raise ClassfileError(f"Constant pool index {index} is not a Utf8 constant.")
+        # NB: Classfiles use "modified" UTF-8, which only differs for NUL and supplementary
+        # characters, neither of which occur in the names that are looked up here.
+        return content.decode("utf-8", errors="replace")
+
+    def class_name(self, index: int) -> bytes:
+        """The (encoded) binary name of the given `Class` constant."""
+        tag, content = self._constant(index)
+        if tag != 7:
+            raise ClassfileError(f"Constant pool index {index} is not a Class constant.")
+        (name_index,) = struct.unpack(">H", content)
+        tag, name = self._constant(name_index)
+        if tag != _UTF8:
+            raise ClassfileError(f"Constant pool index {name_index} is not a Utf8 constant.")
+        return name
+
+    def references_class(self, index: int) -> bool:
+        """Whether the new pool refers to the given `Class` constant.
+
+        It may be referred to either directly, or by name in a descriptor or signature.
+        """
+        if index in self._new_indexes:
+            return True
+        name = self.class_name(index)
+        # NB: The new constants include their tags, so the descriptors and signatures are the
+        # `Utf8` constants.
+        return any(
+            constant[0] == _UTF8
+            and (b"L" + name + b";" in constant or b"L" + name + b"<" in constant)
+            for constant in self._new_constants
+        )
+
+    def ref(self, index: int) -> int:
+        """Copy the given constant (and the constants it refers to) to the new pool, and return
+        its new index.
+
+        An index of 0 (which marks an absent optional reference) is preserved.
+        """
+        if index == 0:
+            return 0
+        new_index = self._new_indexes.get(index)
+        if new_index is not None:
+            return new_index
+        tag, content = self._constant(index)
+        if tag in (17, 18):
+            # Dynamic constants refer to bootstrap methods, which are only used by method bodies.
+            raise ClassfileError(f"Unexpected reference to a dynamic constant at {index}.")
+        if tag == _UTF8:
+            content = _u2(len(content)) + content
+        else:
+            new_content = bytearray(content)
+            for offset in _CONSTANT_REFERENCES.get(tag, ()):
+                (ref,) = struct.unpack(">H", content[offset : offset + 2])
+                new_content[offset : offset + 2] = _u2(self.ref(ref))
+            content = bytes(new_content)
+        constant = _u1(tag) + content
+        new_index = self._new_indexes_by_constant.get(constant)
+        if new_index is None:
+            new_index = self._new_size
+            self._new_constants.append(constant)
+            self._new_size += 2 if tag in (_LONG, _DOUBLE) else 1
+            self._new_indexes_by_constant[constant] = new_index
+        self._new_indexes[index] = new_index
+        return new_index
+
+    def serialize(self) -> bytes:
+        return _u2(self._new_size) + b"".join(self._new_constants)
+
+
+def _copy_element_value(reader: _Reader, pool: _ConstantPool) -> bytes:
+    tag = reader.u1()
+    if chr(tag) in "BCDFIJSZsc":
+        return _u1(tag) + _u2(pool.ref(reader.u2()))
+    if chr(tag) == "e":
+        return _u1(tag) + _u2(pool.ref(reader.u2())) + _u2(pool.ref(reader.u2()))
+    if chr(tag) == "@":
+        return _u1(tag) + _copy_annotation(reader, pool)
+    if chr(tag) == "[":
+        count = reader.u2()
+        return (
+            _u1(tag)
+            + _u2(count)
+            + b"".join(_copy_element_value(reader, pool) for _ in range(count))
+        )
+    raise ClassfileError(f"Unknown annotation element value tag {tag}.")
+
+
+def _copy_annotation(reader: _Reader, pool: _ConstantPool) -> bytes:
+    content = [_u2(pool.ref(reader.u2()))]
+    count = reader.u2()
+    content.append(_u2(count))
+    for _ in range(count):
+        content.append(_u2(pool.ref(reader.u2())))
+        content.append(_copy_element_value(reader, pool))
+    return b"".join(content)
+
+
+def _copy_annotations(reader: _Reader, pool: _ConstantPool) -> bytes:
+    count = reader.u2()
+    return _u2(count) + b"".join(_copy_annotation(reader, pool) for _ in range(count))
+
+
+def _copy_parameter_annotations(reader: _Reader, pool: _ConstantPool) -> bytes:
+    count = reader.u1()
+    return _u1(count) + b"".join(_copy_annotations(reader, pool) for _ in range(count))
+
+
+def _copy_index(reader: _Reader, pool: _ConstantPool) -> bytes:
+    return _u2(pool.ref(reader.u2()))
+
+
+def _copy_indexes(reader: _Reader, pool: _ConstantPool) -> bytes:
+    count = reader.u2()
+    return _u2(count) + b"".join(_u2(pool.ref(reader.u2())) for _ in range(count))
+
+
+def _copy_raw(reader: _Reader, pool: _ConstantPool) -> bytes:
+    # NB: Only used for attributes whose content does not refer to the constant pool.
+    return reader.read(len(reader.data) - reader.offset)
+
+
+def _copy_method_parameters(reader: _Reader, pool: _ConstantPool) -> bytes:
+    count = reader.u1()
+    return _u1(count) + b"".join(
+        _u2(pool.ref(reader.u2())) + _u2(reader.u2()) for _ in range(count)
+    )
+
+
+def _copy_inner_classes(content: bytes, pool: _ConstantPool, this_class: int) -> bytes:
+    """Copy the entries of an `InnerClasses` attribute which the ABI refers to.
+
+    Compilers record an entry for every nested class that a classfile refers to, including those
+    which only method bodies refer to (e.g. `Map.Entry`). So only the entries for this class, for
+    its member classes, and for the nested classes that the rest of the ABI refers to are kept.
+    Returns empty content if no entries are kept, in which case the attribute is omitted.
+    """
+    reader = _Reader(content)
+    entries = [tuple(reader.u2() for _ in range(4)) for _ in range(reader.u2())]
+    if reader.offset != len(content):
+        raise ClassfileError("Unexpected content in the InnerClasses attribute.")
+    this_class_name = pool.class_name(this_class)
+    kept: Dict[int, bytes] = {}
+    # NB: Copying an entry may refer to another nested class (its outer class), and so entries are
+    # copied until no more are referred to.
+    copied = True
+    while copied:
+        copied = False
+        for i, (inner_class, outer_class, inner_name, access_flags) in enumerate(entries):
+            if i in kept or outer_class == 0:
+                # Already copied, or a local or anonymous class, which is not part of the ABI.
+                continue
+            if this_class_name in (
+                pool.class_name(inner_class),
+                pool.class_name(outer_class),
+            ) or pool.references_class(inner_class):
+                kept[i] = (
+                    _u2(pool.ref(inner_class))
+                    + _u2(pool.ref(outer_class))
+                    + _u2(pool.ref(inner_name))
+                    + _u2(access_flags)
+                )
+                copied = True
+    if not kept:
+        return b""
+    return _u2(len(kept)) + b"".join(kept[i] for i in sorted(kept))
+
+
+def _copy_record(reader: _Reader, pool: _ConstantPool) -> bytes:
+    count = reader.u2()
+    content = [_u2(count)]
+    for _ in range(count):
+        content.append(_u2(pool.ref(reader.u2())))
+        content.append(_u2(pool.ref(reader.u2())))
+        content.append(_copy_attributes(reader, pool, _MEMBER_ATTRIBUTES))
+    return b"".join(content)
+
+
+_AttributeCopier = Callable[[_Reader, _ConstantPool], bytes]
+
+_ANNOTATION_ATTRIBUTES: Dict[str, _AttributeCopier] = {
+    "Deprecated": _copy_raw,
+    "RuntimeInvisibleAnnotations": _copy_annotations,
+    "RuntimeVisibleAnnotations": _copy_annotations,
+    "Signature": _copy_index,
+    "Synthetic": _copy_raw,
+}
+_CLASS_ATTRIBUTES: Dict[str, _AttributeCopier] = {
+    **_ANNOTATION_ATTRIBUTES,
+    # NB: `InnerClasses` is copied by `class_abi`, after all other attributes.
+    "PermittedSubclasses": _copy_indexes,
+    "Record": _copy_record,
+    # The markers and signatures which Scala compilers emit.
+    "Scala": _copy_raw,
+    "ScalaSig": _copy_raw,
+    "TASTY": _copy_raw,
+}
+_MEMBER_ATTRIBUTES: Dict[str, _AttributeCopier] = {
+    **_ANNOTATION_ATTRIBUTES,
+    "AnnotationDefault": _copy_element_value,
+    "ConstantValue": _copy_index,
+    "Exceptions": _copy_indexes,
+    "MethodParameters": _copy_method_parameters,
+    "RuntimeInvisibleParameterAnnotations": _copy_parameter_annotations,
+    "RuntimeVisibleParameterAnnotations": _copy_parameter_annotations,
+}
+
+
+def _attributes(reader: _Reader, pool: _ConstantPool) -> Iterable[Tuple[int, str, bytes]]:
+    for _ in range(reader.u2()):
+        name_index = reader.u2()
+        content = reader.read(reader.u4())
+        yield name_index, pool.utf8(name_index), content
+
+
+def _copy_attribute(
+    pool: _ConstantPool, name_index: int, name: str, content: bytes, copier: _AttributeCopier
+) -> bytes:
+    attribute_reader = _Reader(content)
+    new_name_index = pool.ref(name_index)
+    new_content = copier(attribute_reader, pool)
+    if attribute_reader.offset != len(content):
+        raise ClassfileError(f"Unexpected content in the {name} attribute.")
+    return _u2(new_name_index) + _u4(len(new_content)) + new_content
+
+
+def _copy_attributes(
+    reader: _Reader, pool: _ConstantPool, copiers: Dict[str, _AttributeCopier]
+) -> bytes:
+    """Copy the attributes which are part of the ABI, and drop the rest (such as `Code`)."""
+    attributes = [
+        _copy_attribute(pool, name_index, name, content, copiers[name])
+        for name_index, name, content in list(_attributes(reader, pool))
+        if name in copiers
+    ]
+    return _u2(len(attributes)) + b"".join(attributes)
+
+
+def _copy_members(reader: _Reader, pool: _ConstantPool, *, methods: bool) -> bytes:
+    members = []
+    for _ in range(reader.u2()):
+        access_flags, name_index, descriptor_index = reader.u2(), reader.u2(), reader.u2()
+        # NB: The attributes must be read even if the member is omitted.
+        start = reader.offset
+        for _ in _attributes(reader, pool):
+            pass
+        if access_flags & ACC_PRIVATE:
+            continue
+        if access_flags & ACC_SYNTHETIC and not (methods and access_flags & ACC_BRIDGE):
+            # Synthetic members (e.g. accessors for private members) can not be referenced by
+            # sources. Bridge methods are kept, since they affect overriding.
+            continue
+        if methods and pool.utf8(name_index) == "<clinit>":
+            continue
+        attributes_reader = _Reader(reader.data[start : reader.offset])
+        members.append(
+            _u2(access_flags)
+            + _u2(pool.ref(name_index))
+            + _u2(pool.ref(descriptor_index))
+            + _copy_attributes(attributes_reader, pool, _MEMBER_ATTRIBUTES)
+        )
+    return _u2(len(members)) + b"".join(members)
+
+
+def class_abi(classfile: bytes) -> Optional[bytes]:
+    """Return the ABI of the given classfile, or None if the class is not part of the ABI.
+
+    Raises `ClassfileError` if the classfile can not be parsed.
+    """
+    reader = _Reader(classfile)
+    if reader.u4() != _MAGIC:
+        raise ClassfileError("Not a classfile.")
+    version = reader.read(4)
+    pool = _ConstantPool(reader)
+    access_flags, this_class, super_class = reader.u2(), reader.u2(), reader.u2()
+    interfaces = [reader.u2() for _ in range(reader.u2())]
+
+    # Determine whether this is a local or anonymous class before copying anything.
+    members_start = reader.offset
+    for _ in range(2):
+        for _ in range(reader.u2()):
+            reader.read(6)
+            for _ in _attributes(reader, pool):
+                pass
+    class_attributes_start = reader.offset
+    class_attributes = list(_attributes(reader, pool))
+    if any(name == "EnclosingMethod" for _, name, _ in class_attributes):
+        return None
+    if reader.offset != len(classfile):
+        raise ClassfileError("Unexpected content after the end of the classfile.")
+
+    body = [
+        _u2(access_flags),
+        _u2(pool.ref(this_class)),
+        _u2(pool.ref(super_class)),
+        _u2(len(interfaces)),
+        *(_u2(pool.ref(interface)) for interface in interfaces),
+    ]
+    reader.offset = members_start
+    body.append(_copy_members(reader, pool, methods=False))
+    body.append(_copy_members(reader, pool, methods=True))
+    assert reader.offset == class_attributes_start
+    attributes = [
+        _copy_attribute(pool, name_index, name, content, _CLASS_ATTRIBUTES[name])
+        for name_index, name, content in class_attributes
+        if name in _CLASS_ATTRIBUTES
+    ]
+    # The entries of `InnerClasses` which are kept depend on which classes the rest of the ABI
+    # refers to, so it is copied last.
+    for name_index, name, content in class_attributes:
+        if name != "InnerClasses":
+            continue
+        inner_classes = _copy_inner_classes(content, pool, this_class)
+        if inner_classes:
+            attributes.append(_u2(pool.ref(name_index)) + _u4(len(inner_classes)) + inner_classes)
+    body.append(_u2(len(attributes)) + b"".join(attributes))
+    return _u4(_MAGIC) + version + pool.serialize() + b"".join(body)
+
+
+def _zip_info(name: str) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=_ZIP_EPOCH)
+    info.external_attr = 0o644 << 16
+    # NB: Files are stored rather than compressed, so that the ABI jar does not depend on the
+    # version of zlib.
+    info.compress_type = zipfile.ZIP_STORED
+    return info
+
+
+def jar_abi(source: str, dest: str) -> None:
+    """Write the ABI jar of the JAR file at `source` to `dest`."""
+    try:
+        with zipfile.ZipFile(source) as jar:
+            if _ANNOTATION_PROCESSORS in jar.namelist():
+                # Annotation processors are loaded from the classpath, and need their bodies.
+                shutil.copyfile(source, dest)
+                return
+            entries = []
+            for info in sorted(jar.infolist(), key=lambda info: info.filename):
+                if info.is_dir():
+                    continue
+                name = info.filename
+                content = jar.read(info)
+                if name.endswith(".class") and not name.endswith("module-info.class"):
+                    try:
+                        abi = class_abi(content)
+                    except ClassfileError:
+                        abi = content
+                    if abi is None:
+                        continue
+                    content = abi
+                entries.append((name, content))
+    except zipfile.BadZipFile:
+        shutil.copyfile(source, dest)
+        return
+
+    with zipfile.ZipFile(dest, "w") as abi_jar:
+        for name, content in entries:
+            abi_jar.writestr(_zip_info(name), content)
+
+
+def main(args: List[str]) -> None:
+    input_dir, output_dir, *filenames = args
+    for filename in filenames:
+        dest = os.path.join(output_dir, filename)
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        jar_abi(os.path.join(input_dir, filename), dest)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,271 @@
+# Copyright 2023 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+import struct
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from pants.jvm.abi_jar.extract_abi import ClassfileError, class_abi, jar_abi
+
+ACC_PUBLIC = 0x0001
+ACC_PRIVATE = 0x0002
+ACC_STATIC = 0x0008
+ACC_FINAL = 0x0010
+
+
+def u2(value: int) -> bytes:
+    return struct.pack(">H", value)
+
+
+def u4(value: int) -> bytes:
+    return struct.pack(">I", value)
+
+
+class ClassfileBuilder:
+    """Assembles a classfile, with (fake) method bodies which refer to the constant pool."""
+
+    def __init__(self, name: str) -> None:
+        self._constants: list[bytes] = []
+        self._fields: list[bytes] = []
+        self._methods: list[bytes] = []
+        self._attributes: list[bytes] = []
+        self._this_class = self.class_(name)
+        self._super_class = self.class_("java/lang/Object")
+
+    def _add(self, constant: bytes) -> int:
+        self._constants.append(constant)
+        return len(self._constants)
+
+    def utf8(self, value: str) -> int:
+        content = value.encode()
+        return self._add(b"\x01" + u2(len(content)) + content)
+
+    def class_(self, name: str) -> int:
+        return self._add(b"\x07" + u2(self.utf8(name)))
+
+    def integer(self, value: int) -> int:
+        return self._add(b"\x03" + u4(value))
+
+    def string(self, value: str) -> int:
+        return self._add(b"\x08" + u2(self.utf8(value)))
+
+    def attribute(self, name: str, content: bytes) -> bytes:
+        return u2(self.utf8(name)) + u4(len(content)) + content
+
+    def code(self, body: str) -> bytes:
+        # A body which loads a string constant.
+        instructions = b"\x13" + u2(self.string(body)) + b"\xb0"
+        return self.attribute(
+            "Code", u2(1) + u2(1) + u4(len(instructions)) + instructions + u2(0) + u2(0)
+        )
+
+    def field(self, access_flags: int, name: str, descriptor: str, *attributes: bytes) -> None:
+        self._fields.append(
+            u2(access_flags)
+            + u2(self.utf8(name))
+            + u2(self.utf8(descriptor))
+            + u2(len(attributes))
+            + b"".join(attributes)
+        )
+
+    def method(self, access_flags: int, name: str, descriptor: str, *attributes: bytes) -> None:
+        self._methods.append(
+            u2(access_flags)
+            + u2(self.utf8(name))
+            + u2(self.utf8(descriptor))
+            + u2(len(attributes))
+            + b"".join(attributes)
+        )
+
+    def class_attribute(self, attribute: bytes) -> None:
+        self._attributes.append(attribute)
+
+    def build(self) -> bytes:
+        return b"".join(
+            [
+                u4(0xCAFEBABE),
+                u2(0),
+                u2(55),
+                u2(len(self._constants) + 1),
+                *self._constants,
+                u2(ACC_PUBLIC),
+                u2(self._this_class),
+                u2(self._super_class),
+                u2(0),
+                u2(len(self._fields)),
+                *self._fields,
+                u2(len(self._methods)),
+                *self._methods,
+                u2(len(self._attributes)),
+                *self._attributes,
+            ]
+        )
+
+
+def example_class(
+    *,
+    body: str = "hello",
+    private_body: str = "secret",
+    private_field: str = "cache",
+    constant: int = 42,
+    descriptor: str = "()Ljava/lang/String;",
+) -> bytes:
+    builder = ClassfileBuilder("org/example/Greeter")
+    builder.field(
+        ACC_PUBLIC | ACC_STATIC | ACC_FINAL,
+        "ANSWER",
+        "I",
+        builder.attribute("ConstantValue", u2(builder.integer(constant))),
+    )
+    builder.field(ACC_PRIVATE, private_field, "Ljava/lang/Object;")
+    builder.method(ACC_PUBLIC, "greet", descriptor, builder.code(body))
+    builder.method(ACC_PRIVATE, "helper", "()Ljava/lang/String;", builder.code(private_body))
+    builder.method(ACC_STATIC, "<clinit>", "()V", builder.code(body))
+    builder.class_attribute(builder.attribute("SourceFile", u2(builder.utf8("Greeter.java"))))
+    return builder.build()
+
+
+def test_class_abi_ignores_bodies_and_private_members() -> None:
+    abi = class_abi(example_class())
+    assert abi is not None
+    assert abi == class_abi(
+        example_class(body="goodbye", private_body="other", private_field="renamed")
+    )
+    # The ABI is itself a valid classfile, whose ABI is itself.
+    assert class_abi(abi) == abi
+    assert b"greet" in abi
+    assert b"ANSWER" in abi
+    for omitted in (b"hello", b"secret", b"helper", b"cache", b"Code", b"<clinit>", b"SourceFile"):
+        assert omitted not in abi
+    assert len(abi) < len(example_class())
+
+
+def test_class_abi_changes_with_signatures() -> None:
+    abi = class_abi(example_class())
+    assert abi != class_abi(example_class(descriptor="()Ljava/lang/Object;"))
+    # Constants may be inlined by compilers, and so are part of the ABI.
+    assert abi != class_abi(example_class(constant=43))
+
+
+def inner_classes(builder: ClassfileBuilder, *entries: tuple[str, str, str]) -> bytes:
+    return builder.attribute(
+        "InnerClasses",
+        u2(len(entries))
+        + b"".join(
+            u2(builder.class_(inner)) + u2(builder.class_(outer)) + u2(builder.utf8(name)) + u2(0)
+            for inner, outer, name in entries
+        ),
+    )
+
+
+def test_class_abi_inner_classes() -> None:
+    builder_entry = ("org/example/Greeter$Builder", "org/example/Greeter", "Builder")
+
+    def greeter(*entries: tuple[str, str, str]) -> bytes:
+        builder = ClassfileBuilder("org/example/Greeter")
+        builder.method(
+            ACC_PUBLIC,
+            "lookup",
+            "(Ljava/util/Map<Ljava/lang/String;Lorg/example/Key$Id;>;)V",
+            builder.code("hello"),
+        )
+        builder.class_attribute(inner_classes(builder, builder_entry, *entries))
+        return builder.build()
+
+    abi = class_abi(greeter())
+    assert abi is not None
+    # Entries for member classes, and for nested classes which the ABI refers to, are kept.
+    assert b"Greeter$Builder" in abi
+    assert class_abi(greeter(("org/example/Key$Id", "org/example/Key", "Id"))) != abi
+    # But a nested class which is only referred to by a method body (e.g. after an edit to the
+    # body which starts using it) does not affect the ABI.
+    assert class_abi(greeter(("java/util/Map$Entry", "java/util/Map", "Entry"))) == abi
+
+    # The entry of a nested class for itself is kept, but the attribute is omitted entirely if no
+    # entries are kept.
+    nested = ClassfileBuilder(builder_entry[0])
+    nested.class_attribute(inner_classes(nested, builder_entry))
+    assert b"InnerClasses" in (class_abi(nested.build()) or b"")
+    unnested = ClassfileBuilder("org/example/Other")
+    unnested.class_attribute(
+        inner_classes(unnested, ("java/util/Map$Entry", "java/util/Map", "Entry"))
+    )
+    assert class_abi(unnested.build()) == class_abi(ClassfileBuilder("org/example/Other").build())
+
+
+def test_class_abi_omits_local_classes() -> None:
+    builder = ClassfileBuilder("org/example/Greeter$1")
+    builder.class_attribute(
+        builder.attribute("EnclosingMethod", u2(builder.class_("org/example/Greeter")) + u2(0))
+    )
+    assert class_abi(builder.build()) is None
+
+
+def test_class_abi_invalid() -> None:
+    with pytest.raises(ClassfileError):
+        class_abi(b"not a classfile")
+    with pytest.raises(ClassfileError):
+        class_abi(example_class()[:-10])
+
+
+def write_jar(path: Path, files: dict[str, bytes]) -> Path:
+    with zipfile.ZipFile(path, "w") as jar:
+        jar.writestr("org/", b"")
+        for name, content in files.items():
+            jar.writestr(name, content)
+    return path
+
+
+def test_jar_abi(tmp_path: Path) -> None:
+    local_class = ClassfileBuilder("org/example/Greeter$1")
+    local_class.class_attribute(
+        local_class.attribute(
+            "EnclosingMethod", u2(local_class.class_("org/example/Greeter")) + u2(0)
+        )
+    )
+    files = {
+        "org/example/Greeter.class": example_class(),
+        "org/example/Greeter$1.class": local_class.build(),
+        "org/example/greeting.txt": b"Hello!",
+        "org/example/Broken.class": b"not a classfile",
+    }
+    write_jar(tmp_path / "one.jar", files)
+    write_jar(
+        tmp_path / "two.jar",
+        {**files, "org/example/Greeter.class": example_class(body="goodbye")},
+    )
+
+    jar_abi(str(tmp_path / "one.jar"), str(tmp_path / "one.abi.jar"))
+    jar_abi(str(tmp_path / "two.jar"), str(tmp_path / "two.abi.jar"))
+
+    assert (tmp_path / "one.abi.jar").read_bytes() == (tmp_path / "two.abi.jar").read_bytes()
+    with zipfile.ZipFile(tmp_path / "one.abi.jar") as abi_jar:
+        assert abi_jar.namelist() == [
+            "org/example/Broken.class",
+            "org/example/Greeter.class",
+            "org/example/greeting.txt",
+        ]
+        assert abi_jar.read("org/example/Greeter.class") == class_abi(example_class())
+        assert abi_jar.read("org/example/greeting.txt") == b"Hello!"
+        assert abi_jar.read("org/example/Broken.class") == b"not a classfile"
+
+
+def test_jar_abi_unchanged(tmp_path: Path) -> None:
+    processor_jar = write_jar(
+        tmp_path / "processor.jar",
+        {
+            "META-INF/services/javax.annotation.processing.Processor": b"org.example.Processor",
+            "org/example/Greeter.class": example_class(),
+        },
+    )
+    jar_abi(str(processor_jar), str(tmp_path / "processor.abi.jar"))
+    assert (tmp_path / "processor.abi.jar").read_bytes() == processor_jar.read_bytes()
+
+    not_a_jar = tmp_path / "tool.exe"
+    not_a_jar.write_bytes(b"not a jar")
+    jar_abi(str(not_a_jar), str(tmp_path / "tool.abi.exe"))
+    assert (tmp_path / "tool.abi.exe").read_bytes() == b"not a jar"
@@ -0,0 +1,28 @@
+# Copyright 2023 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+from pants.engine.target import Target
+from pants.util.collections import partition_sequentially
+
+# The number of sources to analyze per JVM process when analyzing all of the sources of a language.
+_ANALYSIS_BATCH_SIZE_TARGET = 128
+_ANALYSIS_BATCH_SIZE_MAX = 512
+
+
+def source_analysis_batches(targets: Iterable[Target]) -> Iterator[list[Target]]:
+    """Partition the given targets into batches whose sources are analyzed by a single process.
+
+    The sources of all of the targets of a JVM language are analyzed in order to compute the
+    `SymbolMapping`, and dependency inference then uses the analysis of each target's source. The
+    batches are stable, so a change to one source only re-runs the analysis of its batch.
+    """
+    return partition_sequentially(
+        targets,
+        key=lambda tgt: tgt.address.spec,
+        size_target=_ANALYSIS_BATCH_SIZE_TARGET,
+        size_max=_ANALYSIS_BATCH_SIZE_MAX,
+    )
@@ -2,6 +2,7 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 from pants.jvm import classpath, jdk_rules, resources, run, run_deploy_jar
 from pants.jvm import util_rules as jvm_util_rules
+from pants.jvm.abi_jar import abi_jar
 from pants.jvm.dependency_inference import symbol_mapper
 from pants.jvm.goals import lockfile
 from pants.jvm.jar_tool import jar_tool
@@ -25,6 +26,7 @@ def target_types():
 
 def rules():
     return [
+        *abi_jar.rules(),
         *classpath.rules(),
         *junit.rules(),
         *strip_jar.rules(),
@@ -26,9 +26,12 @@ from pants.engine.fs import (
     CreateDigest,
     Digest,
     DigestContents,
+    DigestEntries,
     DigestSubset,
+    DownloadFile,
     FileContent,
     FileDigest,
+    FileEntry,
     MergeDigests,
     PathGlobs,
     RemovePrefix,
@@ -53,7 +56,7 @@ from pants.jvm.resolve.common import (
     Coordinates,
     GatherJvmCoordinatesRequest,
 )
-from pants.jvm.resolve.coursier_setup import Coursier, CoursierFetchProcess
+from pants.jvm.resolve.coursier_setup import Coursier, CoursierFetchProcess, CoursierSubsystem
 from pants.jvm.resolve.key import CoursierResolveKey
 from pants.jvm.resolve.lockfile_metadata import JVMLockfileMetadata, LockfileContext
 from pants.jvm.subsystems import JvmSubsystem
@@ -64,8 +67,10 @@ from pants.jvm.target_types import (
     JvmResolveField,
 )
 from pants.jvm.util_rules import ExtractFileDigest
+from pants.util.collections import partition_sequentially
 from pants.util.docutil import bin_name, doc_url
 from pants.util.logging import LogLevel
+from pants.util.ordered_set import FrozenOrderedSet
 from pants.util.strutil import bullet_list, pluralize
 
 if TYPE_CHECKING:
@@ -495,7 +500,9 @@ async def coursier_resolve_lockfile(
 
 
 @rule(desc="Fetch with coursier")
-async def fetch_with_coursier(request: CoursierFetchRequest) -> FallibleClasspathEntry:
+async def fetch_with_coursier(
+    request: CoursierFetchRequest, coursier_subsystem: CoursierSubsystem
+) -> FallibleClasspathEntry:
     # TODO: Loading this per JvmArtifact.
     lockfile = await Get(CoursierResolvedLockfile, CoursierResolveKey, request.resolve)
 
@@ -519,9 +526,8 @@ async def fetch_with_coursier(request: CoursierFetchRequest) -> FallibleClasspat
         requirement.coordinate,
     )
 
-    classpath_entries = await MultiGet(
-        Get(ClasspathEntry, CoursierLockfileEntry, entry)
-        for entry in (root_entry, *transitive_entries)
+    classpath_entries = await fetch_lockfile_entries(
+        lockfile, (root_entry, *transitive_entries), coursier_subsystem
     )
     exported_digest = await Get(Digest, MergeDigests(cpe.digest for cpe in classpath_entries))
 
@@ -537,45 +543,50 @@ class ResolvedClasspathEntries(Collection[ClasspathEntry]):
     """A collection of resolved classpath entries."""
 
 
-@rule
-async def coursier_fetch_one_coord(
-    request: CoursierLockfileEntry,
-) -> ClasspathEntry:
-    """Run `coursier fetch --intransitive` to fetch a single artifact.
+@dataclass(frozen=True)
+class CoursierFetchEntriesRequest:
+    """Fetch the given lockfile entries with a single `coursier fetch --intransitive` process.
 
-    This rule exists to permit efficient subsetting of a "global" classpath
-    in the form of a lockfile.  Callers can determine what subset of dependencies
-    from the lockfile are needed for a given target, then request those
-    lockfile entries individually.
+    Results in `ResolvedClasspathEntries` containing a `ClasspathEntry` per lockfile entry, in the
+    same order as the entries.
+    """
 
-    By fetching only one entry at a time, we maximize our cache efficiency.  If instead
-    we fetched the entire subset that the caller wanted, there would be a different cache
-    key for every possible subset.
+    entries: tuple[CoursierLockfileEntry, ...]
+
+
+def _coord_key(coord: Coordinate) -> tuple[str, str, str, str | None]:
+    # NB: The version is omitted, so that an inexact requested version matches the exact version
+    # reported by Coursier, and can then be reported as a mismatch.
+    return (coord.group, coord.artifact, coord.packaging, coord.classifier)
 
-    This rule also guarantees exact reproducibility.  If all caches have been
-    removed, `coursier fetch` will re-download the artifact, and this rule will
-    confirm that what was downloaded matches exactly (by content digest) what
-    was specified in the lockfile (what Coursier originally downloaded).
-    """
 
+@rule
+async def coursier_fetch_entries(request: CoursierFetchEntriesRequest) -> ResolvedClasspathEntries:
     # Prepare any URL- or JAR-specifying entries for use with Coursier
-    req: ArtifactRequirement
-    if request.pants_address:
-        targets = await Get(
+    addresses = [entry.pants_address for entry in request.entries if entry.pants_address]
+    targets = (
+        await Get(
             Targets,
             UnparsedAddressInputs(
-                [request.pants_address],
+                addresses,
                 owning_address=None,
                 description_of_origin="<infallible - coursier fetch>",
             ),
         )
-        req = ArtifactRequirement(request.coord, jar=targets[0][JvmArtifactJarSourceField])
-    else:
-        req = ArtifactRequirement(request.coord, url=request.remote_url)
+        if addresses
+        else Targets()
+    )
+    jars = {address: tgt[JvmArtifactJarSourceField] for address, tgt in zip(addresses, targets)}
+    reqs = [
+        ArtifactRequirement(entry.coord, jar=jars[entry.pants_address])
+        if entry.pants_address
+        else ArtifactRequirement(entry.coord, url=entry.remote_url)
+        for entry in request.entries
+    ]
 
     coursier_resolve_info = await Get(
         CoursierResolveInfo,
-        ArtifactRequirements([req]),
+        ArtifactRequirements(reqs),
     )
 
     coursier_report_file_name = "coursier_report.json"
@@ -591,7 +602,11 @@ async def coursier_fetch_one_coord(
             input_digest=coursier_resolve_info.digest,
             output_directories=("classpath",),
             output_files=(coursier_report_file_name,),
-            description=f"Fetching with coursier: {request.coord.to_coord_str()}",
+            description=(
+                f"Fetching with coursier: {request.entries[0].coord.to_coord_str()}"
+                if len(request.entries) == 1
+                else f"Fetching with coursier: {pluralize(len(request.entries), 'artifact')}"
+            ),
         ),
     )
     report_digest = await Get(
@@ -603,42 +618,209 @@ async def coursier_fetch_one_coord(
     report_deps = report["dependencies"]
     if len(report_deps) == 0:
         raise CoursierError("Coursier fetch report has no dependencies (i.e. nothing was fetched).")
-    elif len(report_deps) > 1:
+    elif len(report_deps) > len(request.entries):
         raise CoursierError(
-            "Coursier fetch report has multiple dependencies, but exactly 1 was expected."
+            f"Coursier fetch report has {len(report_deps)} dependencies, but exactly "
+            f"{len(request.entries)} were expected."
         )
+    deps_by_key = {_coord_key(Coordinate.from_coord_str(dep["coord"])): dep for dep in report_deps}
+
+    classpath_dest_names = []
+    for entry in request.entries:
+        dep = deps_by_key.get(_coord_key(entry.coord))
+        if dep is None:
+            raise CoursierError(
+                f'Coursier fetch report has no dependency for requested coord "{entry.coord.to_coord_str()}".'
+            )
+        resolved_coord = Coordinate.from_coord_str(dep["coord"])
+        if resolved_coord != entry.coord:
+            raise CoursierError(
+                f'Coursier resolved coord "{resolved_coord.to_coord_str()}" does not match requested coord "{entry.coord.to_coord_str()}".'
+            )
+        classpath_dest_names.append(classpath_dest_filename(dep["coord"], dep["file"]))
 
-    dep = report_deps[0]
-    resolved_coord = Coordinate.from_coord_str(dep["coord"])
-    if resolved_coord != request.coord:
-        raise CoursierError(
-            f'Coursier resolved coord "{resolved_coord.to_coord_str()}" does not match requested coord "{request.coord.to_coord_str()}".'
+    classpath_digest = await Get(Digest, RemovePrefix(process_result.output_digest, "classpath"))
+    stripped_digests = await MultiGet(
+        Get(Digest, DigestSubset(classpath_digest, PathGlobs([classpath_dest_name])))
+        for classpath_dest_name in classpath_dest_names
+    )
+    file_digests = await MultiGet(
+        Get(FileDigest, ExtractFileDigest(stripped_digest, classpath_dest_name))
+        for stripped_digest, classpath_dest_name in zip(stripped_digests, classpath_dest_names)
+    )
+    for entry, file_digest in zip(request.entries, file_digests):
+        if file_digest != entry.file_digest:
+            raise CoursierError(
+                f"Coursier fetch for '{entry.coord}' succeeded, but fetched artifact {file_digest} did not match the expected artifact: {entry.file_digest}."
+            )
+    return ResolvedClasspathEntries(
+        ClasspathEntry(digest=stripped_digest, filenames=(classpath_dest_name,))
+        for stripped_digest, classpath_dest_name in zip(stripped_digests, classpath_dest_names)
+    )
+
+
+@rule
+async def coursier_fetch_one_coord(
+    request: CoursierLockfileEntry,
+) -> ClasspathEntry:
+    """Run `coursier fetch --intransitive` to fetch a single artifact.
+
+    This rule exists to permit efficient subsetting of a "global" classpath
+    in the form of a lockfile.  Callers can determine what subset of dependencies
+    from the lockfile are needed for a given target, then request those
+    lockfile entries individually.
+
+    By fetching only one entry at a time, we maximize our cache efficiency.  If instead
+    we fetched the entire subset that the caller wanted, there would be a different cache
+    key for every possible subset.
+
+    This rule also guarantees exact reproducibility.  If all caches have been
+    removed, `coursier fetch` will re-download the artifact, and this rule will
+    confirm that what was downloaded matches exactly (by content digest) what
+    was specified in the lockfile (what Coursier originally downloaded).
+    """
+    classpath_entries = await Get(ResolvedClasspathEntries, CoursierFetchEntriesRequest((request,)))
+    return classpath_entries[0]
+
+
+@dataclass(frozen=True)
+class CoursierDownloadEntryRequest:
+    """Download the artifact of a lockfile entry from the given URL, without running Coursier."""
+
+    entry: CoursierLockfileEntry
+    url: str
+
+
+def _download_url(entry: CoursierLockfileEntry, repos: Iterable[str]) -> str | None:
+    """The URL to download the artifact of the entry from, or None if it must be fetched by
+    Coursier."""
+    if entry.pants_address:
+        return None
+    if entry.remote_url:
+        url = entry.remote_url
+    else:
+        repo = next(iter(repos), None)
+        if repo is None:
+            return None
+        coord = entry.coord
+        # NB: The extension of the artifact is not necessarily its packaging (e.g. a `bundle` is
+        # a `.jar`), so it is taken from the locked file name instead.
+        _, ext = os.path.splitext(entry.file_name)
+        classifier = f"-{coord.classifier}" if coord.classifier else ""
+        url = "/".join(
+            (
+                repo.rstrip("/"),
+                *coord.group.split("."),
+                coord.artifact,
+                coord.version,
+                f"{coord.artifact}-{coord.version}{classifier}{ext}",
+            )
         )
+    return url if url.startswith(("http://", "https://", "file://")) else None
 
-    classpath_dest_name = classpath_dest_filename(dep["coord"], dep["file"])
-    classpath_dest = f"classpath/{classpath_dest_name}"
 
-    resolved_file_digest = await Get(
-        Digest, DigestSubset(process_result.output_digest, PathGlobs([classpath_dest]))
+@rule
+async def coursier_download_entry(request: CoursierDownloadEntryRequest) -> ClasspathEntry:
+    # NB: `DownloadFile` fails if the downloaded file does not match the digest from the lockfile.
+    downloaded_digest = await Get(Digest, DownloadFile(request.url, request.entry.file_digest))
+    (downloaded_entry,) = await Get(DigestEntries, Digest, downloaded_digest)
+    assert isinstance(downloaded_entry, FileEntry)
+    classpath_dest_name = classpath_dest_filename(
+        request.entry.coord.to_coord_str(), request.entry.file_name
     )
-    stripped_digest = await Get(Digest, RemovePrefix(resolved_file_digest, "classpath"))
-    file_digest = await Get(
-        FileDigest,
-        ExtractFileDigest(stripped_digest, classpath_dest_name),
+    digest = await Get(
+        Digest, CreateDigest([dataclasses.replace(downloaded_entry, path=classpath_dest_name)])
     )
-    if file_digest != request.file_digest:
-        raise CoursierError(
-            f"Coursier fetch for '{resolved_coord}' succeeded, but fetched artifact {file_digest} did not match the expected artifact: {request.file_digest}."
+    return ClasspathEntry(digest=digest, filenames=(classpath_dest_name,))
+
+
+async def download_lockfile_entries(
+    entries: Iterable[tuple[CoursierLockfileEntry, str]],
+    coursier_subsystem: CoursierSubsystem,
+) -> tuple[ClasspathEntry, ...]:
+    """Download the given entries from their URLs, in waves of `[coursier].download_concurrency`.
+
+    NB: The limit only applies to this call: concurrent callers each download their own waves.
+    """
+    requests = [CoursierDownloadEntryRequest(entry, url) for entry, url in entries]
+    concurrency = max(coursier_subsystem.download_concurrency, 1)
+    classpath_entries: list[ClasspathEntry] = []
+    for i in range(0, len(requests), concurrency):
+        classpath_entries.extend(
+            await MultiGet(
+                Get(ClasspathEntry, CoursierDownloadEntryRequest, request)
+                for request in requests[i : i + concurrency]
+            )
+        )
+    return tuple(classpath_entries)
+
+
+async def fetch_lockfile_entries(
+    lockfile: CoursierResolvedLockfile,
+    entries: Iterable[CoursierLockfileEntry],
+    coursier_subsystem: CoursierSubsystem,
+) -> tuple[ClasspathEntry, ...]:
+    """Fetch the given entries of the lockfile, as configured by `[coursier].download_directly`
+    and `[coursier].fetch_batch_size`.
+
+    When batching, the entries of the whole lockfile are stably partitioned into batches, and each
+    batch which contains any of the given entries is fetched by a single process. Since every
+    subset of the lockfile is fetched using the same batches, the batches are shared (and cached)
+    between callers, and each entry still results in its own `ClasspathEntry`.
+
+    When downloading directly, the entries whose URL is known are downloaded, and only the
+    remaining entries are fetched with Coursier.
+    """
+
+    def download_url(entry: CoursierLockfileEntry) -> str | None:
+        if not coursier_subsystem.download_directly:
+            return None
+        return _download_url(entry, coursier_subsystem.repos)
+
+    entries = tuple(entries)
+    urls = {entry: url for entry in entries if (url := download_url(entry)) is not None}
+    downloaded = await download_lockfile_entries(urls.items(), coursier_subsystem)
+    classpath_entry_for_entry = dict(zip(urls, downloaded))
+
+    coursier_entries = [entry for entry in entries if entry not in urls]
+    if coursier_subsystem.fetch_batch_size <= 1:
+        fetched = await MultiGet(
+            Get(ClasspathEntry, CoursierLockfileEntry, entry) for entry in coursier_entries
+        )
+        classpath_entry_for_entry.update(zip(coursier_entries, fetched))
+        return tuple(classpath_entry_for_entry[entry] for entry in entries)
+
+    batches = [
+        tuple(batch)
+        for batch in partition_sequentially(
+            (entry for entry in lockfile.entries if download_url(entry) is None),
+            key=lambda entry: entry.coord.to_coord_str(),
+            size_target=coursier_subsystem.fetch_batch_size,
+            size_max=4 * coursier_subsystem.fetch_batch_size,
         )
-    return ClasspathEntry(digest=stripped_digest, filenames=(classpath_dest_name,))
+    ]
+    batch_for_entry = {entry: batch for batch in batches for entry in batch}
+    requested_batches = list(
+        FrozenOrderedSet(batch_for_entry.get(entry, (entry,)) for entry in coursier_entries)
+    )
+    all_classpath_entries = await MultiGet(
+        Get(ResolvedClasspathEntries, CoursierFetchEntriesRequest(batch))
+        for batch in requested_batches
+    )
+    classpath_entry_for_entry.update(
+        (entry, classpath_entry)
+        for batch, classpath_entries in zip(requested_batches, all_classpath_entries)
+        for entry, classpath_entry in zip(batch, classpath_entries)
+    )
+    return tuple(classpath_entry_for_entry[entry] for entry in entries)
 
 
 @rule(level=LogLevel.DEBUG)
-async def coursier_fetch_lockfile(lockfile: CoursierResolvedLockfile) -> ResolvedClasspathEntries:
+async def coursier_fetch_lockfile(
+    lockfile: CoursierResolvedLockfile, coursier_subsystem: CoursierSubsystem
+) -> ResolvedClasspathEntries:
     """Fetch every artifact in a lockfile."""
-    classpath_entries = await MultiGet(
-        Get(ClasspathEntry, CoursierLockfileEntry, entry) for entry in lockfile.entries
-    )
+    classpath_entries = await fetch_lockfile_entries(lockfile, lockfile.entries, coursier_subsystem)
     return ResolvedClasspathEntries(classpath_entries)
 
 
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import textwrap
+from dataclasses import dataclass
 
 import pytest
 
@@ -12,6 +13,7 @@ from pants.core.util_rules import config_files, source_files
 from pants.engine.fs import FileDigest
 from pants.engine.internals.scheduler import ExecutionError
 from pants.engine.process import ProcessExecutionFailure
+from pants.engine.rules import rule
 from pants.engine.target import Targets
 from pants.jvm.compile import ClasspathEntry
 from pants.jvm.resolve.common import (
@@ -20,8 +22,15 @@ from pants.jvm.resolve.common import (
     Coordinate,
     Coordinates,
 )
-from pants.jvm.resolve.coursier_fetch import CoursierLockfileEntry, CoursierResolvedLockfile
+from pants.jvm.resolve.coursier_fetch import (
+    CoursierFetchEntriesRequest,
+    CoursierLockfileEntry,
+    CoursierResolvedLockfile,
+    ResolvedClasspathEntries,
+    fetch_lockfile_entries,
+)
 from pants.jvm.resolve.coursier_fetch import rules as coursier_fetch_rules
+from pants.jvm.resolve.coursier_setup import CoursierSubsystem
 from pants.jvm.target_types import JvmArtifactJarSourceField, JvmArtifactTarget
 from pants.jvm.testutil import maybe_skip_jdk_test
 from pants.jvm.util_rules import ExtractFileDigest
@@ -35,6 +44,21 @@ HAMCREST_COORD = Coordinate(
 )
 
 
+@dataclass(frozen=True)
+class FetchLockfileEntriesRequest:
+    lockfile: CoursierResolvedLockfile
+    entries: tuple[CoursierLockfileEntry, ...]
+
+
+@rule
+async def fetch_requested_lockfile_entries(
+    request: FetchLockfileEntriesRequest, coursier_subsystem: CoursierSubsystem
+) -> ResolvedClasspathEntries:
+    return ResolvedClasspathEntries(
+        await fetch_lockfile_entries(request.lockfile, request.entries, coursier_subsystem)
+    )
+
+
 @pytest.fixture
 def rule_runner() -> RuleRunner:
     rule_runner = RuleRunner(
@@ -43,9 +67,12 @@ def rule_runner() -> RuleRunner:
             *coursier_fetch_rules(),
             *source_files.rules(),
             *util_rules(),
+            fetch_requested_lockfile_entries,
             QueryRule(Targets, [RawSpecs]),
             QueryRule(CoursierResolvedLockfile, (ArtifactRequirements,)),
             QueryRule(ClasspathEntry, (CoursierLockfileEntry,)),
+            QueryRule(ResolvedClasspathEntries, (CoursierFetchEntriesRequest,)),
+            QueryRule(ResolvedClasspathEntries, (FetchLockfileEntriesRequest,)),
             QueryRule(FileDigest, (ExtractFileDigest,)),
         ],
         target_types=[JvmArtifactTarget],
@@ -475,6 +502,94 @@ def test_fetch_one_coord_with_transitive_deps(rule_runner: RuleRunner) -> None:
     )
 
 
+@maybe_skip_jdk_test
+def test_fetch_entries_in_one_process(rule_runner: RuleRunner) -> None:
+    junit_coord = Coordinate(group="junit", artifact="junit", version="4.13.2")
+    hamcrest_digest = FileDigest(
+        fingerprint="66fdef91e9739348df7a096aa384a5685f4e875584cce89386a7a47251c4d8e9",
+        serialized_bytes_length=45024,
+    )
+    junit_digest = FileDigest(
+        fingerprint="8e495b634469d64fb8acfa3495a065cbacc8a0fff55ce1e31007be4c16dc57d3",
+        serialized_bytes_length=384581,
+    )
+    classpath_entries = rule_runner.request(
+        ResolvedClasspathEntries,
+        [
+            CoursierFetchEntriesRequest(
+                (
+                    CoursierLockfileEntry(
+                        coord=junit_coord,
+                        file_name="junit_junit_4.13.2.jar",
+                        direct_dependencies=Coordinates([HAMCREST_COORD]),
+                        dependencies=Coordinates([HAMCREST_COORD]),
+                        file_digest=junit_digest,
+                    ),
+                    CoursierLockfileEntry(
+                        coord=HAMCREST_COORD,
+                        file_name="org.hamcrest_hamcrest-core_1.3.jar",
+                        direct_dependencies=Coordinates([]),
+                        dependencies=Coordinates([]),
+                        file_digest=hamcrest_digest,
+                    ),
+                )
+            )
+        ],
+    )
+    assert [entry.filenames for entry in classpath_entries] == [
+        ("junit_junit_4.13.2.jar",),
+        ("org.hamcrest_hamcrest-core_1.3.jar",),
+    ]
+    assert junit_digest == rule_runner.request(
+        FileDigest, [ExtractFileDigest(classpath_entries[0].digest, "junit_junit_4.13.2.jar")]
+    )
+    assert hamcrest_digest == rule_runner.request(
+        FileDigest,
+        [ExtractFileDigest(classpath_entries[1].digest, "org.hamcrest_hamcrest-core_1.3.jar")],
+    )
+
+
+@maybe_skip_jdk_test
+def test_fetch_lockfile_entries_in_batches(rule_runner: RuleRunner) -> None:
+    rule_runner.set_options(["--coursier-fetch-batch-size=2"], env_inherit=PYTHON_BOOTSTRAP_ENV)
+    junit_coord = Coordinate(group="junit", artifact="junit", version="4.13.2")
+    hamcrest_library_coord = Coordinate(
+        group="org.hamcrest", artifact="hamcrest-library", version="1.3"
+    )
+    commons_io_coord = Coordinate(group="commons-io", artifact="commons-io", version="2.11.0")
+    lockfile = rule_runner.request(
+        CoursierResolvedLockfile,
+        [
+            ArtifactRequirements.from_coordinates(
+                [junit_coord, hamcrest_library_coord, commons_io_coord]
+            )
+        ],
+    )
+    entries_by_coord = {entry.coord: entry for entry in lockfile.entries}
+    assert len(entries_by_coord) == 4
+
+    # With a batch size of 2, the lockfile is partitioned into a batch containing only
+    # `commons-io`, and a batch containing the other entries. The requested subset spans both
+    # batches, in an order which differs from the lockfile's.
+    requested_entries = tuple(
+        entries_by_coord[coord] for coord in (HAMCREST_COORD, commons_io_coord, junit_coord)
+    )
+    classpath_entries = rule_runner.request(
+        ResolvedClasspathEntries, [FetchLockfileEntriesRequest(lockfile, requested_entries)]
+    )
+
+    assert [classpath_entry.filenames for classpath_entry in classpath_entries] == [
+        ("org.hamcrest_hamcrest-core_1.3.jar",),
+        ("commons-io_commons-io_2.11.0.jar",),
+        ("junit_junit_4.13.2.jar",),
+    ]
+    for entry, classpath_entry in zip(requested_entries, classpath_entries):
+        (filename,) = classpath_entry.filenames
+        assert entry.file_digest == rule_runner.request(
+            FileDigest, [ExtractFileDigest(classpath_entry.digest, filename)]
+        )
+
+
 @maybe_skip_jdk_test
 def test_fetch_one_coord_with_classifier(rule_runner: RuleRunner) -> None:
     # Has as a transitive dependency an artifact with both a `classifier` and `packaging`.
@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+import hashlib
+from http.server import BaseHTTPRequestHandler
 from textwrap import dedent
 
 import pytest
@@ -11,14 +13,22 @@ from pants.backend.java.target_types import JavaSourcesGeneratorTarget
 from pants.backend.java.target_types import rules as target_types_rules
 from pants.core.util_rules import config_files, source_files
 from pants.engine.addresses import Address, Addresses
-from pants.jvm.resolve.common import Coordinate
-from pants.jvm.resolve.coursier_fetch import NoCompatibleResolve
+from pants.engine.fs import Digest, DigestContents, FileDigest
+from pants.engine.internals.scheduler import ExecutionError
+from pants.jvm.resolve.common import Coordinate, Coordinates
+from pants.jvm.resolve.coursier_fetch import (
+    CoursierLockfileEntry,
+    CoursierResolvedLockfile,
+    NoCompatibleResolve,
+    ResolvedClasspathEntries,
+)
 from pants.jvm.resolve.coursier_fetch import rules as coursier_fetch_rules
 from pants.jvm.resolve.key import CoursierResolveKey
 from pants.jvm.target_types import DeployJarTarget, JvmArtifactTarget
 from pants.jvm.testutil import maybe_skip_jdk_test
 from pants.jvm.util_rules import rules as util_rules
 from pants.testutil.rule_runner import PYTHON_BOOTSTRAP_ENV, QueryRule, RuleRunner, engine_error
+from pants.util.contextutil import http_server
 
 NAMED_RESOLVE_OPTIONS = (
     '--jvm-resolves={"one": "coursier_resolve.lockfile", "two": "coursier_resolve.lockfile"}'
@@ -124,3 +134,106 @@ def test_no_matching_for_leaf(rule_runner: RuleRunner) -> None:
 )
 def test_from_coord_str(coord_str: str, expected: Coordinate) -> None:
     assert Coordinate.from_coord_str(coord_str) == expected
+
+
+JAR_CONTENT = b"not really a jar"
+CLASSIFIED_JAR_CONTENT = b"not really a classified jar"
+REMOTE_JAR_CONTENT = b"not really a remote jar"
+
+
+class MavenRepositoryHandler(BaseHTTPRequestHandler):
+    """Serves a few artifacts, as a stand-in for a Maven repository."""
+
+    artifacts = {
+        "/maven2/org/example/lib/1.0/lib-1.0.jar": JAR_CONTENT,
+        "/maven2/org/example/lib/1.0/lib-1.0-tests.jar": CLASSIFIED_JAR_CONTENT,
+        "/elsewhere/remote.jar": REMOTE_JAR_CONTENT,
+    }
+
+    def do_GET(self):
+        content = self.artifacts.get(self.path)
+        self.send_response(200 if content is not None else 404)
+        self.send_header("Content-Length", f"{len(content or b'')}")
+        self.end_headers()
+        self.wfile.write(content or b"")
+
+
+def lockfile_entry(coord: Coordinate, content: bytes, **kwargs) -> CoursierLockfileEntry:
+    return CoursierLockfileEntry(
+        coord=coord,
+        file_name=f"{coord.to_coord_str().replace(':', '_')}.jar",
+        direct_dependencies=Coordinates(),
+        dependencies=Coordinates(),
+        file_digest=FileDigest(hashlib.sha256(content).hexdigest(), len(content)),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def download_rule_runner() -> RuleRunner:
+    return RuleRunner(
+        rules=[
+            *config_files.rules(),
+            *coursier_fetch_rules(),
+            *source_files.rules(),
+            *util_rules(),
+            QueryRule(ResolvedClasspathEntries, (CoursierResolvedLockfile,)),
+            QueryRule(DigestContents, (Digest,)),
+        ],
+        isolated_local_store=True,
+    )
+
+
+def test_download_directly(download_rule_runner: RuleRunner) -> None:
+    with http_server(MavenRepositoryHandler) as port:
+        download_rule_runner.set_options(
+            [
+                "--coursier-download-directly",
+                "--coursier-download-concurrency=2",
+                f"--coursier-repos=['http://localhost:{port}/maven2/']",
+            ]
+        )
+        lockfile = CoursierResolvedLockfile(
+            entries=(
+                lockfile_entry(Coordinate("org.example", "lib", "1.0"), JAR_CONTENT),
+                lockfile_entry(
+                    Coordinate("org.example", "lib", "1.0", classifier="tests"),
+                    CLASSIFIED_JAR_CONTENT,
+                ),
+                lockfile_entry(
+                    Coordinate("org.example", "remote", "2.0"),
+                    REMOTE_JAR_CONTENT,
+                    remote_url=f"http://localhost:{port}/elsewhere/remote.jar",
+                ),
+            )
+        )
+        classpath_entries = download_rule_runner.request(ResolvedClasspathEntries, [lockfile])
+
+    assert [
+        [
+            (file_content.path, file_content.content)
+            for file_content in download_rule_runner.request(DigestContents, [entry.digest])
+        ]
+        for entry in classpath_entries
+    ] == [
+        [("org.example_lib_1.0.jar", JAR_CONTENT)],
+        [("org.example_lib_jar_tests_1.0.jar", CLASSIFIED_JAR_CONTENT)],
+        [("org.example_remote_2.0.jar", REMOTE_JAR_CONTENT)],
+    ]
+    assert [entry.filenames for entry in classpath_entries] == [
+        ("org.example_lib_1.0.jar",),
+        ("org.example_lib_jar_tests_1.0.jar",),
+        ("org.example_remote_2.0.jar",),
+    ]
+
+
+def test_download_directly_mismatched_digest(download_rule_runner: RuleRunner) -> None:
+    with http_server(MavenRepositoryHandler) as port:
+        download_rule_runner.set_options(
+            ["--coursier-download-directly", f"--coursier-repos=['http://localhost:{port}/maven2']"]
+        )
+        lockfile = CoursierResolvedLockfile(
+            entries=(lockfile_entry(Coordinate("org.example", "lib", "1.0"), b"something else"),)
+        )
+        with pytest.raises(ExecutionError, match="Wrong digest"):
+            download_rule_runner.request(ResolvedClasspathEntries, [lockfile])
@@ -21,7 +21,7 @@ from pants.engine.fs import CreateDigest, Digest, FileContent, MergeDigests
 from pants.engine.platform import Platform
 from pants.engine.process import Process
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
-from pants.option.option_types import StrListOption
+from pants.option.option_types import BoolOption, IntOption, StrListOption
 from pants.util.logging import LogLevel
 from pants.util.memo import memoized_property
 from pants.util.ordered_set import FrozenOrderedSet
@@ -144,6 +144,63 @@ class CoursierSubsystem(TemplatedExternalTool):
         ),
     )
 
+    fetch_batch_size = IntOption(
+        default=1,
+        advanced=True,
+        help=softwrap(
+            """
+            The approximate number of lockfile entries to fetch with each `coursier fetch`
+            process.
+
+            By default, each artifact is fetched by its own process, which maximizes cache
+            reuse, but which can be slow when many artifacts must be fetched, since each process
+            has a fixed startup cost. When set above 1, the entries of each lockfile are stably
+            partitioned into batches of approximately this size, and each batch is fetched by a
+            single process. Each fetched artifact is still verified against the digest recorded
+            in the lockfile, and used individually on classpaths.
+            """
+        ),
+    )
+
+    download_directly = BoolOption(
+        default=False,
+        advanced=True,
+        help=softwrap(
+            """
+            If true, fetch locked artifacts by downloading them directly, rather than by running
+            `coursier fetch`.
+
+            An artifact is downloaded from the `url` of its `jvm_artifact` if one is set, and
+            otherwise from its standard Maven layout path in the first repository of
+            `[coursier].repos`, which must then be able to serve every locked artifact (e.g. a
+            mirror of the other repositories). Each download is verified against the digest
+            recorded in the lockfile. Artifacts from `jvm_artifact` targets which set `jar`, and
+            artifacts which can not be downloaded over HTTP(S) or from a `file://` URL, are still
+            fetched with Coursier.
+
+            Downloads are made by Pants itself, so credentials configured for Coursier do not
+            apply to them: see `URLDownloadHandler` to authenticate downloads.
+            """
+        ),
+    )
+
+    download_concurrency = IntOption(
+        default=16,
+        advanced=True,
+        help=softwrap(
+            """
+            The number of artifacts to download at a time for each fetch of lockfile entries
+            (e.g. of the artifacts of a `jvm_artifact` target, or of a whole lockfile), when
+            `[coursier].download_directly` is set.
+
+            Each fetch downloads its artifacts in waves of at most this many, and waits for a wave
+            to complete before starting the next, so a slow download delays the rest of its
+            fetch. Since separate fetches (e.g. for different `jvm_artifact` targets) are each
+            limited separately, this does not bound the total number of concurrent downloads.
+            """
+        ),
+    )
+
     def generate_exe(self, plat: Platform) -> str:
         archive_filename = os.path.basename(self.generate_url(plat))
         filename = os.path.splitext(archive_filename)[0]
@@ -100,6 +100,30 @@ class JvmSubsystem(Subsystem):
         ),
         advanced=True,
     )
+    compile_against_abi_jars = BoolOption(
+        default=False,
+        help=softwrap(
+            """
+            When enabled, `javac` compiles against the ABI jars of its dependencies, rather than
+            against their full JAR files.
+
+            An ABI jar contains only the signatures of a JAR file which are visible to other
+            sources (i.e. without method bodies or private members). Since edits which do not
+            affect the ABI of a dependency (such as edits to method bodies) do not change its
+            ABI jar, the compiles of its dependents can then be served from the cache, rather than
+            cascading through the whole graph.
+
+            Extracting ABI jars has a cost, which is paid once per JAR file (including
+            third-party JAR files) per cache.
+
+            This option does not affect `scalac`, which always compiles against full JAR files:
+            Scala 2 macro implementations are executed from the compile classpath (and so need
+            their method bodies), and the `.tasty` files of Scala 3, which contain the bodies of
+            `inline` methods, are not reduced by ABI extraction.
+            """
+        ),
+        advanced=True,
+    )
     # See https://github.com/pantsbuild/pants/issues/14937 for discussion of one way to improve
     # our behavior around cancellation with nailgun.
     nailgun_remote_cache_speculation_delay = IntOption(
@@ -1532,6 +1532,57 @@ class BootstrapOptions:
             """
         ),
     )
+    build_file_parse_workers = IntOption(
+        default=0,
+        help=softwrap(
+            """
+            The number of worker processes to evaluate BUILD files with, or 0 to evaluate them in
+            the Pants process.
+
+            BUILD file evaluation is CPU-bound Python, so when many directories must be parsed at
+            once (e.g. for `pants list ::` with a cold daemon), evaluating them in forked worker
+            processes allows them to be parsed in parallel. Any BUILD file which fails to be
+            evaluated in a worker (for example, because a macro produced a value which cannot be
+            pickled) is re-evaluated in the Pants process.
+
+            The workers are forked when the Pants process starts (or when the Pants daemon
+            restarts its scheduler). While a directory is parsed in a worker, one of the threads
+            of the Pants process waits for it, so when all of the workers are busy, BUILD files are
+            evaluated in the Pants process instead.
+
+            This is experimental: forking a multi-threaded process is not supported on all
+            platforms.
+            """
+        ),
+        advanced=True,
+    )
+    build_file_code_cache = BoolOption(
+        default=True,
+        advanced=True,
+        help=softwrap(
+            """
+            If true, persist the compiled code of BUILD files and prelude files below the
+            `build_file_code` directory of `--named-caches-dir`, so that BUILD files which have not
+            changed do not need to be compiled again after the Pants daemon restarts (or in CI
+            without the Pants daemon).
+            """
+        ),
+    )
+    build_file_code_cache_max_size = MemorySizeOption(
+        default=memory_size("256MiB"),
+        default_help_repr="256MiB",
+        advanced=True,
+        help=softwrap(
+            """
+            The maximum total size of the persisted compiled code of BUILD files (see
+            `[GLOBAL].build_file_code_cache`). When Pants starts (at most once an hour), the
+            entries which have gone unused the longest are removed until the rest fit.
+
+            You can suffix with `GiB`, `MiB`, `KiB`, or `B` to indicate the unit, e.g.
+            `2GiB` or `2.12GiB`. A bare number will be in bytes.
+            """
+        ),
+    )
 
 
 # N.B. By subclassing BootstrapOptions, we inherit all of those options and are also able to extend
@@ -1641,6 +1692,23 @@ class GlobalOptions(BootstrapOptions, Subsystem):
         ),
         advanced=True,
     )
+    build_file_snapshots = BoolOption(
+        default=False,
+        help=softwrap(
+            """
+            If true, persist the result of evaluating the BUILD files of each directory below the
+            named caches directory, and reuse it when the same BUILD files are evaluated again
+            (e.g. after the Pants daemon restarts, or in CI without the Pants daemon).
+
+            Snapshots are keyed by the content of the BUILD files and prelude files, the
+            environment variables they read, the defaults and dependency rules they inherit, and
+            the Pants version and registered target types. Since the code of in-repo plugins is not
+            part of the key, disable this option (or clear the `build_file_snapshots` named cache)
+            while developing plugins which add BUILD file symbols.
+            """
+        ),
+        advanced=True,
+    )
     subproject_roots = StrListOption(
         help="Paths that correspond with build roots for any subproject that this project depends on.",
         advanced=True,
@@ -354,6 +354,9 @@ class RuleRunner:
                 ),
                 ca_certs_path=ca_certs_path,
                 engine_visualize_to=None,
+                # NB: Tests do not persist compiled BUILD files to the (real) named caches.
+                build_file_code_cache=False,
+                build_file_parse_workers=global_options.build_file_parse_workers,
                 is_bootstrap=is_bootstrap,
             ).scheduler
         )
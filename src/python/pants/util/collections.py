@@ -8,6 +8,7 @@ import collections.abc
 import gc
 import math
 from sys import getsizeof
+from types import BuiltinFunctionType, FunctionType, ModuleType
 from typing import Any, Callable, Iterable, Iterator, MutableMapping, TypeVar
 
 from pants.engine.internals import native_engine
@@ -29,15 +30,26 @@ def deep_getsizeof(o: Any, ids: set[int]) -> int:
 
     To avoid double-counting, `ids` should be a set of object ids which have been visited by
     previous calls to this method.
+
+    Types, modules and functions are shared by many objects, and so are not counted.
     """
-    if id(o) in ids:
-        return 0
+    size = 0
+    to_visit = [o]
+    while to_visit:
+        obj = to_visit.pop()
+        if id(obj) in ids:
+            continue
+        ids.add(id(obj))
+        size += getsizeof(obj)
+        to_visit.extend(
+            referent
+            for referent in gc.get_referents(obj)
+            if not isinstance(referent, _SHARED_REFERENT_TYPES)
+        )
+    return size
 
-    d = deep_getsizeof
-    r = getsizeof(o)
-    ids.add(id(o))
 
-    return r + sum(d(x, ids) for x in gc.get_referents())
+_SHARED_REFERENT_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType)
 
 
 _T = TypeVar("_T")
@@ -105,6 +117,8 @@ def partition_sequentially(
     key: Callable[[_T], str],
     size_target: int,
     size_max: int | None = None,
+    weight: Callable[[_T], float] | None = None,
+    weight_max: float | None = None,
 ) -> Iterator[list[_T]]:
     """Stably partitions the given items into batches of around `size_target` items.
 
@@ -114,7 +128,8 @@ def partition_sequentially(
 
     Batches will optionally be capped to `size_max`, but note that this can weaken the stability
     properties of the bucketing, by forcing bucket boundaries to be created where they otherwise
-    might not.
+    might not. Likewise, batches will optionally be capped to a total `weight_max`, as measured by
+    the `weight` of each item.
     """
 
     # To stably partition the arguments into ranges of approximately `size_target`, we sort them,
@@ -131,11 +146,14 @@ def partition_sequentially(
     zero_prefix_threshold = math.log(max(1, size_target), 2)
 
     batch: list[_T] = []
+    batch_weight = 0.0
 
     def emit_batch() -> list[_T]:
+        nonlocal batch_weight
         assert batch
         result = list(batch)
         batch.clear()
+        batch_weight = 0.0
         return result
 
     keyed_items = []
@@ -144,6 +162,11 @@ def partition_sequentially(
     keyed_items.sort()
 
     for item_key, item in keyed_items:
+        if weight and weight_max is not None:
+            item_weight = weight(item)
+            if batch and batch_weight + item_weight > weight_max:
+                yield emit_batch()
+            batch_weight += item_weight
         batch.append(item)
         prefix_zero_bits = native_engine.hash_prefix_zero_bits(item_key)
         if prefix_zero_bits >= zero_prefix_threshold or (size_max and len(batch) >= size_max):
@@ -4,12 +4,14 @@
 
 from __future__ import annotations
 
+import sys
 from functools import partial
 
 import pytest
 
 from pants.util.collections import (
     assert_single_element,
+    deep_getsizeof,
     ensure_list,
     ensure_str_list,
     partition_sequentially,
@@ -17,6 +19,18 @@ from pants.util.collections import (
 )
 
 
+def test_deep_getsizeof() -> None:
+    shared = "x" * 1000
+    nested = [shared, (shared, {"k": shared})]
+    ids: set[int] = set()
+    size = deep_getsizeof(nested, ids)
+    assert sys.getsizeof(shared) < size < 2 * sys.getsizeof(shared)
+
+    # Objects which were counted by previous calls are not counted again.
+    other = [shared]
+    assert deep_getsizeof(other, ids) == sys.getsizeof(other)
+
+
 def test_recursively_update() -> None:
     d1 = {"a": 1, "b": {"c": 2, "o": "z"}, "z": {"y": 0}}
     d2 = {"e": 3, "b": {"f": 4, "o": 9}, "g": {"h": 5}, "z": 7}
@@ -107,3 +121,19 @@ def test_partition_sequentially(size_target: int) -> None:
     for to_add in [item for i, item in enumerate(all_items) if i % 2 == 1]:
         updated_partitions = partitioned_buckets([to_add, *base_items])
         assert 1 <= len(base_partitions ^ updated_partitions) <= 4
+
+
+def test_partition_sequentially_weight_max() -> None:
+    items = [f"item{i}" for i in range(0, 64)]
+    weights = {item: (10.0 if i % 8 == 0 else 1.0) for i, item in enumerate(items)}
+
+    unweighted = list(partition_sequentially(items, key=str, size_target=64))
+    weighted = list(
+        partition_sequentially(
+            items, key=str, size_target=64, weight=weights.__getitem__, weight_max=12.0
+        )
+    )
+    assert len(weighted) > len(unweighted)
+    assert [item for batch in weighted for item in batch] == sorted(items)
+    for batch in weighted:
+        assert len(batch) == 1 or sum(weights[item] for item in batch) <= 12.0
@@ -112,6 +112,83 @@ class GitWorktree(EngineAwareReturnType):
         files = self._git_binary._invoke_unsandboxed(self._create_git_cmdline(cmd)).split()
         return {self._fix_git_relative_path(f.strip(), relative_to) for f in files}
 
+    def merge_base(self, from_commit: str) -> str:
+        """The best common ancestor of `from_commit` and HEAD."""
+        return self._git_binary._invoke_unsandboxed(
+            self._create_git_cmdline(["merge-base", from_commit, "HEAD"])
+        )
+
+    def blob_ids(
+        self, commit: str, paths: Iterable[str], relative_to: PurePath | str | None = None
+    ) -> dict[str, str]:
+        """The object ids of the given files in `commit`, omitting files which do not exist there.
+
+        The ids are the hashes that `git hash-object` computes for the content of the files.
+        """
+        relative_to = PurePath(relative_to) if relative_to is not None else self.worktree
+        pathspecs = [str(relative_to / path) for path in paths]
+        if not pathspecs:
+            return {}
+        output = self._git_binary._invoke_unsandboxed(
+            self._create_git_cmdline(
+                ["ls-tree", "-r", "-z", "--full-name", commit, "--", *pathspecs]
+            )
+        )
+        blob_ids = {}
+        for entry in output.split("\0"):
+            if not entry:
+                continue
+            info, _, path = entry.partition("\t")
+            _, object_type, object_id = info.split(" ")
+            if object_type == "blob":
+                blob_ids[self._fix_git_relative_path(path, relative_to)] = object_id
+        return blob_ids
+
+    def changed_lines(
+        self, from_commit: str, paths: Iterable[str], relative_to: PurePath | str | None = None
+    ) -> dict[str, tuple[tuple[int, int], ...]]:
+        """The lines of the given files in `from_commit` which differ in the working copy.
+
+        Each change is a `(start, count)` range of lines in `from_commit`: a `count` of 0 indicates
+        that lines were inserted after line `start`. Files which did not change, or whose changes
+        are not line-based (e.g. binary files), are omitted.
+        """
+        relative_to = PurePath(relative_to) if relative_to is not None else self.worktree
+        pathspecs = [str(relative_to / path) for path in paths]
+        if not pathspecs:
+            return {}
+        output = self._git_binary._invoke_unsandboxed(
+            self._create_git_cmdline(
+                [
+                    "-c",
+                    "core.quotePath=false",
+                    "diff",
+                    "--unified=0",
+                    "--no-color",
+                    "--no-ext-diff",
+                    "--no-renames",
+                    from_commit,
+                    "--",
+                    *pathspecs,
+                ]
+            )
+        )
+        changes: dict[str, list[tuple[int, int]]] = {}
+        current: list[tuple[int, int]] | None = None
+        for line in output.splitlines():
+            if line.startswith("diff --git "):
+                current = None
+            elif line.startswith("--- a/"):
+                # Git appends a tab to paths which contain spaces.
+                path = line[len("--- a/") :].rstrip("\t")
+                path = self._fix_git_relative_path(path, relative_to)
+                current = changes.setdefault(path, [])
+            elif line.startswith("@@ ") and current is not None:
+                old_range = line.split(" ")[1][1:]
+                start, _, count = old_range.partition(",")
+                current.append((int(start), int(count) if count else 1))
+        return {path: tuple(ranges) for path, ranges in changes.items() if ranges}
+
     def _create_git_cmdline(self, args: Iterable[str]) -> list[str]:
         return [f"--git-dir={self._gitdir}", f"--work-tree={self.worktree}", *args]
 
@@ -264,6 +264,35 @@ def test_commit_with_new_untracked_file_adds_file(worktree: Path, git: MutatingG
     assert set() == git.changed_files(include_untracked=True)
 
 
+def test_changed_lines(worktree: Path, git: MutatingGitWorktree) -> None:
+    lib = worktree / "lib.py"
+    lib.write_text("".join(f"line{i}\n" for i in range(1, 11)))
+    git.add(lib)
+    git.commit("Add lib.")
+    base = git.commit_id
+    blob_ids = git.blob_ids(base, ["lib.py", "README", "no-such-file"])
+    assert {"lib.py", "README"} == set(blob_ids)
+    assert (
+        subprocess.check_output(["git", "hash-object", str(lib)]).decode().strip()
+        == blob_ids["lib.py"]
+    )
+
+    assert {} == git.changed_lines(base, ["lib.py"])
+
+    lines = lib.read_text().splitlines(keepends=True)
+    lines[2] = "changed\n"
+    lines[5:7] = []
+    lines.insert(6, "inserted\n")
+    lib.write_text("".join(lines))
+    git.commit("Change lib.")
+    lib.write_text(lib.read_text() + "appended\n")
+
+    assert base == git.merge_base("HEAD~1")
+    assert {"lib.py": ((3, 1), (6, 2), (8, 0), (10, 0))} == git.changed_lines(
+        base, ["lib.py", "README"]
+    )
+
+
 def test_bad_ref_stderr_issues_13396(git: MutatingGitWorktree) -> None:
     with pytest.raises(
         GitBinaryException, match=re.escape("fatal: bad revision 'remote/dne...HEAD'\n")